@@ -4,6 +4,13 @@ import os
 from fastapi import FastAPI
 
 from services.database import create_db_and_tables
+from services.font_catalogue_service import FONT_CATALOGUE_SERVICE
+from services.icon_finder_service import ICON_FINDER_SERVICE
+from services.icon_renderer_service import ICON_RENDERER_SERVICE
+from services.libreoffice_service import LIBREOFFICE_SERVICE
+from services.pdf_rasterizer_service import PDF_RASTERIZER_SERVICE
+from services.pptx_export_service import PPTX_EXPORT_SERVICE
+from utils.download_helpers import DOWNLOAD_MANAGER
 from utils.get_env import get_app_data_directory_env
 from utils.model_availability import (
     check_llm_and_image_provider_api_or_model_availability,
@@ -15,9 +22,21 @@ async def app_lifespan(_: FastAPI):
     """
     Lifespan context manager for FastAPI application.
     Initializes the application data directory and checks LLM model availability.
+    Starts warming the icon search index and the font catalogue in the background.
+    Closes the font catalogue tasks, the pooled download session, the icon
+    renderer (shared by the PPTX export workers), the LibreOffice instances,
+    the PDF rasterizer and the PPTX export workers on shutdown.
 
     """
     os.makedirs(get_app_data_directory_env(), exist_ok=True)
     await create_db_and_tables()
+    ICON_FINDER_SERVICE.warm_up()
+    FONT_CATALOGUE_SERVICE.warm_up()
     await check_llm_and_image_provider_api_or_model_availability()
     yield
+    await FONT_CATALOGUE_SERVICE.close()
+    await DOWNLOAD_MANAGER.close()
+    await ICON_RENDERER_SERVICE.close()
+    await LIBREOFFICE_SERVICE.close()
+    PDF_RASTERIZER_SERVICE.close()
+    PPTX_EXPORT_SERVICE.close()
@@ -8,6 +8,7 @@ from models.decomposed_file_info import DecomposedFileInfo
 from services.temp_file_service import TEMP_FILE_SERVICE
 from services.documents_loader import DocumentsLoader
 import uuid
+from utils.upload_utils import save_upload_file
 from utils.validators import validate_files
 
 FILES_ROUTER = APIRouter(prefix="/files", tags=["Files"])
@@ -28,10 +29,7 @@ async def upload_files(files: Optional[List[UploadFile]]):
             temp_path = TEMP_FILE_SERVICE.create_temp_file_path(
                 each_file.filename, temp_dir
             )
-            with open(temp_path, "wb") as f:
-                content = await each_file.read()
-                f.write(content)
-
+            await save_upload_file(each_file, temp_path, max_size=100)
             temp_files.append(temp_path)
 
     return temp_files
@@ -81,7 +79,6 @@ async def update_files(
     file_path: Annotated[str, Body()],
     file: Annotated[UploadFile, File()],
 ):
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+    await save_upload_file(file, file_path)
 
     return {"message": "File updated successfully"}
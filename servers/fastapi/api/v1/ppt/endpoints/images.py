@@ -10,7 +10,12 @@ from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
 from services.database import get_async_session
 from services.image_generation_service import ImageGenerationService
-from utils.asset_directory_utils import get_images_directory, convert_absolute_path_to_web_path
+from services.image_rendition_service import IMAGE_RENDITION_SERVICE
+from utils.asset_directory_utils import (
+    get_images_directory,
+    convert_absolute_path_to_web_path,
+    convert_web_path_to_absolute_path,
+)
 import os
 from utils.asset_directory_utils import get_uploads_directory
 import uuid
@@ -22,6 +27,7 @@ class ImageAssetResponse(BaseModel):
     created_at: datetime
     is_uploaded: bool
     path: str  # This will be the web path
+    srcset: str | None = None
     extras: dict | None = None
     
     @classmethod
@@ -31,9 +37,16 @@ class ImageAssetResponse(BaseModel):
             created_at=image_asset.created_at,
             is_uploaded=image_asset.is_uploaded,
             path=convert_absolute_path_to_web_path(image_asset.path),
+            srcset=IMAGE_RENDITION_SERVICE.get_srcset(image_asset.path),
             extras=image_asset.extras
         )
 
+
+class ImageRenditionsResponse(BaseModel):
+    src: str
+    srcset: str | None = None
+
+
 IMAGES_ROUTER = APIRouter(prefix="/images", tags=["Images"])
 
 
@@ -55,6 +68,25 @@ async def generate_image(
     return image.web_path
 
 
+@IMAGES_ROUTER.get("/renditions", response_model=ImageRenditionsResponse)
+async def get_image_renditions(path: str):
+    if not path.startswith("/app_data/") or ".." in path.split("/"):
+        raise HTTPException(status_code=400, detail="Only app data images have renditions")
+
+    absolute_path = convert_web_path_to_absolute_path(path)
+    if not os.path.isfile(absolute_path):
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    srcset = IMAGE_RENDITION_SERVICE.get_srcset(absolute_path)
+    if srcset is None:
+        await IMAGE_RENDITION_SERVICE.create_renditions_async(absolute_path)
+        srcset = IMAGE_RENDITION_SERVICE.get_srcset(absolute_path)
+
+    return ImageRenditionsResponse(
+        src=convert_absolute_path_to_web_path(absolute_path), srcset=srcset
+    )
+
+
 @IMAGES_ROUTER.get("/generated", response_model=List[ImageAssetResponse])
 async def get_generated_images(sql_session: AsyncSession = Depends(get_async_session)):
     try:
@@ -75,6 +107,7 @@ async def upload_image(file: UploadFile = File(...), sql_session: AsyncSession =
         return {
             "message": "Image uploaded successfully",
             "path": convert_absolute_path_to_web_path(image_asset.path),
+            "srcset": IMAGE_RENDITION_SERVICE.get_srcset(image_asset.path),
             "id": str(image_asset.id),
         }
     except Exception as e:
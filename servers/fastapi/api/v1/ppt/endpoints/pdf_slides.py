@@ -1,14 +1,26 @@
+import json
 import os
 import shutil
 import tempfile
-import subprocess
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 
-from utils.asset_directory_utils import get_images_directory
+from services.pdf_rasterizer_service import PDF_RASTERIZER_SERVICE
+from services.processed_upload_cache_service import PROCESSED_UPLOAD_CACHE_SERVICE
+from utils.asset_directory_utils import store_slide_screenshot
+from utils.async_iterator import iterate_callback_calls
+from utils.upload_utils import save_upload_file
 import uuid
 from constants.documents import PDF_MIME_TYPES
+from models.sse_response import (
+    SSECompleteResponse,
+    SSEErrorResponse,
+    SSEResponse,
+    SSEStatusResponse,
+)
 
 
 PDF_SLIDES_ROUTER = APIRouter(prefix="/pdf-slides", tags=["PDF Slides"])
@@ -25,21 +37,7 @@ class PdfSlidesResponse(BaseModel):
     total_slides: int
 
 
-@PDF_SLIDES_ROUTER.post("/process", response_model=PdfSlidesResponse)
-async def process_pdf_slides(
-    pdf_file: UploadFile = File(..., description="PDF file to process")
-):
-    """
-    Process a PDF file to extract slide screenshots.
-    
-    This endpoint:
-    1. Validates the uploaded PDF file
-    2. Uses ImageMagick to convert PDF pages to PNG images
-    3. Returns screenshot URLs for each slide/page
-    
-    Note: Font installation is not needed since PDFs already have fonts embedded.
-    """
-    
+def _validate_pdf_upload(pdf_file: UploadFile) -> None:
     # Validate PDF file
     if pdf_file.content_type not in PDF_MIME_TYPES:
         raise HTTPException(
@@ -52,52 +50,86 @@ async def process_pdf_slides(
             status_code=400,
             detail="PDF file exceeded max upload size of 100 MB",
         )
+
+
+async def _save_pdf_upload(pdf_file: UploadFile, temp_dir: str) -> Tuple[str, str]:
+    """Saves the PDF, returns (pdf_path, cache_key)."""
+    pdf_path = os.path.join(temp_dir, "presentation.pdf")
+    pdf_upload = await save_upload_file(pdf_file, pdf_path, max_size=100)
+    # Identical PDFs map to the same processed result
+    cache_key = PROCESSED_UPLOAD_CACHE_SERVICE.get_key("pdf", pdf_upload.sha256)
+    return pdf_path, cache_key
+
+
+def _cache_response(
+    cache_key: str, response: PdfSlidesResponse, stored_screenshot_paths: List[str]
+):
+    # Pages that fell back to the placeholder are rendered again next time
+    if len(stored_screenshot_paths) != len(response.slides):
+        return
+    PROCESSED_UPLOAD_CACHE_SERVICE.put(
+        cache_key, response.model_dump(), stored_screenshot_paths
+    )
+
+
+@PDF_SLIDES_ROUTER.post("/process", response_model=PdfSlidesResponse)
+async def process_pdf_slides(
+    pdf_file: UploadFile = File(..., description="PDF file to process")
+):
+    """
+    Process a PDF file to extract slide screenshots.
+    
+    This endpoint:
+    1. Validates the uploaded PDF file
+    2. Returns the stored result if the same PDF was processed before
+    3. Renders PDF pages to PNG images in parallel
+    4. Returns screenshot URLs for each slide/page
+    
+    Note: Font installation is not needed since PDFs already have fonts embedded.
+    """
+    _validate_pdf_upload(pdf_file)
     
     # Create temporary directory for processing
     with tempfile.TemporaryDirectory() as temp_dir:
         try:
-            # Save uploaded PDF file
-            pdf_path = os.path.join(temp_dir, "presentation.pdf")
-            with open(pdf_path, "wb") as f:
-                pdf_content = await pdf_file.read()
-                f.write(pdf_content)
+            pdf_path, cache_key = await _save_pdf_upload(pdf_file, temp_dir)
             
-            # Generate screenshots from PDF using ImageMagick
+            # Identical PDFs were already processed, reuse their screenshots
+            cached_response = PROCESSED_UPLOAD_CACHE_SERVICE.get(cache_key)
+            if cached_response:
+                print("Returning previously processed PDF slides")
+                return PdfSlidesResponse(**cached_response)
+            
+            # Generate screenshots from PDF pages
             screenshot_paths = await _generate_pdf_screenshots(pdf_path, temp_dir)
             print(f"Generated {len(screenshot_paths)} PDF screenshots")
             
             # Move screenshots to images directory and generate URLs
-            images_dir = get_images_directory()
-            presentation_id = uuid.uuid4()
-            presentation_images_dir = os.path.join(images_dir, str(presentation_id))
-            os.makedirs(presentation_images_dir, exist_ok=True)
-            
+            presentation_id = str(uuid.uuid4())
             slides_data = []
+            stored_screenshot_paths = []
             
             for i, screenshot_path in enumerate(screenshot_paths, 1):
-                # Move screenshot to permanent location
-                screenshot_filename = f"slide_{i}.png"
-                permanent_screenshot_path = os.path.join(presentation_images_dir, screenshot_filename)
-                
-                if os.path.exists(screenshot_path) and os.path.getsize(screenshot_path) > 0:
-                    # Use shutil.copy2 instead of os.rename to handle cross-device moves
-                    shutil.copy2(screenshot_path, permanent_screenshot_path)
-                    screenshot_url = f"/app_data/images/{presentation_id}/{screenshot_filename}"
-                else:
-                    # Fallback if screenshot generation failed or file is empty placeholder
-                    screenshot_url = "/static/images/placeholder.jpg"
-                
+                screenshot_url, stored_path = store_slide_screenshot(
+                    screenshot_path, presentation_id, i
+                )
+                if stored_path:
+                    stored_screenshot_paths.append(stored_path)
                 slides_data.append(PdfSlideData(
                     slide_number=i,
                     screenshot_url=screenshot_url
                 ))
             
-            return PdfSlidesResponse(
+            response = PdfSlidesResponse(
                 success=True,
                 slides=slides_data,
                 total_slides=len(slides_data)
             )
+            _cache_response(cache_key, response, stored_screenshot_paths)
+            return response
             
+        except HTTPException:
+            raise
         except Exception as e:
             print(f"Error processing PDF slides: {str(e)}")
             raise HTTPException(
@@ -106,75 +138,115 @@ async def process_pdf_slides(
             )
 
 
-async def _generate_pdf_screenshots(pdf_path: str, temp_dir: str) -> List[str]:
-    """Generate PNG screenshots of PDF pages using ImageMagick (same approach as PPTX endpoint)."""
-    screenshots_dir = os.path.join(temp_dir, "screenshots")
-    os.makedirs(screenshots_dir, exist_ok=True)
+@PDF_SLIDES_ROUTER.post("/process/stream")
+async def stream_pdf_slides(
+    pdf_file: UploadFile = File(..., description="PDF file to process")
+):
+    """
+    Streaming variant of /process.
+    
+    Sends a {"type": "slide"} event for each page as soon as it is rendered
+    (in render order, see slide_number), then a complete event with the full
+    PdfSlidesResponse under "result".
+    """
+    _validate_pdf_upload(pdf_file)
     
+    # Lives until the response is sent, the upload must be saved before returning
+    temp_dir = tempfile.mkdtemp()
     try:
-        # Convert PDF to individual PNG images using ImageMagick
-        print("Starting ImageMagick PNG conversion...")
+        pdf_path, cache_key = await _save_pdf_upload(pdf_file, temp_dir)
+    except Exception:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    
+    def slide_event(slide: PdfSlideData) -> str:
+        return SSEResponse(
+            event="response",
+            data=json.dumps({"type": "slide", "slide": slide.model_dump(mode="json")}),
+        ).to_string()
+    
+    async def inner():
+        cached_response = PROCESSED_UPLOAD_CACHE_SERVICE.get(cache_key)
+        if cached_response:
+            response = PdfSlidesResponse(**cached_response)
+            for slide in response.slides:
+                yield slide_event(slide)
+            yield SSECompleteResponse(
+                key="result", value=response.model_dump(mode="json")
+            ).to_string()
+            return
+        
         try:
-            result = subprocess.run([
-                "convert",
-                "-density", "150",  # Same DPI as PPTX endpoint
-                pdf_path,
-                os.path.join(screenshots_dir, "slide_%03d.png")
-            ], check=True, capture_output=True, text=True, timeout=500)
+            yield SSEStatusResponse(status="Rendering PDF pages...").to_string()
             
-            print(f"ImageMagick conversion output: {result.stdout}")
-            if result.stderr:
-                print(f"ImageMagick conversion warnings: {result.stderr}")
-                
-        except subprocess.TimeoutExpired:
-            raise Exception("ImageMagick PNG conversion timed out after 500 seconds")
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr if e.stderr else str(e)
-            raise Exception(f"ImageMagick PNG conversion failed: {error_msg}")
-        
-        # Find generated PNG files (ImageMagick creates slide_000.png, slide_001.png, etc.)
-        print("Checking for generated PNG files...")
-        png_files = sorted([f for f in os.listdir(screenshots_dir) if f.startswith("slide_") and f.endswith('.png')])
-        print(f"Generated PNG files: {png_files}")
+            presentation_id = str(uuid.uuid4())
+            slides_data: Dict[int, PdfSlideData] = {}
+            stored_screenshot_paths = []
+            
+            async for page, _, screenshot_path in iterate_callback_calls(
+                lambda on_page: _generate_pdf_screenshots(pdf_path, temp_dir, on_page)
+            ):
+                screenshot_url, stored_path = store_slide_screenshot(
+                    screenshot_path, presentation_id, page
+                )
+                if stored_path:
+                    stored_screenshot_paths.append(stored_path)
+                slides_data[page] = PdfSlideData(
+                    slide_number=page, screenshot_url=screenshot_url
+                )
+                yield slide_event(slides_data[page])
+            
+            response = PdfSlidesResponse(
+                success=True,
+                slides=[slides_data[i] for i in sorted(slides_data)],
+                total_slides=len(slides_data)
+            )
+            _cache_response(cache_key, response, stored_screenshot_paths)
+        except Exception as e:
+            print(f"Error streaming PDF slides: {str(e)}")
+            yield SSEErrorResponse(detail=f"Failed to process PDF: {str(e)}").to_string()
+            return
         
-        if not png_files:
-            raise Exception("ImageMagick failed to generate any PNG files")
+        yield SSECompleteResponse(
+            key="result", value=response.model_dump(mode="json")
+        ).to_string()
+    
+    return StreamingResponse(
+        inner(),
+        media_type="text/event-stream",
+        background=BackgroundTask(shutil.rmtree, temp_dir, ignore_errors=True),
+    )
+
+
+async def _generate_pdf_screenshots(
+    pdf_path: str,
+    temp_dir: str,
+    on_page: Optional[Callable[[int, int, str], None]] = None,
+) -> List[str]:
+    """Generate PNG screenshots of PDF pages, rendered in parallel (same approach as PPTX endpoint).
+
+    on_page(page_number, page_count, path) is called as each page is rendered.
+    """
+    screenshots_dir = os.path.join(temp_dir, "screenshots")
+    
+    try:
+        def report_page(page: int, total: int, path: str):
+            print(f"✓ Rendered page {page}/{total}")
+            if on_page:
+                on_page(page, total, path)
         
-        # Determine page count from generated files
-        page_count = len(png_files)
-        print(f"Determined {page_count} pages from ImageMagick output")
+        print("Starting PDF page rasterization...")
+        screenshot_paths = await PDF_RASTERIZER_SERVICE.rasterize(
+            pdf_path,
+            screenshots_dir,
+            on_page=report_page,
+        )
         
-        # Rename files from slide_000.png format to slide_1.png format expected by the API
-        # (Same renaming logic as PPTX endpoint)
-        print("Renaming PNG files to expected format...")
-        screenshot_paths = []
-        for i in range(page_count):
-            # ImageMagick generates slide_000.png, slide_001.png, etc.
-            source_file = f"slide_{i:03d}.png"
-            source_path = os.path.join(screenshots_dir, source_file)
-            
-            # We need slide_1.png, slide_2.png, etc.
-            target_file = f"slide_{i+1}.png"
-            target_path = os.path.join(screenshots_dir, target_file)
-            
-            if os.path.exists(source_path):
-                # Rename to expected format
-                shutil.move(source_path, target_path)
-                screenshot_paths.append(target_path)
-                print(f"✓ Renamed {source_file} to {target_file}")
-            else:
-                print(f"⚠ Warning: Expected file {source_file} not found, creating placeholder")
-                # Create empty placeholder
-                with open(target_path, 'w') as f:
-                    f.write("")
-                screenshot_paths.append(target_path)
+        if not screenshot_paths:
+            raise Exception("PDF rasterization failed to generate any PNG files")
         
         print(f"Successfully generated {len(screenshot_paths)} PDF page screenshots")
         return screenshot_paths
         
     except Exception as e:
-        # Re-raise the specific exceptions we've already handled
-        if "timed out" in str(e) or "failed:" in str(e):
-            raise
-        # Handle any other unexpected exceptions
-        raise Exception(f"PDF screenshot generation failed: {str(e)}") 
\ No newline at end of file
+        raise Exception(f"PDF screenshot generation failed: {str(e)}")
@@ -1,20 +1,35 @@
+import asyncio
+import json
 import os
 import shutil
-import zipfile
 import tempfile
 import subprocess
 import uuid
-from typing import List, Optional, Dict
+from typing import Callable, List, Optional, Dict, Tuple
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-import aiohttp
-import asyncio
-import xml.etree.ElementTree as ET
 import re
 
-from utils.asset_directory_utils import get_images_directory
+from services.font_catalogue_service import FONT_CATALOGUE_SERVICE, get_google_fonts_url
+from services.libreoffice_service import LIBREOFFICE_SERVICE
+from services.pdf_rasterizer_service import PDF_RASTERIZER_SERVICE
+from services.processed_upload_cache_service import PROCESSED_UPLOAD_CACHE_SERVICE
+from utils.asset_directory_utils import store_slide_screenshot
+from utils.async_iterator import iterate_callback_calls
+from utils.pptx_font_aliases import write_pptx_with_font_aliases
+from utils.pptx_inspector import PptxInspection, PptxSlideInspection, inspect_pptx
+from utils.upload_utils import save_upload_file
 import uuid
 from constants.documents import POWERPOINT_TYPES
+from models.saved_upload import SavedUpload
+from models.sse_response import (
+    SSECompleteResponse,
+    SSEErrorResponse,
+    SSEResponse,
+    SSEStatusResponse,
+)
 
 
 PPTX_SLIDES_ROUTER = APIRouter(prefix="/pptx-slides", tags=["PPTX Slides"])
@@ -108,116 +123,16 @@ def normalize_font_family_name(raw_name: str) -> str:
     return normalized
 
 
-def extract_fonts_from_oxml(xml_content: str) -> List[str]:
-    """
-    Extract font names from OXML content.
-    
-    Args:
-        xml_content: OXML content as string
-    
-    Returns:
-        List of unique font names found in the OXML
-    """
-    fonts = set()
-    
-    try:
-        # Parse the XML content
-        root = ET.fromstring(xml_content)
-        
-        # Define namespaces commonly used in OXML
-        namespaces = {
-            'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
-            'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
-            'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
-        }
-        
-        # Search for font references in various OXML elements
-        # Look for latin fonts
-        for font_elem in root.findall('.//a:latin', namespaces):
-            if 'typeface' in font_elem.attrib:
-                fonts.add(font_elem.attrib['typeface'])
-        
-        # Look for east asian fonts
-        for font_elem in root.findall('.//a:ea', namespaces):
-            if 'typeface' in font_elem.attrib:
-                fonts.add(font_elem.attrib['typeface'])
-        
-        # Look for complex script fonts
-        for font_elem in root.findall('.//a:cs', namespaces):
-            if 'typeface' in font_elem.attrib:
-                fonts.add(font_elem.attrib['typeface'])
-        
-        # Look for font references in theme elements
-        for font_elem in root.findall('.//a:font', namespaces):
-            if 'typeface' in font_elem.attrib:
-                fonts.add(font_elem.attrib['typeface'])
-        
-        # Look for rPr (run properties) font references
-        for rpr_elem in root.findall('.//a:rPr', namespaces):
-            for font_elem in rpr_elem.findall('.//a:latin', namespaces):
-                if 'typeface' in font_elem.attrib:
-                    fonts.add(font_elem.attrib['typeface'])
-        
-        # Also search without namespace prefix for compatibility
-        for font_elem in root.findall('.//latin'):
-            if 'typeface' in font_elem.attrib:
-                fonts.add(font_elem.attrib['typeface'])
-        
-        # Regex fallback for fonts that might be missed
-        font_pattern = r'typeface="([^"]+)"'
-        regex_fonts = re.findall(font_pattern, xml_content)
-        fonts.update(regex_fonts)
-        
-        # Filter out system fonts and empty values
-        system_fonts = {'+mn-lt', '+mj-lt', '+mn-ea', '+mj-ea', '+mn-cs', '+mj-cs', ''}
-        fonts = {font for font in fonts if font not in system_fonts and font.strip()}
-        
-        return list(fonts)
-        
-    except Exception as e:
-        print(f"Error extracting fonts from OXML: {e}")
-        return []
-
-
-async def check_google_font_availability(font_name: str) -> bool:
-    """
-    Check if a font is available in Google Fonts.
-    
-    Args:
-        font_name: Name of the font to check
-    
-    Returns:
-        True if font is available in Google Fonts, False otherwise
-    """
-    try:
-        formatted_name = font_name.replace(' ', '+')
-        url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.head(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                return response.status == 200
-                
-    except Exception as e:
-        print(f"Error checking Google Font availability for {font_name}: {e}")
-        return False
-
-
-async def analyze_fonts_in_all_slides(slide_xmls: List[str]) -> FontAnalysisResult:
+async def analyze_fonts_in_all_slides(raw_fonts: List[str]) -> FontAnalysisResult:
     """
     Analyze fonts across all slides and determine Google Fonts availability.
     
     Args:
-        slide_xmls: List of OXML content strings from all slides
+        raw_fonts: Font names used across all slides, as found in the OXML
     
     Returns:
         FontAnalysisResult with supported and unsupported fonts
     """
-    # Extract fonts from all slides
-    raw_fonts = set()
-    for xml_content in slide_xmls:
-        slide_fonts = extract_fonts_from_oxml(xml_content)
-        raw_fonts.update(slide_fonts)
-
     # Normalize to root families (e.g., "Montserrat Italic" -> "Montserrat")
     normalized_fonts = {normalize_font_family_name(f) for f in raw_fonts}
     # Remove empties if any
@@ -229,20 +144,16 @@ async def analyze_fonts_in_all_slides(slide_xmls: List[str]) -> FontAnalysisResu
             not_supported_fonts=[]
         )
     
-    # Check each normalized font's availability in Google Fonts concurrently
-    tasks = [check_google_font_availability(font) for font in normalized_fonts]
-    results = await asyncio.gather(*tasks)
-    
+    # Look each normalized font up in the local Google Fonts catalogue
     internally_supported_fonts = []
     not_supported_fonts = []
     
-    for font, is_available in zip(normalized_fonts, results):
-        if is_available:
-            formatted_name = font.replace(' ', '+')
-            google_fonts_url = f"https://fonts.googleapis.com/css2?family={formatted_name}&display=swap"
+    for font in normalized_fonts:
+        family = FONT_CATALOGUE_SERVICE.get_family(font)
+        if family:
             internally_supported_fonts.append({
                 "name": font,
-                "google_fonts_url": google_fonts_url
+                "google_fonts_url": get_google_fonts_url(family)
             })
         else:
             not_supported_fonts.append(font)
@@ -253,22 +164,7 @@ async def analyze_fonts_in_all_slides(slide_xmls: List[str]) -> FontAnalysisResu
     )
 
 
-@PPTX_SLIDES_ROUTER.post("/process", response_model=PptxSlidesResponse)
-async def process_pptx_slides(
-    pptx_file: UploadFile = File(..., description="PPTX file to process"),
-    fonts: Optional[List[UploadFile]] = File(None, description="Optional font files")
-):
-    """
-    Process a PPTX file to extract slide screenshots and XML content.
-    
-    This endpoint:
-    1. Validates the uploaded PPTX file
-    2. Installs any provided font files
-    3. Unzips the PPTX to extract slide XMLs
-    4. Uses LibreOffice to generate slide screenshots
-    5. Returns both screenshot URLs and XML content for each slide
-    """
-    
+def _validate_pptx_upload(pptx_file: UploadFile) -> None:
     # Validate PPTX file
     if pptx_file.content_type not in POWERPOINT_TYPES:
         raise HTTPException(
@@ -281,69 +177,229 @@ async def process_pptx_slides(
             status_code=400,
             detail="PPTX file exceeded max upload size of 100 MB",
         )
+
+
+async def _save_pptx_upload(
+    pptx_file: UploadFile, fonts: Optional[List[UploadFile]], temp_dir: str
+) -> Tuple[str, List[SavedUpload], str]:
+    """Saves the deck and fonts, returns (pptx_path, saved_fonts, cache_key)."""
+    pptx_path = os.path.join(temp_dir, "presentation.pptx")
+    pptx_upload = await save_upload_file(pptx_file, pptx_path, max_size=100)
+    saved_fonts = await _save_fonts(fonts, temp_dir) if fonts else []
+    
+    # Identical deck and fonts map to the same processed result
+    cache_key = PROCESSED_UPLOAD_CACHE_SERVICE.get_key(
+        "pptx", pptx_upload.sha256, [font.sha256 for font in saved_fonts]
+    )
+    return pptx_path, saved_fonts, cache_key
+
+
+def _create_slide_data(
+    slide_number: int, slide: PptxSlideInspection, screenshot_url: str
+) -> SlideData:
+    # Compute normalized fonts for this slide
+    normalized_fonts = sorted({normalize_font_family_name(f) for f in slide.fonts if f})
+    return SlideData(
+        slide_number=slide_number,
+        screenshot_url=screenshot_url,
+        xml_content=slide.xml_content,
+        normalized_fonts=normalized_fonts
+    )
+
+
+async def _get_cached_response(
+    cache_key: str, pptx_path: str
+) -> Optional[PptxSlidesResponse]:
+    """Previously processed result for the upload, with the font analysis redone.
+
+    Only the slides are reused, font support depends on the font catalogue at
+    the time of the request rather than of the first upload.
+    """
+    cached_response = PROCESSED_UPLOAD_CACHE_SERVICE.get(cache_key)
+    if not cached_response:
+        return None
+    inspection = inspect_pptx(pptx_path)
+    cached_response["fonts"] = await analyze_fonts_in_all_slides(inspection.fonts)
+    return PptxSlidesResponse(**cached_response)
+
+
+def _cache_response(
+    cache_key: str, response: PptxSlidesResponse, stored_screenshot_paths: List[str]
+):
+    # Slides that fell back to the placeholder are rendered again next time
+    if len(stored_screenshot_paths) != len(response.slides):
+        return
+    PROCESSED_UPLOAD_CACHE_SERVICE.put(
+        cache_key, response.model_dump(), stored_screenshot_paths
+    )
+
+
+@PPTX_SLIDES_ROUTER.post("/process", response_model=PptxSlidesResponse)
+async def process_pptx_slides(
+    pptx_file: UploadFile = File(..., description="PPTX file to process"),
+    fonts: Optional[List[UploadFile]] = File(None, description="Optional font files")
+):
+    """
+    Process a PPTX file to extract slide screenshots and XML content.
+    
+    This endpoint:
+    1. Validates the uploaded PPTX file
+    2. Returns the stored result if the same PPTX and fonts were processed before
+    3. Installs any provided font files
+    4. Reads slide XMLs and fonts from the saved PPTX
+    5. Uses LibreOffice to generate slide screenshots
+    6. Returns both screenshot URLs and XML content for each slide
+    """
+    _validate_pptx_upload(pptx_file)
     
     # Create temporary directory for processing
     with tempfile.TemporaryDirectory() as temp_dir:
-        if True:
-            # Save uploaded PPTX file
-            pptx_path = os.path.join(temp_dir, "presentation.pptx")
-            with open(pptx_path, "wb") as f:
-                pptx_content = await pptx_file.read()
-                f.write(pptx_content)
-            
-            # Install fonts if provided
-            if fonts:
-                await _install_fonts(fonts, temp_dir)
-            
-            # Extract slide XMLs from PPTX
-            slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
-            
-            # Generate screenshots using LibreOffice
-            screenshot_paths = await _generate_screenshots(pptx_path, temp_dir)
-            print(f"Screenshot paths: {screenshot_paths}")
-            
-            # Analyze fonts across all slides
-            font_analysis = await analyze_fonts_in_all_slides(slide_xmls)
-            print(f"Font analysis completed: {len(font_analysis.internally_supported_fonts)} supported, {len(font_analysis.not_supported_fonts)} not supported")
+        pptx_path, saved_fonts, cache_key = await _save_pptx_upload(
+            pptx_file, fonts, temp_dir
+        )
+        
+        # Identical deck and fonts were already processed, reuse the result
+        cached_response = await _get_cached_response(cache_key, pptx_path)
+        if cached_response:
+            print("Returning previously processed PPTX slides")
+            return cached_response
+        
+        # Install fonts if provided
+        if saved_fonts:
+            _install_fonts(saved_fonts)
+        
+        # Read slide XMLs and their fonts once, shared by every step below
+        inspection = inspect_pptx(pptx_path)
+        
+        # Generate screenshots using LibreOffice
+        screenshot_paths = await _generate_screenshots(pptx_path, temp_dir, inspection)
+        print(f"Screenshot paths: {screenshot_paths}")
+        
+        # Analyze fonts across all slides
+        font_analysis = await analyze_fonts_in_all_slides(inspection.fonts)
+        print(f"Font analysis completed: {len(font_analysis.internally_supported_fonts)} supported, {len(font_analysis.not_supported_fonts)} not supported")
+        
+        # Move screenshots to images directory and generate URLs
+        presentation_id = str(uuid.uuid4())
+        slides_data = []
+        stored_screenshot_paths = []
+        
+        for i, (slide, screenshot_path) in enumerate(zip(inspection.slides, screenshot_paths), 1):
+            screenshot_url, stored_path = store_slide_screenshot(
+                screenshot_path, presentation_id, i
+            )
+            if stored_path:
+                stored_screenshot_paths.append(stored_path)
+            slides_data.append(_create_slide_data(i, slide, screenshot_url))
+        
+        response = PptxSlidesResponse(
+            success=True,
+            slides=slides_data,
+            total_slides=len(slides_data),
+            fonts=font_analysis
+        )
+        _cache_response(cache_key, response, stored_screenshot_paths)
+        return response
+
+
+@PPTX_SLIDES_ROUTER.post("/process/stream")
+async def stream_pptx_slides(
+    pptx_file: UploadFile = File(..., description="PPTX file to process"),
+    fonts: Optional[List[UploadFile]] = File(None, description="Optional font files")
+):
+    """
+    Streaming variant of /process.
+    
+    Sends a {"type": "slide"} event for each slide as soon as its screenshot is
+    rendered (in render order, see slide_number), then a complete event with
+    the full PptxSlidesResponse under "result".
+    """
+    _validate_pptx_upload(pptx_file)
+    
+    # Lives until the response is sent, the upload must be saved before returning
+    temp_dir = tempfile.mkdtemp()
+    try:
+        pptx_path, saved_fonts, cache_key = await _save_pptx_upload(
+            pptx_file, fonts, temp_dir
+        )
+    except Exception:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    
+    def slide_event(slide: SlideData) -> str:
+        return SSEResponse(
+            event="response",
+            data=json.dumps({"type": "slide", "slide": slide.model_dump(mode="json")}),
+        ).to_string()
+    
+    async def inner():
+        response = await _get_cached_response(cache_key, pptx_path)
+        if response:
+            for slide in response.slides:
+                yield slide_event(slide)
+            yield SSECompleteResponse(
+                key="result", value=response.model_dump(mode="json")
+            ).to_string()
+            return
+        
+        try:
+            if saved_fonts:
+                _install_fonts(saved_fonts)
+            inspection = inspect_pptx(pptx_path)
+            yield SSEStatusResponse(
+                status=f"Rendering {inspection.slide_count} slides..."
+            ).to_string()
             
-            # Move screenshots to images directory and generate URLs
-            images_dir = get_images_directory()
-            presentation_id = uuid.uuid4()
-            presentation_images_dir = os.path.join(images_dir, str(presentation_id))
-            os.makedirs(presentation_images_dir, exist_ok=True)
+            presentation_id = str(uuid.uuid4())
+            slides_data: Dict[int, SlideData] = {}
+            stored_screenshot_paths = []
             
-            slides_data = []
+            async for page, _, screenshot_path in iterate_callback_calls(
+                lambda on_page: _generate_screenshots(
+                    pptx_path, temp_dir, inspection, on_page
+                )
+            ):
+                if page > inspection.slide_count:
+                    continue
+                screenshot_url, stored_path = store_slide_screenshot(
+                    screenshot_path, presentation_id, page
+                )
+                if stored_path:
+                    stored_screenshot_paths.append(stored_path)
+                slides_data[page] = _create_slide_data(
+                    page, inspection.slides[page - 1], screenshot_url
+                )
+                yield slide_event(slides_data[page])
             
-            for i, (xml_content, screenshot_path) in enumerate(zip(slide_xmls, screenshot_paths), 1):
-                # Move screenshot to permanent location
-                screenshot_filename = f"slide_{i}.png"
-                permanent_screenshot_path = os.path.join(presentation_images_dir, screenshot_filename)
-                
-                if os.path.exists(screenshot_path) and os.path.getsize(screenshot_path) > 0:
-                    # Use shutil.copy2 instead of os.rename to handle cross-device moves
-                    shutil.copy2(screenshot_path, permanent_screenshot_path)
-                    screenshot_url = f"/app_data/images/{presentation_id}/{screenshot_filename}"
-                else:
-                    # Fallback if screenshot generation failed or file is empty placeholder
-                    screenshot_url = "/static/images/placeholder.jpg"
-                
-                # Compute normalized fonts for this slide
-                raw_slide_fonts = extract_fonts_from_oxml(xml_content)
-                normalized_fonts = sorted({normalize_font_family_name(f) for f in raw_slide_fonts if f})
-                
-                slides_data.append(SlideData(
-                    slide_number=i,
-                    screenshot_url=screenshot_url,
-                    xml_content=xml_content,
-                    normalized_fonts=normalized_fonts
-                ))
+            # Slides the PDF had no page for
+            for i, slide in enumerate(inspection.slides, 1):
+                if i not in slides_data:
+                    screenshot_url, _ = store_slide_screenshot(None, presentation_id, i)
+                    slides_data[i] = _create_slide_data(i, slide, screenshot_url)
+                    yield slide_event(slides_data[i])
             
-            return PptxSlidesResponse(
+            font_analysis = await analyze_fonts_in_all_slides(inspection.fonts)
+            response = PptxSlidesResponse(
                 success=True,
-                slides=slides_data,
+                slides=[slides_data[i] for i in sorted(slides_data)],
                 total_slides=len(slides_data),
                 fonts=font_analysis
             )
+            _cache_response(cache_key, response, stored_screenshot_paths)
+        except Exception as e:
+            print(f"Error streaming PPTX slides: {str(e)}")
+            yield SSEErrorResponse(detail=f"Failed to process PPTX: {str(e)}").to_string()
+            return
+        
+        yield SSECompleteResponse(
+            key="result", value=response.model_dump(mode="json")
+        ).to_string()
+    
+    return StreamingResponse(
+        inner(),
+        media_type="text/event-stream",
+        background=BackgroundTask(shutil.rmtree, temp_dir, ignore_errors=True),
+    )
 
 # NEW: Fonts-only endpoint leveraging the same font extraction/analysis
 @PPTX_FONTS_ROUTER.post("/process", response_model=PptxFontsResponse)
@@ -362,77 +418,51 @@ async def process_pptx_fonts(
             detail=f"Invalid file type. Expected PPTX file, got {pptx_file.content_type}"
         )
 
-    # Create temporary directory for processing
+    # Only slide parts are read from the saved upload
     with tempfile.TemporaryDirectory() as temp_dir:
-        # Save uploaded PPTX file
         pptx_path = os.path.join(temp_dir, "presentation.pptx")
-        with open(pptx_path, "wb") as f:
-            pptx_content = await pptx_file.read()
-            f.write(pptx_content)
-
-        # Extract slide XMLs from PPTX
-        slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
+        await save_upload_file(pptx_file, pptx_path, max_size=100)
+        inspection = inspect_pptx(pptx_path)
 
-        # Analyze fonts across all slides (same logic as in /pptx-slides)
-        font_analysis = await analyze_fonts_in_all_slides(slide_xmls)
+    # Analyze fonts across all slides (same logic as in /pptx-slides)
+    font_analysis = await analyze_fonts_in_all_slides(inspection.fonts)
 
-        return PptxFontsResponse(
-            success=True,
-            fonts=font_analysis,
-        )
+    return PptxFontsResponse(
+        success=True,
+        fonts=font_analysis,
+    )
 
-def _create_font_alias_config(raw_fonts: List[str]) -> str:
-    """Create a temporary fontconfig configuration that aliases variant family names to normalized root families.
-    Returns the path to the config file.
-    """
-    # Build mapping from raw -> normalized where different
-    mappings: Dict[str, str] = {}
+def _get_font_aliases(raw_fonts: List[str]) -> Dict[str, str]:
+    """Maps variant family names to their normalized root families, where they differ."""
+    aliases: Dict[str, str] = {}
     for f in raw_fonts:
         normalized = normalize_font_family_name(f)
         if normalized and normalized != f:
-            mappings[f] = normalized
-    # Create config only if we have mappings
-    fd, fonts_conf_path = tempfile.mkstemp(prefix="fonts_alias_", suffix=".conf")
-    os.close(fd)
-    with open(fonts_conf_path, "w", encoding="utf-8") as cfg:
-        cfg.write("""<?xml version='1.0'?>
-<!DOCTYPE fontconfig SYSTEM "urn:fontconfig:fonts.dtd">
-<fontconfig>
-  <include>/etc/fonts/fonts.conf</include>
-""")
-        for src, dst in mappings.items():
-            cfg.write(f"""
-  <match target="pattern">
-    <test name="family" compare="eq">
-      <string>{src}</string>
-    </test>
-    <edit name="family" mode="assign" binding="strong">
-      <string>{dst}</string>
-    </edit>
-  </match>
-""")
-        cfg.write("\n</fontconfig>\n")
-    return fonts_conf_path
-
-async def _install_fonts(fonts: List[UploadFile], temp_dir: str) -> None:
-    """Install provided font files to the system."""
+            aliases[f] = normalized
+    return aliases
+
+async def _save_fonts(fonts: List[UploadFile], temp_dir: str) -> List[SavedUpload]:
+    """Save provided font files to the temporary directory."""
     fonts_dir = os.path.join(temp_dir, "fonts")
     os.makedirs(fonts_dir, exist_ok=True)
     
+    saved_fonts = []
     for font_file in fonts:
-        # Save font file
         font_path = os.path.join(fonts_dir, font_file.filename)
-        with open(font_path, "wb") as f:
-            font_content = await font_file.read()
-            f.write(font_content)
-        
+        saved_fonts.append(await save_upload_file(font_file, font_path))
+    return saved_fonts
+
+
+def _install_fonts(saved_fonts: List[SavedUpload]) -> None:
+    """Install saved font files to the system."""
+    for font in saved_fonts:
         # Install font (copy to system fonts directory)
         try:
             subprocess.run([
-                "cp", font_path, "/usr/share/fonts/truetype/"
+                "cp", font.path, "/usr/share/fonts/truetype/"
             ], check=True, capture_output=True)
         except subprocess.CalledProcessError as e:
-            print(f"Warning: Failed to install font {font_file.filename}: {e}")
+            print(f"Warning: Failed to install font {font.filename}: {e}")
     
     # Refresh font cache
     try:
@@ -441,137 +471,69 @@ async def _install_fonts(fonts: List[UploadFile], temp_dir: str) -> None:
         print(f"Warning: Failed to refresh font cache: {e}")
 
 
-def _extract_slide_xmls(pptx_path: str, temp_dir: str) -> List[str]:
-    """Extract slide XML content from PPTX file."""
-    slide_xmls = []
-    extract_dir = os.path.join(temp_dir, "pptx_extract")
-    
-    try:
-        # Unzip PPTX file
-        with zipfile.ZipFile(pptx_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
-        
-        # Look for slides in ppt/slides/ directory
-        slides_dir = os.path.join(extract_dir, "ppt", "slides")
-        
-        if not os.path.exists(slides_dir):
-            raise Exception("No slides directory found in PPTX file")
-        
-        # Get all slide XML files and sort them numerically
-        slide_files = [f for f in os.listdir(slides_dir) if f.startswith("slide") and f.endswith(".xml")]
-        slide_files.sort(key=lambda x: int(x.replace("slide", "").replace(".xml", "")))
-        
-        # Read XML content from each slide
-        for slide_file in slide_files:
-            slide_path = os.path.join(slides_dir, slide_file)
-            with open(slide_path, 'r', encoding='utf-8') as f:
-                slide_xmls.append(f.read())
-        
-        return slide_xmls
-        
-    except Exception as e:
-        raise Exception(f"Failed to extract slide XMLs: {str(e)}")
-
+async def _generate_screenshots(
+    pptx_path: str,
+    temp_dir: str,
+    inspection: PptxInspection,
+    on_page: Optional[Callable[[int, int, str], None]] = None,
+) -> List[str]:
+    """Generate PNG screenshots of PPTX slides using LibreOffice + pdfium.
 
-async def _generate_screenshots(pptx_path: str, temp_dir: str) -> List[str]:
-    """Generate PNG screenshots of PPTX slides using LibreOffice + ImageMagick."""
+    on_page(page_number, page_count, path) is called as each page is rendered.
+    """
     screenshots_dir = os.path.join(temp_dir, "screenshots")
     os.makedirs(screenshots_dir, exist_ok=True)
     
     try:
-        # First, get the number of slides by extracting XMLs
-        slide_xmls = _extract_slide_xmls(pptx_path, temp_dir)
-        slide_count = len(slide_xmls)
+        slide_count = inspection.slide_count
         
-        # Build font alias config to force variant families to resolve to normalized root families
-        raw_fonts: List[str] = []
-        for xml in slide_xmls:
-            raw_fonts.extend(extract_fonts_from_oxml(xml))
-        raw_fonts = list({f for f in raw_fonts if f})
-        fonts_conf_path = _create_font_alias_config(raw_fonts)
-        env = os.environ.copy()
-        env["FONTCONFIG_FILE"] = fonts_conf_path
+        # Rename variant families to their normalized root families in a copy
+        # of the deck, so the pooled LibreOffice instances resolve them
+        font_aliases = _get_font_aliases(inspection.fonts)
+        if font_aliases:
+            aliased_dir = os.path.join(temp_dir, "font_aliased")
+            os.makedirs(aliased_dir, exist_ok=True)
+            pptx_path = await asyncio.to_thread(
+                write_pptx_with_font_aliases,
+                pptx_path,
+                os.path.join(aliased_dir, os.path.basename(pptx_path)),
+                font_aliases,
+            )
         
         print(f"Found {slide_count} slides in presentation")
         
-        # Step 1: Convert PPTX to PDF using LibreOffice
+        # Step 1: Convert PPTX to PDF using the pooled LibreOffice instances
         print("Starting LibreOffice PDF conversion...")
-        pdf_filename = "temp_presentation.pdf"
-        pdf_path = os.path.join(screenshots_dir, pdf_filename)
-        
         try:
-            result = subprocess.run([
-                "libreoffice",
-                "--headless", 
-                "--convert-to", "pdf",
-                "--outdir", screenshots_dir,
-                pptx_path
-            ], check=True, capture_output=True, text=True, timeout=500, env=env)
-            
-            print(f"LibreOffice PDF conversion output: {result.stdout}")
-            if result.stderr:
-                print(f"LibreOffice PDF conversion warnings: {result.stderr}")
-        except subprocess.TimeoutExpired:
-            raise Exception("LibreOffice PDF conversion timed out after 120 seconds")
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr if e.stderr else str(e)
-            raise Exception(f"LibreOffice PDF conversion failed: {error_msg}")
-        
-        # Find the generated PDF file (LibreOffice uses original filename)
-        pdf_files = [f for f in os.listdir(screenshots_dir) if f.endswith('.pdf')]
-        if not pdf_files:
-            raise Exception("LibreOffice failed to generate PDF file")
-        
-        actual_pdf_path = os.path.join(screenshots_dir, pdf_files[0])
+            actual_pdf_path = await LIBREOFFICE_SERVICE.convert_to_pdf(
+                pptx_path, screenshots_dir
+            )
+        except RuntimeError as e:
+            raise Exception(f"LibreOffice PDF conversion failed: {e}")
         print(f"Generated PDF: {actual_pdf_path}")
         
-        # Step 2: Convert PDF to individual PNG images using ImageMagick
-        print("Starting ImageMagick PNG conversion...")
-        try:
-            result = subprocess.run([
-                "convert",
-                "-density", "150",
-                actual_pdf_path,
-                os.path.join(screenshots_dir, "slide_%03d.png")
-            ], check=True, capture_output=True, text=True, timeout=500, env=env)
-            
-            print(f"ImageMagick conversion output: {result.stdout}")
-            if result.stderr:
-                print(f"ImageMagick conversion warnings: {result.stderr}")
-        except subprocess.TimeoutExpired:
-            raise Exception("ImageMagick PNG conversion timed out after 120 seconds")
-        except subprocess.CalledProcessError as e:
-            error_msg = e.stderr if e.stderr else str(e)
-            raise Exception(f"ImageMagick PNG conversion failed: {error_msg}")
+        # Step 2: Render PDF pages to PNG images in parallel
+        print("Starting PDF page rasterization...")
+        def report_page(page: int, total: int, path: str):
+            print(f"✓ Rendered slide {page}/{total}")
+            if on_page:
+                on_page(page, total, path)
         
-        # Find generated PNG files (ImageMagick creates slide_000.png, slide_001.png, etc.)
-        print("Checking for generated PNG files...")
-        png_files = sorted([f for f in os.listdir(screenshots_dir) if f.startswith("slide_") and f.endswith('.png')])
-        print(f"Generated PNG files: {png_files}")
+        page_paths = await PDF_RASTERIZER_SERVICE.rasterize(
+            actual_pdf_path, screenshots_dir, on_page=report_page
+        )
         
-        if not png_files:
-            raise Exception("ImageMagick failed to generate any PNG files")
+        if not page_paths:
+            raise Exception("PDF rasterization failed to generate any PNG files")
         
-        # Rename files from slide_000.png format to slide_1.png format expected by the API
-        print("Renaming PNG files to expected format...")
         screenshot_paths = []
         for i in range(slide_count):
-            # ImageMagick generates slide_000.png, slide_001.png, etc.
-            source_file = f"slide_{i:03d}.png"
-            source_path = os.path.join(screenshots_dir, source_file)
-            
-            # We need slide_1.png, slide_2.png, etc.
-            target_file = f"slide_{i+1}.png"
-            target_path = os.path.join(screenshots_dir, target_file)
-            
-            if os.path.exists(source_path):
-                # Rename to expected format
-                shutil.move(source_path, target_path)
-                screenshot_paths.append(target_path)
-                print(f"✓ Renamed {source_file} to {target_file}")
+            if i < len(page_paths):
+                screenshot_paths.append(page_paths[i])
             else:
-                print(f"⚠ Warning: Expected file {source_file} not found, creating placeholder")
+                print(f"⚠ Warning: No page rendered for slide {i + 1}, creating placeholder")
                 # Create empty placeholder
+                target_path = os.path.join(screenshots_dir, f"slide_{i+1}.png")
                 with open(target_path, 'w') as f:
                     f.write("")
                 screenshot_paths.append(target_path)
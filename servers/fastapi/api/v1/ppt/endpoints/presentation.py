@@ -4,8 +4,10 @@ import os
 import random
 import uuid
 from typing import Annotated, List, Optional
-from fastapi import APIRouter, Body, Depends, HTTPException
-from fastapi.responses import StreamingResponse
+from urllib.parse import quote
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from pathvalidate import sanitize_filename
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select
@@ -16,6 +18,7 @@ from models.presentation_outline_model import (
     PresentationOutlineModel,
     SlideOutlineModel,
 )
+from models.pptx_export_job import PptxExportJobModel
 from models.pptx_models import PptxPresentationModel
 from models.presentation_layout import PresentationLayoutModel
 from models.presentation_structure_model import PresentationStructureModel
@@ -34,9 +37,12 @@ from models.sql.slide import SlideModel
 from models.sse_response import SSECompleteResponse, SSEErrorResponse, SSEResponse
 
 from services.database import get_async_session
-from services.temp_file_service import TEMP_FILE_SERVICE
 from models.sql.presentation import PresentationModel
-from services.pptx_presentation_creator import PptxPresentationCreator
+from services.pptx_export_service import (
+    PPTX_EXPORT_SERVICE,
+    get_pptx_digest,
+    save_content_addressed_pptx,
+)
 from utils.asset_directory_utils import get_exports_directory, get_images_directory
 from utils.llm_calls.generate_presentation_structure import (
     generate_presentation_structure,
@@ -340,25 +346,34 @@ async def update_presentation(
     )
 
 
-@PRESENTATION_ROUTER.post("/export/pptx", response_model=str)
-async def create_pptx(
-    pptx_model: Annotated[PptxPresentationModel, Body()],
-):
-    temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
-
-    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-    await pptx_creator.create_ppt()
-
+def get_pptx_export_path(pptx_model: PptxPresentationModel) -> str:
     # Use sanitized title from pptx_model, similar to PDF export
-    from pathvalidate import sanitize_filename
     title = pptx_model.name or "presentation"
     sanitized_title = sanitize_filename(title)
     
     export_directory = get_exports_directory()
-    pptx_path = os.path.join(
-        export_directory, f"{sanitized_title}.pptx"
+    return os.path.join(export_directory, f"{sanitized_title}.pptx")
+
+
+def get_pptx_export_job_response(job: PptxExportJobModel) -> PptxExportJobModel:
+    if not job.path:
+        return job
+    # Convert absolute path to relative URL path for frontend access
+    return job.model_copy(
+        update={"path": f"/app_data/exports/{os.path.basename(job.path)}"}
     )
-    pptx_creator.save(pptx_path)
+
+
+@PRESENTATION_ROUTER.post("/export/pptx", response_model=str)
+async def create_pptx(
+    pptx_model: Annotated[PptxPresentationModel, Body()],
+):
+    try:
+        pptx_path = await PPTX_EXPORT_SERVICE.export(
+            pptx_model, get_pptx_export_path(pptx_model)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to export PPTX: {e}")
 
     # Convert absolute path to relative URL path for frontend access
     filename = os.path.basename(pptx_path)
@@ -367,6 +382,74 @@ async def create_pptx(
     return download_url
 
 
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against etag (RFC 9110)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+@PRESENTATION_ROUTER.post("/export/pptx/download")
+async def download_pptx(
+    pptx_model: Annotated[PptxPresentationModel, Body()],
+    persist: Annotated[bool, Query()] = False,
+    if_none_match: Annotated[Optional[str], Header()] = None,
+):
+    """Builds the deck in memory and returns the package as the response body.
+
+    The ETag is the SHA-256 of the package. With persist, the package is also
+    stored once under its hash in the exports directory and its URL is sent as
+    Content-Location.
+    """
+    try:
+        content = await PPTX_EXPORT_SERVICE.export(pptx_model)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to export PPTX: {e}")
+
+    digest = await asyncio.to_thread(get_pptx_digest, content)
+    etag = f'"{digest}"'
+    headers = {"ETag": etag}
+
+    if persist:
+        pptx_path = await asyncio.to_thread(save_content_addressed_pptx, content, digest)
+        headers["Content-Location"] = f"/app_data/exports/{os.path.basename(pptx_path)}"
+
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    filename = f"{sanitize_filename(pptx_model.name or 'presentation')}.pptx"
+    headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{quote(filename)}"
+    return Response(
+        content=content,
+        media_type="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+        headers=headers,
+    )
+
+
+@PRESENTATION_ROUTER.post("/export/pptx/jobs", response_model=PptxExportJobModel)
+async def create_pptx_export_job(
+    pptx_model: Annotated[PptxPresentationModel, Body()],
+):
+    job = PPTX_EXPORT_SERVICE.submit(pptx_model, get_pptx_export_path(pptx_model))
+    return get_pptx_export_job_response(job)
+
+
+@PRESENTATION_ROUTER.get("/export/pptx/jobs/{id}", response_model=PptxExportJobModel)
+async def get_pptx_export_job(id: str):
+    job = PPTX_EXPORT_SERVICE.get_job(id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    return get_pptx_export_job_response(job)
+
+
 @PRESENTATION_ROUTER.post("/generate", response_model=PresentationPathAndEditPath)
 async def generate_presentation_api(
     request: GeneratePresentationRequest,
@@ -1,3 +1,5 @@
+import hashlib
+
 GENERATE_HTML_SYSTEM_PROMPT = """
 You need to generate html and tailwind code for given presentation slide image. Generated code will be used as template for different content. You need to think through each design elements and then decide where each element should go.
 Follow these rules strictly:
@@ -239,3 +241,12 @@ HTML_EDIT_SYSTEM_PROMPT = """
 You need to edit given html with respect to the indication and sketch in the given UI. You'll be given the code for current UI which is in presentation size, along with its visualization in image form. Over that you'll also be given another image which has indications of what might change in form of sketch in the UI. You will have to return the edited html with tailwind with the changes as indicated on the image and through prompt. Make sure you think through the design before making the change and also make sure you don't change the non-indicated part. Try to follow the design style of current content for generated content. If sketch image is not provided, then you need to edit the html with respect to the prompt. Make sure size of the presentation does not change in any cirsumstance. Only give out code and nothing else.
 """
 
+
+
+def get_prompt_version(prompt: str) -> str:
+    """Short content hash of a prompt, cached generations are keyed by it."""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+GENERATE_HTML_PROMPT_VERSION = get_prompt_version(GENERATE_HTML_SYSTEM_PROMPT)
+HTML_TO_REACT_PROMPT_VERSION = get_prompt_version(HTML_TO_REACT_SYSTEM_PROMPT)
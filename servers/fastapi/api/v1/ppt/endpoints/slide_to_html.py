@@ -1,19 +1,33 @@
+import asyncio
 import os
 import base64
+import hashlib
+import json
 from datetime import datetime
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from uuid import UUID
 from fastapi import APIRouter, HTTPException, File, UploadFile, Form, Depends
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from openai import OpenAI
+from openai import AsyncOpenAI
 from openai import APIError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete, func
 from utils.asset_directory_utils import get_images_directory
+from utils.datetime_utils import get_current_utc_datetime
+from utils.db_utils import get_upsert_statement
 from services.database import get_async_session
 from models.sql.presentation_layout_code import PresentationLayoutCodeModel
-from .prompts import GENERATE_HTML_SYSTEM_PROMPT, HTML_TO_REACT_SYSTEM_PROMPT, HTML_EDIT_SYSTEM_PROMPT
+from .prompts import (
+    GENERATE_HTML_PROMPT_VERSION,
+    GENERATE_HTML_SYSTEM_PROMPT,
+    HTML_EDIT_SYSTEM_PROMPT,
+    HTML_TO_REACT_PROMPT_VERSION,
+    HTML_TO_REACT_SYSTEM_PROMPT,
+)
+from services.generation_cache_service import GENERATION_CACHE_SERVICE
 from models.sql.template import TemplateModel
+from models.sse_response import SSECompleteResponse, SSEResponse, SSEStatusResponse
 
 
 # Create separate routers for each functionality
@@ -22,6 +36,10 @@ HTML_TO_REACT_ROUTER = APIRouter(prefix="/html-to-react", tags=["html-to-react"]
 HTML_EDIT_ROUTER = APIRouter(prefix="/html-edit", tags=["html-edit"])
 LAYOUT_MANAGEMENT_ROUTER = APIRouter(prefix="/template-management", tags=["template-management"])
 
+# Concurrent GPT-5 conversions per batch request
+SLIDE_TO_HTML_MAX_CONCURRENCY = 4
+GENERATE_HTML_MODEL = "gpt-5"
+
 
 # Request/Response models for slide-to-html endpoint
 class SlideToHtmlRequest(BaseModel):
@@ -34,6 +52,17 @@ class SlideToHtmlResponse(BaseModel):
     html: str
 
 
+class SlideToHtmlBatchRequest(BaseModel):
+    slides: List[SlideToHtmlRequest]
+    max_concurrency: Optional[int] = None  # Capped at SLIDE_TO_HTML_MAX_CONCURRENCY
+
+
+class SlideToHtmlBatchResult(BaseModel):
+    index: int
+    html: Optional[str] = None
+    error: Optional[str] = None
+
+
 # Request/Response models for html-edit endpoint
 class HtmlEditResponse(BaseModel):
     success: bool
@@ -120,7 +149,7 @@ class TemplateInfo(BaseModel):
     created_at: Optional[datetime] = None
 
 
-async def generate_html_from_slide(base64_image: str, media_type: str, xml_content: str, api_key: str, fonts: Optional[List[str]] = None) -> str:
+async def generate_html_from_slide(base64_image: str, media_type: str, xml_content: str, api_key: str, fonts: Optional[List[str]] = None, client: Optional[AsyncOpenAI] = None) -> str:
     """
     Generate HTML content from slide image and XML using OpenAI GPT-5 Responses API.
     
@@ -130,6 +159,7 @@ async def generate_html_from_slide(base64_image: str, media_type: str, xml_conte
         xml_content: OXML content as text
         api_key: OpenAI API key
         fonts: Optional list of normalized root font families to prefer in output
+        client: Optional AsyncOpenAI client to reuse, e.g. across a batch
     
     Returns:
         Generated HTML content as string
@@ -137,9 +167,24 @@ async def generate_html_from_slide(base64_image: str, media_type: str, xml_conte
     Raises:
         HTTPException: If API call fails or no content is generated
     """
+    cache_key = GENERATION_CACHE_SERVICE.get_key(
+        "slide_to_html",
+        GENERATE_HTML_PROMPT_VERSION,
+        model=GENERATE_HTML_MODEL,
+        reasoning_effort="high",
+        image=hashlib.sha256(base64_image.encode("utf-8")).hexdigest(),
+        media_type=media_type,
+        xml=xml_content,
+        fonts=fonts or [],
+    )
+    cached_html = await asyncio.to_thread(GENERATION_CACHE_SERVICE.get, cache_key)
+    if cached_html:
+        print("Using cached HTML for identical slide image and XML")
+        return cached_html
+    
     print(f"Generating HTML from slide image and XML using OpenAI GPT-5 Responses API...")
     try:
-        client = OpenAI(api_key=api_key)
+        client = client or AsyncOpenAI(api_key=api_key)
 
         # Compose input for Responses API. Include system prompt, image (separate), OXML and optional fonts text.
         data_url = f"data:{media_type};base64,{base64_image}"
@@ -157,8 +202,8 @@ async def generate_html_from_slide(base64_image: str, media_type: str, xml_conte
         ]
 
         print("Making Responses API request for HTML generation...")
-        response = client.responses.create(
-            model="gpt-5",
+        response = await client.responses.create(
+            model=GENERATE_HTML_MODEL,
             input=input_payload,
             reasoning={"effort": "high"},
             text={"verbosity": "low"},
@@ -175,6 +220,12 @@ async def generate_html_from_slide(base64_image: str, media_type: str, xml_conte
                 detail="No HTML content generated by OpenAI GPT-5"
             )
         
+        await asyncio.to_thread(
+            GENERATION_CACHE_SERVICE.put,
+            cache_key,
+            html_content,
+            prompt_version=GENERATE_HTML_PROMPT_VERSION,
+        )
         return html_content
         
     except APIError as e:
@@ -205,13 +256,14 @@ async def generate_html_from_slide(base64_image: str, media_type: str, xml_conte
             )
 
 
-async def generate_react_component_from_html(html_content: str, api_key: str, image_base64: Optional[str] = None, media_type: Optional[str] = None) -> str:
+async def generate_react_component_from_html(html_content: str, api_key: str, image_base64: Optional[str] = None, media_type: Optional[str] = None, client: Optional[AsyncOpenAI] = None) -> str:
     """
     Convert HTML content to TSX React component using OpenAI GPT-5 Responses API.
     
     Args:
         html_content: Generated HTML content
         api_key: OpenAI API key
+        client: Optional AsyncOpenAI client to reuse, e.g. across a batch
     
     Returns:
         Generated TSX React component code as string
@@ -219,8 +271,22 @@ async def generate_react_component_from_html(html_content: str, api_key: str, im
     Raises:
         HTTPException: If API call fails or no content is generated
     """
+    cache_key = GENERATION_CACHE_SERVICE.get_key(
+        "html_to_react",
+        HTML_TO_REACT_PROMPT_VERSION,
+        model=GENERATE_HTML_MODEL,
+        reasoning_effort="minimal",
+        html=html_content,
+        image=hashlib.sha256(image_base64.encode("utf-8")).hexdigest() if image_base64 and media_type else None,
+        media_type=media_type if image_base64 else None,
+    )
+    cached_react = await asyncio.to_thread(GENERATION_CACHE_SERVICE.get, cache_key)
+    if cached_react:
+        print("Using cached React component for identical HTML and image")
+        return cached_react
+    
     try:
-        client = OpenAI(api_key=api_key)
+        client = client or AsyncOpenAI(api_key=api_key)
 
         print("Making Responses API request for React component generation...")
 
@@ -235,8 +301,8 @@ async def generate_react_component_from_html(html_content: str, api_key: str, im
             {"role": "user", "content": content_parts},
         ]
 
-        response = client.responses.create(
-            model="gpt-5",
+        response = await client.responses.create(
+            model=GENERATE_HTML_MODEL,
             input=input_payload,
             reasoning={"effort": "minimal"},
             text={"verbosity": "low"},
@@ -265,6 +331,12 @@ async def generate_react_component_from_html(html_content: str, api_key: str, im
         filtered_react_content = '\n'.join(filtered_lines)
         print(f"Filtered React content length: {len(filtered_react_content)}")
         
+        await asyncio.to_thread(
+            GENERATION_CACHE_SERVICE.put,
+            cache_key,
+            filtered_react_content,
+            prompt_version=HTML_TO_REACT_PROMPT_VERSION,
+        )
         return filtered_react_content
     except APIError as e:
         print(f"OpenAI API Error: {e}")
@@ -313,7 +385,7 @@ async def edit_html_with_images(current_ui_base64: str, sketch_base64: Optional[
         HTTPException: If API call fails or no content is generated
     """
     try:
-        client = OpenAI(api_key=api_key)
+        client = AsyncOpenAI(api_key=api_key)
 
         print("Making Responses API request for HTML editing...")
 
@@ -333,7 +405,7 @@ async def edit_html_with_images(current_ui_base64: str, sketch_base64: Optional[
             {"role": "user", "content": content_parts},
         ]
 
-        response = client.responses.create(
+        response = await client.responses.create(
             model="gpt-5",
             input=input_payload,
             reasoning={"effort": "low"},
@@ -380,6 +452,80 @@ async def edit_html_with_images(current_ui_base64: str, sketch_base64: Optional[
             )
 
 
+IMAGE_MEDIA_TYPES = {
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp'
+}
+
+
+def _resolve_image_path(image_path: str) -> str:
+    """Resolve an /app_data/images/..., /static/... or plain image path to the file system."""
+    if image_path.startswith("/app_data/images/"):
+        # Remove the /app_data/images/ prefix and join with actual images directory
+        relative_path = image_path[len("/app_data/images/"):]
+        return os.path.join(get_images_directory(), relative_path)
+    if image_path.startswith("/static/"):
+        # Handle static files
+        relative_path = image_path[len("/static/"):]
+        return os.path.join("static", relative_path)
+    # Assume it's already a full path or relative to images directory
+    if os.path.isabs(image_path):
+        return image_path
+    return os.path.join(get_images_directory(), image_path)
+
+
+def _read_image_as_base64(actual_image_path: str) -> Tuple[str, str]:
+    """Returns (base64 data, media type) of an image file."""
+    with open(actual_image_path, "rb") as image_file:
+        image_content = image_file.read()
+    file_extension = os.path.splitext(actual_image_path)[1].lower()
+    media_type = IMAGE_MEDIA_TYPES.get(file_extension, 'image/png')
+    return base64.b64encode(image_content).decode('utf-8'), media_type
+
+
+def _get_openai_api_key() -> str:
+    # Get OpenAI API key from environment
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise HTTPException(
+            status_code=500, 
+            detail="OPENAI_API_KEY environment variable not set"
+        )
+    return api_key
+
+
+async def _convert_slide_to_html(
+    request: SlideToHtmlRequest, api_key: str, client: Optional[AsyncOpenAI] = None
+) -> str:
+    actual_image_path = _resolve_image_path(request.image)
+    
+    # Check if image file exists
+    if not os.path.exists(actual_image_path):
+        raise HTTPException(
+            status_code=404,
+            detail=f"Image file not found: {request.image}"
+        )
+    
+    base64_image, media_type = await asyncio.to_thread(
+        _read_image_as_base64, actual_image_path
+    )
+    
+    # Generate HTML using the extracted function
+    html_content = await generate_html_from_slide(
+        base64_image=base64_image,
+        media_type=media_type,
+        xml_content=request.xml,
+        api_key=api_key,
+        fonts=request.fonts,
+        client=client,
+    )
+    
+    return html_content.replace("```html", "").replace("```", "")
+
+
 # ENDPOINT 1: Slide to HTML conversion
 @SLIDE_TO_HTML_ROUTER.post("/", response_model=SlideToHtmlResponse)
 async def convert_slide_to_html(request: SlideToHtmlRequest):
@@ -393,66 +539,8 @@ async def convert_slide_to_html(request: SlideToHtmlRequest):
         SlideToHtmlResponse with generated HTML
     """
     try:
-        # Get OpenAI API key from environment
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise HTTPException(
-                status_code=500, 
-                detail="OPENAI_API_KEY environment variable not set"
-            )
-        
-        # Resolve image path to actual file system path
-        image_path = request.image
-        
-        # Handle different path formats
-        if image_path.startswith("/app_data/images/"):
-            # Remove the /app_data/images/ prefix and join with actual images directory
-            relative_path = image_path[len("/app_data/images/"):]
-            actual_image_path = os.path.join(get_images_directory(), relative_path)
-        elif image_path.startswith("/static/"):
-            # Handle static files
-            relative_path = image_path[len("/static/"):]
-            actual_image_path = os.path.join("static", relative_path)
-        else:
-            # Assume it's already a full path or relative to images directory
-            if os.path.isabs(image_path):
-                actual_image_path = image_path
-            else:
-                actual_image_path = os.path.join(get_images_directory(), image_path)
-        
-        # Check if image file exists
-        if not os.path.exists(actual_image_path):
-            raise HTTPException(
-                status_code=404,
-                detail=f"Image file not found: {image_path}"
-            )
-        
-        # Read and encode image to base64
-        with open(actual_image_path, "rb") as image_file:
-            image_content = image_file.read()
-        base64_image = base64.b64encode(image_content).decode('utf-8')
-        
-        # Determine media type from file extension
-        file_extension = os.path.splitext(actual_image_path)[1].lower()
-        media_type_map = {
-            '.png': 'image/png',
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.gif': 'image/gif',
-            '.webp': 'image/webp'
-        }
-        media_type = media_type_map.get(file_extension, 'image/png')
-        
-        # Generate HTML using the extracted function
-        html_content = await generate_html_from_slide(
-            base64_image=base64_image,
-            media_type=media_type,
-            xml_content=request.xml,
-            api_key=api_key,
-            fonts=request.fonts,
-            )
-        
-        html_content = html_content.replace("```html", "").replace("```", "")
+        api_key = _get_openai_api_key()
+        html_content = await _convert_slide_to_html(request, api_key)
         
         return SlideToHtmlResponse(
             success=True,
@@ -471,6 +559,72 @@ async def convert_slide_to_html(request: SlideToHtmlRequest):
         )
 
 
+# ENDPOINT 1b: Concurrent conversion of every slide of a template
+@SLIDE_TO_HTML_ROUTER.post("/batch")
+async def convert_slides_to_html_batch(request: SlideToHtmlBatchRequest):
+    """
+    Convert several slides to HTML concurrently, streaming each result.
+    
+    At most max_concurrency conversions run at once, sharing one OpenAI
+    client. Each finished slide is sent as a {"type": "slide", "index", "html"}
+    event and each failed one as {"type": "slide_error", "index", "detail"},
+    in completion order. The stream ends with a complete event listing every
+    slide under "slides" (html or error, in request order).
+    """
+    api_key = _get_openai_api_key()
+    if not request.slides:
+        raise HTTPException(status_code=400, detail="No slides provided")
+    max_concurrency = max(
+        1, min(request.max_concurrency or SLIDE_TO_HTML_MAX_CONCURRENCY, SLIDE_TO_HTML_MAX_CONCURRENCY)
+    )
+
+    async def inner():
+        client = AsyncOpenAI(api_key=api_key)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results: List[SlideToHtmlBatchResult] = [
+            SlideToHtmlBatchResult(index=i) for i in range(len(request.slides))
+        ]
+
+        async def convert(index: int, slide: SlideToHtmlRequest) -> int:
+            async with semaphore:
+                try:
+                    results[index].html = await _convert_slide_to_html(slide, api_key, client)
+                except HTTPException as e:
+                    results[index].error = e.detail
+                except Exception as e:
+                    print(f"Unexpected error during slide to HTML processing: {str(e)}")
+                    results[index].error = f"Error processing slide to HTML: {str(e)}"
+            return index
+
+        yield SSEStatusResponse(
+            status=f"Converting {len(request.slides)} slides to HTML..."
+        ).to_string()
+
+        tasks = [
+            asyncio.create_task(convert(i, slide))
+            for i, slide in enumerate(request.slides)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                result = results[await task]
+                if result.error is None:
+                    data = {"type": "slide", "index": result.index, "html": result.html}
+                else:
+                    data = {"type": "slide_error", "index": result.index, "detail": result.error}
+                yield SSEResponse(event="response", data=json.dumps(data)).to_string()
+        finally:
+            # The client went away, stop paying for the remaining conversions
+            for task in tasks:
+                task.cancel()
+            await client.close()
+
+        yield SSECompleteResponse(
+            key="slides", value=[result.model_dump() for result in results]
+        ).to_string()
+
+    return StreamingResponse(inner(), media_type="text/event-stream")
+
+
 # ENDPOINT 2: HTML to React component conversion
 @HTML_TO_REACT_ROUTER.post("/", response_model=HtmlToReactResponse)
 async def convert_html_to_react(request: HtmlToReactRequest):
@@ -484,13 +638,7 @@ async def convert_html_to_react(request: HtmlToReactRequest):
         HtmlToReactResponse with generated React component
     """
     try:
-        # Get OpenAI API key from environment
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise HTTPException(
-                status_code=500, 
-                detail="OPENAI_API_KEY environment variable not set"
-            )
+        api_key = _get_openai_api_key()
         
         # Validate HTML content
         if not request.html or not request.html.strip():
@@ -503,20 +651,11 @@ async def convert_html_to_react(request: HtmlToReactRequest):
         image_b64 = None
         media_type = None
         if request.image:
-            image_path = request.image
-            if image_path.startswith("/app_data/images/"):
-                relative_path = image_path[len("/app_data/images/"):]
-                actual_image_path = os.path.join(get_images_directory(), relative_path)
-            elif image_path.startswith("/static/"):
-                relative_path = image_path[len("/static/"):]
-                actual_image_path = os.path.join("static", relative_path)
-            else:
-                actual_image_path = image_path if os.path.isabs(image_path) else os.path.join(get_images_directory(), image_path)
+            actual_image_path = _resolve_image_path(request.image)
             if os.path.exists(actual_image_path):
-                with open(actual_image_path, "rb") as f:
-                    image_b64 = base64.b64encode(f.read()).decode("utf-8")
-                ext = os.path.splitext(actual_image_path)[1].lower()
-                media_type = {'.png':'image/png','.jpg':'image/jpeg','.jpeg':'image/jpeg','.gif':'image/gif','.webp':'image/webp'}.get(ext, 'image/png')
+                image_b64, media_type = await asyncio.to_thread(
+                    _read_image_as_base64, actual_image_path
+                )
         
         # Convert HTML to React component
         react_component = await generate_react_component_from_html(
@@ -567,13 +706,7 @@ async def edit_html_with_images_endpoint(
         HtmlEditResponse with edited HTML
     """
     try:
-        # Get OpenAI API key from environment
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise HTTPException(
-                status_code=500, 
-                detail="OPENAI_API_KEY environment variable not set"
-            )
+        api_key = _get_openai_api_key()
         
         # Validate inputs
         if not html or not html.strip():
@@ -685,8 +818,6 @@ async def save_layouts(
                 detail="Cannot save more than 50 layouts at once"
             )
         
-        saved_count = 0
-        
         for i, layout_data in enumerate(request.layouts):
             # Validate individual layout data
             if not layout_data.presentation or not str(layout_data.presentation).strip():
@@ -712,33 +843,31 @@ async def save_layouts(
                     status_code=400,
                     detail=f"Layout {i+1}: layout_code cannot be empty"
                 )
-            
-            # Check if layout already exists for this presentation and layout_id
-            stmt = select(PresentationLayoutCodeModel).where(
-                PresentationLayoutCodeModel.presentation == layout_data.presentation,
-                PresentationLayoutCodeModel.layout_id == layout_data.layout_id
-            )
-            result = await session.execute(stmt)
-            existing_layout = result.scalar_one_or_none()
-            
-            if existing_layout:
-                # Update existing layout
-                existing_layout.layout_name = layout_data.layout_name
-                existing_layout.layout_code = layout_data.layout_code
-                existing_layout.fonts = layout_data.fonts
-                existing_layout.updated_at = datetime.now()
-            else:
-                # Create new layout
-                new_layout = PresentationLayoutCodeModel(
-                    presentation=layout_data.presentation,
-                    layout_id=layout_data.layout_id,
-                    layout_name=layout_data.layout_name,
-                    layout_code=layout_data.layout_code,
-                    fonts=layout_data.fonts
-                )
-                session.add(new_layout)
-            
-            saved_count += 1
+        
+        # One row per (presentation, layout_id), later entries win
+        updated_at = get_current_utc_datetime()
+        rows = {
+            (layout_data.presentation, layout_data.layout_id): {
+                "presentation": layout_data.presentation,
+                "layout_id": layout_data.layout_id,
+                "layout_name": layout_data.layout_name,
+                "layout_code": layout_data.layout_code,
+                "fonts": layout_data.fonts,
+                "updated_at": updated_at,
+            }
+            for layout_data in request.layouts
+        }
+        
+        # Insert new layouts and update existing ones in a single statement
+        stmt = get_upsert_statement(
+            session.get_bind().dialect.name,
+            PresentationLayoutCodeModel.__table__,
+            list(rows.values()),
+            index_elements=["presentation", "layout_id"],
+            update_columns=["layout_name", "layout_code", "fonts", "updated_at"],
+        )
+        await session.execute(stmt)
+        saved_count = len(request.layouts)
         
         await session.commit()
         
@@ -877,12 +1006,29 @@ async def get_presentations_summary(
     Get summary of all presentations with their layout counts.
     """
     try:
-        # Query to get presentation_id, count of layouts, and MAX(updated_at)
-        stmt = select(
-            PresentationLayoutCodeModel.presentation,
-            func.count(PresentationLayoutCodeModel.id).label('layout_count'),
-            func.max(PresentationLayoutCodeModel.updated_at).label('last_updated_at')
-        ).group_by(PresentationLayoutCodeModel.presentation)
+        # Layout counts, MAX(updated_at) and template info in one query
+        stmt = (
+            select(
+                PresentationLayoutCodeModel.presentation,
+                func.count(PresentationLayoutCodeModel.id).label('layout_count'),
+                func.max(PresentationLayoutCodeModel.updated_at).label('last_updated_at'),
+                TemplateModel.id.label('template_id'),
+                TemplateModel.name.label('template_name'),
+                TemplateModel.description.label('template_description'),
+                TemplateModel.created_at.label('template_created_at'),
+            )
+            .outerjoin(
+                TemplateModel,
+                TemplateModel.id == PresentationLayoutCodeModel.presentation,
+            )
+            .group_by(
+                PresentationLayoutCodeModel.presentation,
+                TemplateModel.id,
+                TemplateModel.name,
+                TemplateModel.description,
+                TemplateModel.created_at,
+            )
+        )
         
         result = await session.execute(stmt)
         presentation_data = result.all()
@@ -890,18 +1036,17 @@ async def get_presentations_summary(
         # Convert to response format with template info if available
         presentations = []
         for row in presentation_data:
-            template_meta = await session.get(TemplateModel, row.presentation)
             template = None
-            if template_meta:
+            if row.template_id:
                 template = {
-                    "id": template_meta.id,
-                    "name": template_meta.name,
-                    "description": template_meta.description,
-                    "created_at": template_meta.created_at,
+                    "id": row.template_id,
+                    "name": row.template_name,
+                    "description": row.template_description,
+                    "created_at": row.template_created_at,
                 }
             presentations.append(
                 PresentationSummary(
-                    presentation=row.presentation,
+                    presentation_id=row.presentation,
                     layout_count=row.layout_count,
                     last_updated_at=row.last_updated_at,
                     template=template,
@@ -0,0 +1,94 @@
+"""
+Micro-benchmark for utils.image_utils pixel operations.
+
+Compares the array-backed invert_image/set_image_opacity against the previous
+per-pixel implementations on a 1024x1024 RGBA image.
+
+Usage (from servers/fastapi):
+    python -m benchmarks.image_utils_benchmark [--size 1024] [--repeat 5]
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+from PIL import Image
+
+from utils.image_utils import invert_image, set_image_opacity
+
+
+def legacy_invert_image(img: Image.Image) -> Image.Image:
+    new_data = []
+    for r, g, b, a in img.getdata():
+        if a != 0:
+            new_data.append((255 - r, 255 - g, 255 - b, a))
+        else:
+            new_data.append((0, 0, 0, 0))
+    new_img = Image.new("RGBA", img.size)
+    new_img.putdata(new_data)
+    return new_img
+
+
+def legacy_set_image_opacity(image: Image.Image, opacity: float) -> Image.Image:
+    opacity = max(0.0, min(1.0, opacity))
+    if image.mode != "RGBA":
+        image = image.convert("RGBA")
+    new_alpha = image.getchannel("A").point(lambda x: int(x * opacity))
+    result = Image.new("RGBA", image.size)
+    result.paste(image.convert("RGB"), (0, 0))
+    result.putalpha(new_alpha)
+    return result
+
+
+def create_test_image(size: int) -> Image.Image:
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, size=(size, size, 4), dtype=np.uint8)
+    # Make a quarter of the image fully transparent
+    pixels[: size // 2, : size // 2, 3] = 0
+    return Image.fromarray(pixels, "RGBA")
+
+
+def time_function(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(size: int, repeat: int) -> dict:
+    image = create_test_image(size)
+
+    cases = {
+        "invert_image": (
+            lambda: legacy_invert_image(image),
+            lambda: invert_image(image),
+        ),
+        "set_image_opacity": (
+            lambda: legacy_set_image_opacity(image, 0.4),
+            lambda: set_image_opacity(image, 0.4),
+        ),
+    }
+
+    results = {"size": size, "repeat": repeat, "cases": {}}
+    for name, (legacy, current) in cases.items():
+        assert legacy().tobytes() == current().tobytes(), f"{name} output differs"
+        legacy_seconds = time_function(legacy, repeat)
+        current_seconds = time_function(current, repeat)
+        results["cases"][name] = {
+            "legacy_seconds": round(legacy_seconds, 6),
+            "current_seconds": round(current_seconds, 6),
+            "speedup": round(legacy_seconds / current_seconds, 1),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.size, args.repeat), indent=2))
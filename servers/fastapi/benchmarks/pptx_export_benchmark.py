@@ -0,0 +1,340 @@
+"""
+Benchmark for the production PPTX export path (PptxExportService).
+
+Builds synthetic PptxPresentationModel decks with text boxes containing inline
+HTML, processed pictures (border radius, circle, opacity, invert), connectors
+and shadowed shapes, then exports them through the export worker pool exactly
+as the API does: the model is pickled to a spawned worker, which builds and
+saves the deck and reports its stages back. Records the pool startup, every
+stage as reported by the worker, the total export time and the peak RSS of
+the server process and of each worker.
+
+Every run starts a fresh pool with an empty app data directory, so caches
+(processed assets, text runs) are cold and the numbers reflect a cold export.
+Stage times are sampled every few milliseconds from the job status.
+
+Usage (from servers/fastapi):
+    python -m benchmarks.pptx_export_benchmark [--slides 20] [--text-boxes 4]
+        [--pictures 2] [--workers 1] [--repeat 3] [--output results.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import pickle
+import platform
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
+
+from models.pptx_export_job import PptxExportJobStatus
+from models.pptx_models import (
+    PptxAutoShapeBoxModel,
+    PptxBoxShapeEnum,
+    PptxConnectorModel,
+    PptxFillModel,
+    PptxFontModel,
+    PptxParagraphModel,
+    PptxPictureBoxModel,
+    PptxPictureModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxShadowModel,
+    PptxSlideModel,
+    PptxStrokeModel,
+    PptxTextBoxModel,
+)
+# How often the job status is sampled for stage times
+STAGE_POLL_SECONDS = 0.005
+
+
+@contextlib.contextmanager
+def stdout_to_devnull():
+    """Silences stdout at the descriptor level, so spawned workers inherit it."""
+    sys.stdout.flush()
+    saved_stdout = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved_stdout, 1)
+        os.close(saved_stdout)
+
+PARAGRAPH_TEMPLATES = [
+    "Revenue grew <b>{i}%</b> year over <i>year</i>, driven by <u>new markets</u>.",
+    "Plain paragraph {i} without any inline markup at all.",
+    "Use <code>export_{i}()</code> &amp; <s>legacy</s> tooling<br>on a second line.",
+]
+
+
+def create_test_images(directory: str, count: int, size: int = 800) -> List[str]:
+    paths = []
+    gradient = np.linspace(0, 255, size, dtype=np.uint8)
+    for i in range(count):
+        pixels = np.zeros((size, size, 3), dtype=np.uint8)
+        pixels[..., 0] = gradient[None, :]
+        pixels[..., 1] = gradient[:, None]
+        pixels[..., 2] = (i * 47) % 256
+        path = os.path.join(directory, f"picture_{i}.png")
+        Image.fromarray(pixels, "RGB").save(path)
+        paths.append(path)
+    return paths
+
+
+def create_synthetic_deck(
+    n_slides: int, n_text_boxes: int, n_pictures: int, image_paths: List[str]
+) -> PptxPresentationModel:
+    picture_variants = [
+        {"border_radius": [24, 24, 24, 24]},
+        {"shape": PptxBoxShapeEnum.CIRCLE},
+        {"opacity": 0.6},
+        {"invert": True},
+    ]
+
+    slides = []
+    for slide_index in range(n_slides):
+        shapes = []
+        for box_index in range(n_text_boxes):
+            paragraphs = [
+                PptxParagraphModel(
+                    font=PptxFontModel(size=14 + box_index),
+                    text=template.format(i=slide_index * n_text_boxes + box_index),
+                )
+                for template in PARAGRAPH_TEMPLATES
+            ]
+            shapes.append(
+                PptxTextBoxModel(
+                    position=PptxPositionModel(
+                        left=40, top=40 + box_index * 120, width=560, height=110
+                    ),
+                    paragraphs=paragraphs,
+                )
+            )
+
+        for picture_index in range(n_pictures):
+            variant = picture_variants[(slide_index + picture_index) % len(picture_variants)]
+            image_path = image_paths[(slide_index + picture_index) % len(image_paths)]
+            shapes.append(
+                PptxPictureBoxModel(
+                    position=PptxPositionModel(
+                        left=660, top=40 + picture_index * 220, width=320, height=200
+                    ),
+                    picture=PptxPictureModel(is_network=False, path=image_path),
+                    **variant,
+                )
+            )
+
+        shapes.append(
+            PptxAutoShapeBoxModel(
+                type=MSO_AUTO_SHAPE_TYPE.ROUNDED_RECTANGLE,
+                position=PptxPositionModel(left=1000, top=40, width=240, height=160),
+                fill=PptxFillModel(color="1F6FEB", opacity=0.8),
+                stroke=PptxStrokeModel(color="0B3D91", thickness=2),
+                shadow=PptxShadowModel(radius=12, offset=4, opacity=0.3, angle=45),
+                border_radius=12,
+            )
+        )
+        shapes.append(
+            PptxConnectorModel(
+                position=PptxPositionModel(left=40, top=680, width=1200, height=0),
+                thickness=1.5,
+                color="888888",
+            )
+        )
+        slides.append(PptxSlideModel(shapes=shapes, note=f"Speaker note {slide_index}"))
+
+    return PptxPresentationModel(name="benchmark", slides=slides)
+
+
+def get_peak_rss_mb() -> float:
+    """Peak RSS of this process."""
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+
+def get_process_peak_rss_mb(pid: int) -> Optional[float]:
+    """Peak RSS (VmHWM) of a live process, None where /proc is unavailable."""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def get_worker_peak_rss_mb() -> List[Optional[float]]:
+    # The pool workers are the multiprocessing children of this process
+    return [
+        get_process_peak_rss_mb(process.pid)
+        for process in multiprocessing.active_children()
+    ]
+
+
+async def export_once(
+    service: "PptxExportService", pptx_model: PptxPresentationModel, pptx_path: str
+) -> Dict[str, float]:
+    """Exports through the pool and returns the seconds spent in each stage."""
+    started = time.perf_counter()
+    job = service.submit(pptx_model, pptx_path)
+
+    stage_seconds: Dict[str, float] = {}
+    stage, stage_started = "queued", started
+    while True:
+        finished = job.status in (
+            PptxExportJobStatus.COMPLETED,
+            PptxExportJobStatus.FAILED,
+        )
+        current_stage = job.stage or "queued"
+        if finished or current_stage != stage:
+            now = time.perf_counter()
+            stage_seconds[stage] = stage_seconds.get(stage, 0.0) + now - stage_started
+            stage, stage_started = current_stage, now
+        if finished:
+            break
+        await asyncio.sleep(STAGE_POLL_SECONDS)
+
+    if job.status == PptxExportJobStatus.FAILED:
+        raise RuntimeError(f"Export failed: {job.error}")
+    stage_seconds["total"] = time.perf_counter() - started
+    return stage_seconds
+
+
+def run_once(
+    pptx_model: PptxPresentationModel, work_directory: str, n_workers: int
+) -> Tuple[Dict[str, float], float, Dict[str, object]]:
+    # Spawned workers inherit the environment, an empty app data directory
+    # gives them cold caches
+    os.environ["APP_DATA_DIRECTORY"] = tempfile.mkdtemp(dir=work_directory)
+    pptx_path = os.path.join(tempfile.mkdtemp(dir=work_directory), "benchmark.pptx")
+    # Imported here, not at module level: spawned workers import this module
+    # again, and importing the service there would wipe the temp directory the
+    # export runs in (TEMP_FILE_SERVICE cleans it up on import)
+    from services.pptx_export_service import PptxExportService
+
+    service = PptxExportService(max_workers=n_workers)
+
+    async def run() -> Tuple[Dict[str, float], List[Optional[float]]]:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        # Starts every worker, including the worker module imports
+        await asyncio.gather(
+            *[
+                loop.run_in_executor(service.get_executor(), time.sleep, 0.1)
+                for _ in range(n_workers)
+            ]
+        )
+        pool_startup = time.perf_counter() - started - 0.1
+
+        stage_seconds = await export_once(service, pptx_model, pptx_path)
+        stage_seconds["pool_startup"] = pool_startup
+        return stage_seconds, get_worker_peak_rss_mb()
+
+    try:
+        stage_seconds, worker_rss = asyncio.run(run())
+    finally:
+        service.close()
+
+    return stage_seconds, os.path.getsize(pptx_path) / (1024 * 1024), worker_rss
+
+
+def run(
+    n_slides: int, n_text_boxes: int, n_pictures: int, n_workers: int, repeat: int
+) -> dict:
+    app_data_directory = os.environ.get("APP_DATA_DIRECTORY")
+    try:
+        with tempfile.TemporaryDirectory() as work_directory:
+            image_paths = create_test_images(
+                work_directory, count=max(1, n_pictures * 2)
+            )
+            pptx_model = create_synthetic_deck(
+                n_slides, n_text_boxes, n_pictures, image_paths
+            )
+
+            started = time.perf_counter()
+            pickled_model = pickle.dumps(pptx_model)
+            pickle_seconds = time.perf_counter() - started
+
+            # Keep stdout for the JSON results
+            with stdout_to_devnull():
+                runs = [
+                    run_once(pptx_model, work_directory, n_workers)
+                    for _ in range(repeat)
+                ]
+    finally:
+        if app_data_directory is None:
+            os.environ.pop("APP_DATA_DIRECTORY", None)
+        else:
+            os.environ["APP_DATA_DIRECTORY"] = app_data_directory
+
+    stages = {}
+    # Short stages can fall between two samples, take every stage seen
+    stage_names = dict.fromkeys(
+        stage for stage_seconds, _, _ in runs for stage in stage_seconds
+    )
+    for stage in stage_names:
+        values = [stage_seconds.get(stage, 0.0) for stage_seconds, _, _ in runs]
+        stages[stage] = {
+            "median": round(statistics.median(values), 4),
+            "min": round(min(values), 4),
+            "max": round(max(values), 4),
+        }
+
+    return {
+        "workload": {
+            "slides": n_slides,
+            "text_boxes_per_slide": n_text_boxes,
+            "pictures_per_slide": n_pictures,
+            "workers": n_workers,
+            "repeat": repeat,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "seconds": stages,
+        "model_pickle": {
+            "seconds": round(pickle_seconds, 4),
+            "size_mb": round(len(pickled_model) / (1024 * 1024), 2),
+        },
+        "file_size_mb": round(runs[-1][1], 2),
+        "peak_rss_mb": {
+            "server": get_peak_rss_mb(),
+            # Peak of each worker in the last run, sampled before shutdown
+            "workers": runs[-1][2],
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--slides", type=int, default=20)
+    parser.add_argument("--text-boxes", type=int, default=4)
+    parser.add_argument("--pictures", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Also write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = run(args.slides, args.text_boxes, args.pictures, args.workers, args.repeat)
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
@@ -0,0 +1,20 @@
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class PptxExportJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class PptxExportJobModel(BaseModel):
+    id: str
+    status: PptxExportJobStatus = PptxExportJobStatus.QUEUED
+    stage: Optional[str] = None
+    progress: float = 0.0
+    path: Optional[str] = None
+    error: Optional[str] = None
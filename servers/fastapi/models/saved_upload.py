@@ -0,0 +1,11 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SavedUpload(BaseModel):
+    path: str
+    size: int
+    sha256: str
+    filename: Optional[str] = None
+    content_type: Optional[str] = None
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional, List
 import uuid
-from sqlalchemy import Column, DateTime, Text, JSON
+from sqlalchemy import Column, DateTime, Index, Text, JSON
 from sqlmodel import SQLModel, Field
 
 from utils.datetime_utils import get_current_utc_datetime
@@ -11,6 +11,15 @@ class PresentationLayoutCodeModel(SQLModel, table=True):
     """Model for storing presentation layout codes"""
 
     __tablename__ = "presentation_layout_codes"
+    __table_args__ = (
+        # Saving layouts upserts on (presentation, layout_id)
+        Index(
+            "ix_presentation_layout_codes_presentation_layout_id",
+            "presentation",
+            "layout_id",
+            unique=True,
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     presentation: uuid.UUID = Field(index=True, description="UUID of the presentation")
@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     AsyncSession,
 )
+from sqlalchemy import delete, func, select
 from sqlmodel import SQLModel
 
 from models.sql.image_asset import ImageAsset
@@ -49,6 +50,31 @@ async def get_container_db_async_session() -> AsyncGenerator[AsyncSession, None]
         yield session
 
 
+def create_presentation_layout_code_unique_index(sync_conn):
+    """
+    Adds the (presentation, layout_id) unique index to databases created
+    before it existed, keeping the newest row of any duplicates.
+    """
+    table = PresentationLayoutCodeModel.__table__
+    duplicates = sync_conn.execute(
+        select(table.c.presentation, table.c.layout_id, func.max(table.c.id))
+        .group_by(table.c.presentation, table.c.layout_id)
+        .having(func.count(table.c.id) > 1)
+    ).all()
+    for presentation, layout_id, newest_id in duplicates:
+        sync_conn.execute(
+            delete(table).where(
+                table.c.presentation == presentation,
+                table.c.layout_id == layout_id,
+                table.c.id != newest_id,
+            )
+        )
+
+    for index in table.indexes:
+        if index.unique:
+            index.create(sync_conn, checkfirst=True)
+
+
 # Create Database and Tables
 async def create_db_and_tables():
     async with sql_engine.begin() as conn:
@@ -65,6 +91,7 @@ async def create_db_and_tables():
                 ],
             )
         )
+        await conn.run_sync(create_presentation_layout_code_unique_index)
 
     async with container_db_engine.begin() as conn:
         await conn.run_sync(
@@ -0,0 +1,222 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Set
+
+import aiohttp
+
+from utils.download_helpers import DOWNLOAD_MANAGER
+from utils.get_env import get_app_data_directory_env
+
+BUNDLED_CATALOGUE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "assets",
+    "google_fonts.json",
+)
+GOOGLE_FONTS_METADATA_URL = "https://fonts.google.com/metadata/fonts"
+GOOGLE_FONTS_CSS_URL = "https://fonts.googleapis.com/css2?family={family}&display=swap"
+DEFAULT_REFRESH_INTERVAL = 7 * 24 * 60 * 60
+
+
+def get_google_fonts_url(font_name: str) -> str:
+    return GOOGLE_FONTS_CSS_URL.format(family=font_name.replace(" ", "+"))
+
+
+def parse_google_fonts_metadata(content: str) -> List[str]:
+    # The metadata endpoint prefixes its JSON with an XSSI guard
+    content = content.lstrip()
+    if content.startswith(")]}'"):
+        content = content[4:]
+    metadata = json.loads(content)
+    return [each["family"] for each in metadata["familyMetadataList"]]
+
+
+class FontCatalogueService:
+    """Local index of Google Fonts families.
+
+    Lookups are case-insensitive set membership, so font analysis never waits
+    on the network. The bundled catalogue in assets/ is replaced by a refreshed
+    copy in the app data directory once warm_up() has fetched one (at most
+    every refresh_interval seconds).
+
+    Names missing from the catalogue are reported unavailable right away and
+    verified against Google Fonts in the background. The outcome is kept in a
+    persistent positive/negative cache, so the next upload gets it for free.
+    Verification failures (e.g. offline) are not cached.
+    """
+
+    def __init__(
+        self,
+        bundled_catalogue_path: str = BUNDLED_CATALOGUE_PATH,
+        data_directory: Optional[str] = None,
+        refresh_interval: float = DEFAULT_REFRESH_INTERVAL,
+    ):
+        self.bundled_catalogue_path = bundled_catalogue_path
+        self._data_directory = data_directory
+        self.refresh_interval = refresh_interval
+
+        self._lock = threading.Lock()
+        # lowercase family -> family as spelled by Google Fonts
+        self._families: Optional[Dict[str, str]] = None
+        self._lookups: Dict[str, bool] = {}
+        self._verifying: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._warm_up_task: Optional[asyncio.Task] = None
+
+    @property
+    def data_directory(self) -> str:
+        if self._data_directory is None:
+            self._data_directory = os.path.join(
+                get_app_data_directory_env() or "/tmp/presenton", "cache", "fonts"
+            )
+        os.makedirs(self._data_directory, exist_ok=True)
+        return self._data_directory
+
+    @property
+    def catalogue_path(self) -> str:
+        return os.path.join(self.data_directory, "google_fonts.json")
+
+    @property
+    def lookups_path(self) -> str:
+        return os.path.join(self.data_directory, "font_lookups.json")
+
+    def load(self):
+        with self._lock:
+            families = None
+            if os.path.exists(self.catalogue_path):
+                try:
+                    with open(self.catalogue_path, "r") as f:
+                        families = json.load(f)["families"]
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Ignoring unreadable font catalogue: {e}")
+            if families is None:
+                with open(self.bundled_catalogue_path, "r") as f:
+                    families = json.load(f)["families"]
+            self._families = {family.lower(): family for family in families}
+
+            if os.path.exists(self.lookups_path):
+                try:
+                    with open(self.lookups_path, "r") as f:
+                        self._lookups = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"Ignoring unreadable font lookup cache: {e}")
+
+    def get_families(self) -> Dict[str, str]:
+        if self._families is None:
+            self.load()
+        return self._families
+
+    def get_family(self, font_name: str) -> Optional[str]:
+        """Returns the Google Fonts spelling of font_name, None if unavailable."""
+        key = font_name.strip().lower()
+        family = self.get_families().get(key)
+        if family:
+            return family
+
+        is_available = self._lookups.get(key)
+        if is_available is None:
+            self._schedule_verification(font_name.strip())
+        return font_name.strip() if is_available else None
+
+    def is_available(self, font_name: str) -> bool:
+        return self.get_family(font_name) is not None
+
+    def _schedule_verification(self, font_name: str):
+        key = font_name.lower()
+        if not key or key in self._verifying:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._verifying.add(key)
+        task = loop.create_task(self._verify(font_name))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _verify(self, font_name: str):
+        key = font_name.lower()
+        try:
+            session = DOWNLOAD_MANAGER.get_session()
+            async with session.head(
+                get_google_fonts_url(font_name), timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                # Google Fonts answers 400 for unknown families
+                if response.status not in (200, 400):
+                    return
+                self._lookups[key] = response.status == 200
+            await asyncio.to_thread(self._save_lookups)
+        except Exception as e:
+            print(f"Could not verify Google Font {font_name}: {e}")
+        finally:
+            self._verifying.discard(key)
+
+    def _save_lookups(self):
+        with self._lock:
+            self._write_json(self.lookups_path, dict(self._lookups))
+
+    def _write_json(self, path: str, data):
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(temp_path, path)
+
+    def needs_refresh(self) -> bool:
+        try:
+            age = time.time() - os.path.getmtime(self.catalogue_path)
+        except OSError:
+            return True
+        return age > self.refresh_interval
+
+    async def refresh(self):
+        """Replaces the catalogue with the current Google Fonts family list."""
+        session = DOWNLOAD_MANAGER.get_session()
+        async with session.get(GOOGLE_FONTS_METADATA_URL) as response:
+            response.raise_for_status()
+            content = await response.text()
+        families = parse_google_fonts_metadata(content)
+        if not families:
+            raise ValueError("Google Fonts returned an empty catalogue")
+
+        def save():
+            with self._lock:
+                self._write_json(
+                    self.catalogue_path,
+                    {"source": GOOGLE_FONTS_METADATA_URL, "families": families},
+                )
+                self._families = {family.lower(): family for family in families}
+                # Negative lookups may be stale now, the catalogue answers them
+                self._lookups = {
+                    key: value for key, value in self._lookups.items() if value
+                }
+                self._write_json(self.lookups_path, dict(self._lookups))
+
+        await asyncio.to_thread(save)
+        print(f"Refreshed font catalogue with {len(families)} families.")
+
+    def warm_up(self) -> asyncio.Task:
+        """Loads the catalogue in a worker thread and refreshes it when stale."""
+        if self._warm_up_task is None or self._warm_up_task.done():
+            self._warm_up_task = asyncio.create_task(self._warm_up())
+        return self._warm_up_task
+
+    async def _warm_up(self):
+        try:
+            await asyncio.to_thread(self.load)
+            if self.needs_refresh():
+                await self.refresh()
+        except Exception as e:
+            print(f"Failed to refresh font catalogue: {e}")
+
+    async def close(self):
+        tasks = list(self._tasks)
+        if self._warm_up_task:
+            tasks.append(self._warm_up_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+FONT_CATALOGUE_SERVICE = FontCatalogueService()
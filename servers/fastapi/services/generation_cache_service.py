@@ -0,0 +1,76 @@
+import hashlib
+import json
+from typing import Optional
+
+from utils.disk_lru_cache import DiskLruCache
+
+DEFAULT_MAX_CACHE_BYTES = 128 * 1024 * 1024
+
+
+class GenerationCacheService:
+    """On-disk cache of LLM generations (slide-to-HTML, HTML-to-React).
+
+    Keys hash the kind of generation, its prompt version, the model settings
+    and every input (image bytes, OXML, fonts, HTML), so identical requests
+    are answered without calling the model again. Prompt versions are derived
+    from the prompt text, editing a prompt invalidates its entries. The least
+    recently used entries are evicted once the cache grows past max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_directory: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    ):
+        self._disk_cache = DiskLruCache(
+            "generations", cache_directory, max_bytes=max_bytes
+        )
+
+    @property
+    def cache_directory(self) -> str:
+        return self._disk_cache.cache_directory
+
+    @cache_directory.setter
+    def cache_directory(self, cache_directory: str):
+        self._disk_cache.cache_directory = cache_directory
+
+    @property
+    def max_bytes(self) -> int:
+        return self._disk_cache.max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, max_bytes: int):
+        self._disk_cache.max_bytes = max_bytes
+
+    def get_key(self, kind: str, prompt_version: str, **inputs) -> str:
+        payload = json.dumps(
+            {"kind": kind, "prompt_version": prompt_version, "inputs": inputs},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return self._disk_cache.get_path(f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._disk_cache.read_json(f"{key}.json")
+        if entry is None:
+            return None
+        try:
+            return entry["content"]
+        except (TypeError, KeyError):
+            self.delete(key)
+            return None
+
+    def put(self, key: str, content: str, **metadata):
+        self._disk_cache.write_json(f"{key}.json", {**metadata, "content": content})
+
+    def delete(self, key: str):
+        self._disk_cache.delete(f"{key}.json")
+
+    def evict(self):
+        self._disk_cache.evict()
+
+
+GENERATION_CACHE_SERVICE = GenerationCacheService()
@@ -1,8 +1,24 @@
+from functools import lru_cache
 from html.parser import HTMLParser
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from models.pptx_models import PptxFontModel, PptxTextRunModel
 
+# tag -> index of the style it toggles in the style counters
+STYLE_TAGS = {
+    "strong": 0,
+    "b": 0,
+    "em": 1,
+    "i": 1,
+    "u": 2,
+    "s": 3,
+    "strike": 3,
+    "del": 3,
+    "code": 4,
+}
+
+FONT_FIELDS = tuple(PptxFontModel.model_fields)
+
 
 class InlineHTMLToRunsParser(HTMLParser):
     def __init__(self, base_font: PptxFontModel):
@@ -10,27 +26,31 @@ class InlineHTMLToRunsParser(HTMLParser):
         self.base_font = base_font
         self.tag_stack: List[str] = []
         self.text_runs: List[PptxTextRunModel] = []
+        # Open tag count per style (bold, italic, underline, strike, code),
+        # updated on every push and pop so fonts never rescan the stack
+        self._style_counts = [0, 0, 0, 0, 0]
+        self._fonts: Dict[Tuple[bool, ...], PptxFontModel] = {}
 
     def _current_font(self) -> PptxFontModel:
-        font_json = self.base_font.model_dump()
-        is_bold = any(tag in ("strong", "b") for tag in self.tag_stack)
-        is_italic = any(tag in ("em", "i") for tag in self.tag_stack)
-        is_underline = any(tag == "u" for tag in self.tag_stack)
-        is_strike = any(tag in ("s", "strike", "del") for tag in self.tag_stack)
-        is_code = any(tag == "code" for tag in self.tag_stack)
-
-        if is_bold:
-            font_json["font_weight"] = 700
-        if is_italic:
-            font_json["italic"] = True
-        if is_underline:
-            font_json["underline"] = True
-        if is_strike:
-            font_json["strike"] = True
-        if is_code:
-            font_json["name"] = "Courier New"
-
-        return PptxFontModel(**font_json)
+        style = tuple(count > 0 for count in self._style_counts)
+        font = self._fonts.get(style)
+        if font is None:
+            is_bold, is_italic, is_underline, is_strike, is_code = style
+            update = {}
+            if is_bold:
+                update["font_weight"] = 700
+            if is_italic:
+                update["italic"] = True
+            if is_underline:
+                update["underline"] = True
+            if is_strike:
+                update["strike"] = True
+            if is_code:
+                update["name"] = "Courier New"
+
+            font = self.base_font.model_copy(update=update)
+            self._fonts[style] = font
+        return font
 
     def handle_starttag(self, tag, attrs):
         tag = tag.lower()
@@ -38,12 +58,16 @@ class InlineHTMLToRunsParser(HTMLParser):
             self.text_runs.append(PptxTextRunModel(text="\n"))
             return
         self.tag_stack.append(tag)
+        if tag in STYLE_TAGS:
+            self._style_counts[STYLE_TAGS[tag]] += 1
 
     def handle_endtag(self, tag):
         tag = tag.lower()
         for i in range(len(self.tag_stack) - 1, -1, -1):
             if self.tag_stack[i] == tag:
                 del self.tag_stack[i]
+                if tag in STYLE_TAGS:
+                    self._style_counts[STYLE_TAGS[tag]] -= 1
                 break
 
     def handle_data(self, data):
@@ -52,14 +76,41 @@ class InlineHTMLToRunsParser(HTMLParser):
         self.text_runs.append(PptxTextRunModel(text=data, font=self._current_font()))
 
 
-def parse_html_text_to_text_runs(
-    text: str, base_font: Optional[PptxFontModel] = None
+def _parse_plain_text_to_text_runs(
+    text: str, base_font: PptxFontModel
 ) -> List[PptxTextRunModel]:
-    normalized_text = text.replace("\r\n", "\n").replace("\r", "\n")
-    normalized_text = normalized_text.replace("\n", "<br>")
+    font = base_font.model_copy()
+    text_runs = []
+    for i, line in enumerate(text.split("\n")):
+        if i:
+            text_runs.append(PptxTextRunModel(text="\n"))
+        if line:
+            text_runs.append(PptxTextRunModel(text=line, font=font))
+    return text_runs
+
 
-    parser = InlineHTMLToRunsParser(base_font if base_font else PptxFontModel())
-    parser.feed(normalized_text)
-    return parser.text_runs
+@lru_cache(maxsize=4096)
+def _parse_cached(text: str, font_key: tuple) -> Tuple[PptxTextRunModel, ...]:
+    base_font = PptxFontModel(**dict(zip(FONT_FIELDS, font_key)))
 
+    # No markup and no character references, the parser would only split lines
+    if "<" not in text and "&" not in text:
+        return tuple(_parse_plain_text_to_text_runs(text, base_font))
 
+    parser = InlineHTMLToRunsParser(base_font)
+    parser.feed(text.replace("\n", "<br>"))
+    return tuple(parser.text_runs)
+
+
+def parse_html_text_to_text_runs(
+    text: str, base_font: Optional[PptxFontModel] = None
+) -> List[PptxTextRunModel]:
+    """Converts inline HTML to text runs.
+
+    Results are memoized per (text, font), decks repeat the same strings often.
+    The returned runs are shared between calls and must not be modified.
+    """
+    base_font = base_font if base_font else PptxFontModel()
+    normalized_text = text.replace("\r\n", "\n").replace("\r", "\n")
+    font_key = tuple(getattr(base_font, field) for field in FONT_FIELDS)
+    return list(_parse_cached(normalized_text, font_key))
@@ -1,40 +1,116 @@
 import asyncio
-import json
-import chromadb
-from chromadb.config import Settings
-from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+import threading
+from typing import List, Optional, Set, Tuple
+
+import numpy as np
+
+from services.icon_index_service import (
+    IconIndex,
+    build_icon_index,
+    get_cached_icon_index_paths,
+    get_icon_documents,
+)
+
+PLACEHOLDER_ICON_URL = "/static/icons/placeholder.png"
 
 
 class IconFinderService:
-    def __init__(self):
+    """Semantic icon search over the icon catalogue.
+
+    Uses the precomputed NumPy IconIndex shipped in assets/ (built with
+    python -m services.icon_index_service). Without one, the index is built
+    into the app data directory on first initialization and reused after
+    that. The Chroma collection is only a fallback for when building fails.
+
+    Nothing heavy happens at construction. The ONNX embedding model and the
+    index are set up by initialize(), either in the background
+    through warm_up() or on the first search. Searches issued before the service
+    is ready return the placeholder icon instead of waiting.
+    """
+
+    def __init__(self, batch_window: float = 0.01, max_batch_size: int = 64):
         self.collection_name = "icons"
-        self.client = chromadb.PersistentClient(
-            path="chroma", settings=Settings(anonymized_telemetry=False)
-        )
-        print("Initializing icons collection...")
-        self._initialize_icons_collection()
-        print("Icons collection initialized.")
+        # Icon queries arriving within batch_window seconds are embedded
+        # and searched together in a single collection query
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self._pending_queries: List[Tuple[str, int, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.icon_index: Optional[IconIndex] = None
+        self.is_ready = False
+        self._init_lock = threading.Lock()
+        self._warm_up_task: Optional[asyncio.Task] = None
+
+    def initialize(self):
+        with self._init_lock:
+            if self.is_ready:
+                return
+
+            self._initialize_embedding_function()
+
+            self.icon_index = IconIndex.load() or self._load_or_build_icon_index()
+            if self.icon_index:
+                print(f"Loaded icon index with {len(self.icon_index.ids)} icons.")
+            else:
+                import chromadb
+                from chromadb.config import Settings
+
+                self.client = chromadb.PersistentClient(
+                    path="chroma", settings=Settings(anonymized_telemetry=False)
+                )
+                print("Initializing icons collection...")
+                self._initialize_icons_collection()
+                print("Icons collection initialized.")
+            self.is_ready = True
+
+    def warm_up(self) -> asyncio.Task:
+        """Starts initialization in a worker thread, only once."""
+        if self._warm_up_task is None or (
+            self._warm_up_task.done() and not self.is_ready
+        ):
+            self._warm_up_task = asyncio.create_task(self._warm_up())
+        return self._warm_up_task
+
+    async def _warm_up(self):
+        try:
+            await asyncio.to_thread(self.initialize)
+        except Exception as e:
+            print(f"Failed to initialize icons collection: {e}")
+
+    def _load_or_build_icon_index(self) -> Optional[IconIndex]:
+        embeddings_path, ids_path = get_cached_icon_index_paths()
+        try:
+            icon_index = IconIndex.load(embeddings_path, ids_path)
+            if icon_index is None:
+                print("Building icon index...")
+                build_icon_index(
+                    self.embedding_function,
+                    embeddings_path=embeddings_path,
+                    ids_path=ids_path,
+                )
+                icon_index = IconIndex.load(embeddings_path, ids_path)
+            return icon_index
+        except Exception as e:
+            print(f"Failed to build icon index: {e}")
+            return None
+
+    def _initialize_embedding_function(self):
+        from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
 
-    def _initialize_icons_collection(self):
         self.embedding_function = ONNXMiniLM_L6_V2()
         self.embedding_function.DOWNLOAD_PATH = "servers/fastapi/chroma/models"
         self.embedding_function._download_model_if_not_exists()
+
+    def _initialize_icons_collection(self):
         try:
             self.collection = self.client.get_collection(
                 self.collection_name, embedding_function=self.embedding_function
             )
         except Exception:
-            with open("servers/fastapi/assets/icons.json", "r") as f:
-                icons = json.load(f)
-
-            documents = []
-            ids = []
-
-            for i, each in enumerate(icons["icons"]):
-                if each["name"].split("-")[-1] == "bold":
-                    doc_text = f"{each['name']} {each['tags']}"
-                    documents.append(doc_text)
-                    ids.append(each["name"])
+            ids, documents = get_icon_documents()
 
             if documents:
                 self.collection = self.client.create_collection(
@@ -44,13 +120,83 @@ class IconFinderService:
                 )
                 self.collection.add(documents=documents, ids=ids)
 
-    async def search_icons(self, query: str, k: int = 1):
-        result = await asyncio.to_thread(
-            self.collection.query,
-            query_texts=[query],
-            n_results=k,
-        )
-        return [f"/static/icons/bold/{each}.png" for each in result["ids"][0]]
+    def _bind_to_running_loop(self) -> asyncio.AbstractEventLoop:
+        # Pending futures and the flush timer belong to one event loop,
+        # drop them if we are called from a different one
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+            for _, _, future in self._pending_queries:
+                if not future.get_loop().is_closed():
+                    future.get_loop().call_soon_threadsafe(future.cancel)
+            self._loop = loop
+            self._flush_handle = None
+            self._pending_queries = []
+            self._batch_tasks = set()
+        return loop
+
+    async def search_icons(self, query: str, k: int = 1) -> List[str]:
+        if not self.is_ready:
+            self.warm_up()
+            return [PLACEHOLDER_ICON_URL]
+
+        loop = self._bind_to_running_loop()
+        future = loop.create_future()
+        self._pending_queries.append((query, k, future))
+
+        if len(self._pending_queries) >= self.max_batch_size:
+            self._flush_pending_queries()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self.batch_window, self._flush_pending_queries
+            )
+
+        return await future
+
+    async def search_icons_batch(self, queries: List[str], k: int = 1) -> List[List[str]]:
+        return await asyncio.gather(*[self.search_icons(query, k) for query in queries])
+
+    def _query_icon_ids(self, queries: List[str], n_results: int) -> List[List[str]]:
+        if self.icon_index:
+            query_embeddings = np.asarray(self.embedding_function(queries))
+            return self.icon_index.search(query_embeddings, n_results)
+
+        result = self.collection.query(query_texts=queries, n_results=n_results)
+        return result["ids"]
+
+    def _flush_pending_queries(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending_queries, self._pending_queries = self._pending_queries, []
+        if pending_queries:
+            # Keep a reference so the batch is not garbage collected mid-flight
+            task = asyncio.create_task(self._run_batch(pending_queries))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _run_batch(self, pending_queries: List[Tuple[str, int, asyncio.Future]]):
+        unique_queries = list(dict.fromkeys(query for query, _, _ in pending_queries))
+        n_results = max(k for _, k, _ in pending_queries)
+
+        try:
+            result_ids = await asyncio.to_thread(
+                self._query_icon_ids, unique_queries, n_results
+            )
+        except Exception as e:
+            for _, _, future in pending_queries:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        ids_by_query = dict(zip(unique_queries, result_ids))
+        for query, k, future in pending_queries:
+            if not future.done():
+                future.set_result(
+                    [f"/static/icons/bold/{each}.png" for each in ids_by_query[query][:k]]
+                )
 
 
 ICON_FINDER_SERVICE = IconFinderService()
@@ -0,0 +1,126 @@
+import json
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from utils.get_env import get_app_data_directory_env
+
+ASSETS_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets"
+)
+ICONS_JSON_PATH = os.path.join(ASSETS_DIRECTORY, "icons.json")
+ICON_EMBEDDINGS_PATH = os.path.join(ASSETS_DIRECTORY, "icon_embeddings.npy")
+ICON_IDS_PATH = os.path.join(ASSETS_DIRECTORY, "icon_ids.json")
+
+
+def get_icon_documents(icons_json_path: str = ICONS_JSON_PATH) -> Tuple[List[str], List[str]]:
+    """Returns (ids, documents) for every bold icon in the catalogue."""
+    with open(icons_json_path, "r") as f:
+        icons = json.load(f)
+
+    ids = []
+    documents = []
+    for each in icons["icons"]:
+        if each["name"].split("-")[-1] == "bold":
+            ids.append(each["name"])
+            documents.append(f"{each['name']} {each['tags']}")
+    return ids, documents
+
+
+def get_cached_icon_index_paths() -> Tuple[str, str]:
+    """(embeddings, ids) paths of the index built at runtime when assets/ has none."""
+    directory = os.path.join(
+        get_app_data_directory_env() or "/tmp/presenton", "cache", "icon_index"
+    )
+    os.makedirs(directory, exist_ok=True)
+    return (
+        os.path.join(directory, "icon_embeddings.npy"),
+        os.path.join(directory, "icon_ids.json"),
+    )
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def build_icon_index(
+    embedding_function,
+    icons_json_path: str = ICONS_JSON_PATH,
+    embeddings_path: str = ICON_EMBEDDINGS_PATH,
+    ids_path: str = ICON_IDS_PATH,
+):
+    """Embeds the icon catalogue once and writes a float16 matrix plus its id list."""
+    ids, documents = get_icon_documents(icons_json_path)
+    embeddings = normalize_rows(embedding_function(documents)).astype(np.float16)
+
+    # Written to temporary files first, so a concurrent load never sees half of it
+    temp_suffix = f".{os.getpid()}.tmp"
+    with open(embeddings_path + temp_suffix, "wb") as f:
+        np.save(f, embeddings)
+    with open(ids_path + temp_suffix, "w") as f:
+        json.dump(ids, f)
+    os.replace(ids_path + temp_suffix, ids_path)
+    os.replace(embeddings_path + temp_suffix, embeddings_path)
+
+    print(f"Wrote {len(ids)} icon embeddings to {embeddings_path}")
+
+
+class IconIndex:
+    """Read-only cosine similarity index over precomputed icon embeddings.
+
+    The matrix is stored as float16 and converted to float32 once when loaded:
+    numpy has no BLAS path for float16, so scoring in float16 is over an order
+    of magnitude slower.
+    """
+
+    def __init__(self, embeddings: np.ndarray, ids: List[str]):
+        if len(embeddings) != len(ids):
+            raise ValueError(
+                f"Icon index has {len(embeddings)} embeddings but {len(ids)} ids"
+            )
+        self.embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        self.ids = ids
+
+    @classmethod
+    def load(
+        cls,
+        embeddings_path: str = ICON_EMBEDDINGS_PATH,
+        ids_path: str = ICON_IDS_PATH,
+    ) -> Optional["IconIndex"]:
+        if not (os.path.exists(embeddings_path) and os.path.exists(ids_path)):
+            return None
+
+        embeddings = np.load(embeddings_path)
+        with open(ids_path, "r") as f:
+            ids = json.load(f)
+        return cls(embeddings, ids)
+
+    def search(self, query_embeddings: np.ndarray, k: int = 1) -> List[List[str]]:
+        """Returns the ids of the top k icons for each query embedding."""
+        k = max(1, min(k, len(self.ids)))
+        queries = normalize_rows(np.atleast_2d(query_embeddings))
+
+        # (n_queries, n_icons) cosine similarities, rows are already unit length
+        scores = queries @ self.embeddings.T
+
+        if k < scores.shape[1]:
+            top_k = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            top_k = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+
+        results = []
+        for row_scores, row_top_k in zip(scores, top_k):
+            ordered = row_top_k[np.argsort(-row_scores[row_top_k])]
+            results.append([self.ids[i] for i in ordered])
+        return results
+
+
+if __name__ == "__main__":
+    # python -m services.icon_index_service (from servers/fastapi)
+    from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+
+    build_icon_index(ONNXMiniLM_L6_V2())
@@ -0,0 +1,350 @@
+import asyncio
+import json
+import os
+import shutil
+import socket
+import tempfile
+from typing import List, Optional, Tuple
+
+from PIL import Image, UnidentifiedImageError
+
+from utils.process_utils import kill_process_group
+
+NEXTJS_DIRECTORY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "nextjs",
+)
+
+ICON_BACKGROUND_COLOR = (255, 255, 255)
+
+# (source path, output path, width, height)
+IconRenderJob = Tuple[str, str, int, int]
+
+# Long-lived Node worker. Launches one headless browser with a pool of pages,
+# then renders newline-delimited JSON batches read from stdin and answers each
+# batch with one JSON line on stdout.
+RENDERER_SCRIPT = """
+const fs = require('fs');
+const path = require('path');
+const readline = require('readline');
+const puppeteer = require('puppeteer');
+
+const MIME_TYPES = {
+  '.svg': 'image/svg+xml', '.png': 'image/png', '.jpg': 'image/jpeg',
+  '.jpeg': 'image/jpeg', '.gif': 'image/gif', '.webp': 'image/webp',
+};
+
+(async () => {
+  const browser = await puppeteer.launch({
+    headless: true,
+    args: ['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage'],
+  });
+
+  const idlePages = [];
+  const waiters = [];
+  const poolSize = parseInt(process.env.ICON_RENDERER_PAGES || '4', 10);
+  for (let i = 0; i < poolSize; i++) idlePages.push(await browser.newPage());
+  const acquire = () =>
+    idlePages.length ? Promise.resolve(idlePages.pop()) : new Promise((r) => waiters.push(r));
+  const release = (page) => (waiters.length ? waiters.shift()(page) : idlePages.push(page));
+
+  const render = async ([src, out, width, height, background]) => {
+    const page = await acquire();
+    try {
+      const mime = MIME_TYPES[path.extname(src).toLowerCase()] || 'application/octet-stream';
+      const data = fs.readFileSync(src).toString('base64');
+      await page.setViewport({ width, height, deviceScaleFactor: 1 });
+      await page.setContent(
+        `<html><body style="margin:0;width:${width}px;height:${height}px;background:${background}">` +
+          `<img src="data:${mime};base64,${data}" style="display:block;width:100%;height:100%"/>` +
+          `</body></html>`,
+        { waitUntil: 'load', timeout: 10000 }
+      );
+      await page.screenshot({ path: out, type: 'png' });
+      return { out };
+    } catch (error) {
+      return { error: error.message };
+    } finally {
+      release(page);
+    }
+  };
+
+  process.stdout.write(JSON.stringify({ ready: true }) + '\\n');
+
+  const lines = readline.createInterface({ input: process.stdin });
+  lines.on('line', async (line) => {
+    const request = JSON.parse(line);
+    const results = await Promise.all(request.jobs.map(render));
+    process.stdout.write(JSON.stringify({ id: request.id, results }) + '\\n');
+  });
+  lines.on('close', async () => {
+    await browser.close();
+    process.exit(0);
+  });
+})().catch((error) => {
+  console.error('Icon renderer failed:', error.message);
+  process.exit(1);
+});
+"""
+
+
+def can_decode_with_pillow(file_path: str) -> bool:
+    try:
+        with Image.open(file_path):
+            return True
+    except (UnidentifiedImageError, OSError):
+        return False
+
+
+def render_icon_with_pillow(
+    source_path: str, output_path: str, width: int, height: int
+) -> str:
+    """Draws the icon over a solid background so PowerPoint never shows a black box."""
+    icon = Image.open(source_path)
+    if icon.mode != "RGBA":
+        icon = icon.convert("RGBA")
+
+    width = width if width > 0 else icon.width
+    height = height if height > 0 else icon.height
+    if icon.size != (width, height):
+        icon = icon.resize((width, height), Image.LANCZOS)
+
+    result = Image.new("RGB", (width, height), ICON_BACKGROUND_COLOR)
+    result.paste(icon, (0, 0), icon)
+    result.save(output_path, "PNG", optimize=True)
+    return output_path
+
+
+class IconRendererService:
+    """Renders icon snapshots for PPTX exports.
+
+    Raster icons are composited with Pillow in a worker thread. Icons Pillow
+    cannot decode (SVG) are sent to a single long-lived headless browser
+    process that keeps a pool of pages open, so every such icon of an export is
+    rendered in one round trip instead of launching a browser per icon.
+
+    The browser is started on first use. If Node or Puppeteer is unavailable
+    those icons are left unrendered and callers fall back to the source file.
+
+    Export worker processes share the browser of the server process: the server
+    accepts browser jobs on a Unix socket (see serve), and workers created with
+    its address send their jobs there instead of starting a browser each.
+    """
+
+    def __init__(
+        self,
+        page_pool_size: int = 4,
+        timeout: float = 60,
+        address: Optional[str] = None,
+    ):
+        self.page_pool_size = page_pool_size
+        self.timeout = timeout
+        # Socket of the renderer hosted by another process, if any
+        self.address = address
+
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._request_id = 0
+        self._browser_unavailable = False
+
+    def _bind_to_running_loop(self):
+        # Subprocess pipes and locks belong to one event loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # The old worker's pipes are unusable from this loop, kill it
+            # instead of leaving it and its browser running
+            if self._process is not None and self._process.returncode is None:
+                kill_process_group(self._process)
+            if self._server is not None:
+                # Listening socket of the old loop, serve binds a new one
+                self._server.close()
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._process = None
+            self._server = None
+
+    def get_address(self) -> Optional[str]:
+        """Socket path this process serves browser jobs on, None without Unix sockets."""
+        if not hasattr(socket, "AF_UNIX"):
+            return None
+        return os.path.join(
+            tempfile.gettempdir(), f"presenton_icon_renderer_{os.getpid()}.sock"
+        )
+
+    async def serve(self) -> Optional[str]:
+        """Accepts browser jobs from other processes on get_address().
+
+        Started once per event loop, the browser itself still starts on the
+        first job. Returns the address, None if it cannot be served.
+        """
+        self._bind_to_running_loop()
+        address = self.get_address()
+        if address and self._server is None:
+            try:
+                self._server = await asyncio.start_unix_server(
+                    self._handle_connection, address
+                )
+            except OSError as e:
+                print(f"Failed to serve icon renderer on {address}: {e}")
+                return None
+        return address
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            while line := await reader.readline():
+                jobs = [tuple(job) for job in json.loads(line)["jobs"]]
+                results = await self._render_with_browser(jobs)
+                writer.write((json.dumps({"results": results}) + "\n").encode("utf-8"))
+                await writer.drain()
+        except Exception as e:
+            print(f"Icon renderer connection failed: {e}")
+        finally:
+            writer.close()
+
+    async def _render_remotely(self, jobs: List[IconRenderJob]) -> List[Optional[str]]:
+        try:
+            reader, writer = await asyncio.open_unix_connection(self.address)
+        except OSError as e:
+            print(f"Icon renderer at {self.address} is unavailable: {e}")
+            return [None] * len(jobs)
+        try:
+            writer.write((json.dumps({"jobs": jobs}) + "\n").encode("utf-8"))
+            await writer.drain()
+            line = await asyncio.wait_for(reader.readline(), self.timeout)
+            return json.loads(line)["results"]
+        except Exception as e:
+            print(f"Icon renderer at {self.address} failed: {e}")
+            return [None] * len(jobs)
+        finally:
+            writer.close()
+
+    async def _start_browser(self) -> bool:
+        if self._process and self._process.returncode is None:
+            return True
+        if self._browser_unavailable:
+            return False
+
+        node = shutil.which("node")
+        if not node or not os.path.isdir(NEXTJS_DIRECTORY):
+            print("Node.js or Next.js directory not found, browser icon rendering disabled")
+            self._browser_unavailable = True
+            return False
+
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                node,
+                "-e",
+                RENDERER_SCRIPT,
+                cwd=NEXTJS_DIRECTORY,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                env={**os.environ, "ICON_RENDERER_PAGES": str(self.page_pool_size)},
+                # Own process group, so the browser can be killed along with it
+                start_new_session=True,
+            )
+            ready = await asyncio.wait_for(self._process.stdout.readline(), self.timeout)
+            if not ready:
+                raise RuntimeError("renderer exited during startup")
+        except Exception as e:
+            print(f"Failed to start icon renderer: {e}")
+            await self._stop_browser()
+            self._browser_unavailable = True
+            return False
+
+        print("Started icon renderer")
+        return True
+
+    async def _render_with_browser(self, jobs: List[IconRenderJob]) -> List[Optional[str]]:
+        self._bind_to_running_loop()
+        async with self._lock:
+            if not await self._start_browser():
+                return [None] * len(jobs)
+
+            self._request_id += 1
+            background = "rgb({}, {}, {})".format(*ICON_BACKGROUND_COLOR)
+            request = {
+                "id": self._request_id,
+                "jobs": [[*job, background] for job in jobs],
+            }
+            try:
+                self._process.stdin.write((json.dumps(request) + "\n").encode("utf-8"))
+                await self._process.stdin.drain()
+                line = await asyncio.wait_for(
+                    self._process.stdout.readline(), self.timeout
+                )
+                response = json.loads(line)
+            except Exception as e:
+                print(f"Icon renderer failed, restarting on next export: {e}")
+                await self._stop_browser()
+                return [None] * len(jobs)
+
+        results = []
+        for (source_path, _, _, _), result in zip(jobs, response["results"]):
+            if result.get("error"):
+                print(f"Failed to render icon {source_path}: {result['error']}")
+            results.append(result.get("out"))
+        return results
+
+    def _render_with_pillow(self, jobs: List[IconRenderJob]) -> List[Optional[str]]:
+        results = []
+        for job in jobs:
+            try:
+                results.append(render_icon_with_pillow(*job))
+            except Exception as e:
+                print(f"Failed to render icon {job[0]}: {e}")
+                results.append(None)
+        return results
+
+    async def render_icons(self, jobs: List[IconRenderJob]) -> List[Optional[str]]:
+        """Renders every job and returns the output paths, None for failures."""
+        decodable = await asyncio.to_thread(
+            lambda: [can_decode_with_pillow(job[0]) for job in jobs]
+        )
+        pillow_jobs = [job for job, ok in zip(jobs, decodable) if ok]
+        browser_jobs = [job for job, ok in zip(jobs, decodable) if not ok]
+
+        if not browser_jobs:
+            render_browser_jobs = asyncio.sleep(0, [])
+        elif self.address:
+            render_browser_jobs = self._render_remotely(browser_jobs)
+        else:
+            render_browser_jobs = self._render_with_browser(browser_jobs)
+
+        pillow_results, browser_results = await asyncio.gather(
+            asyncio.to_thread(self._render_with_pillow, pillow_jobs),
+            render_browser_jobs,
+        )
+        pillow_results = iter(pillow_results)
+        browser_results = iter(browser_results)
+        return [
+            next(pillow_results) if ok else next(browser_results) for ok in decodable
+        ]
+
+    async def close(self):
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+            await server.wait_closed()
+            try:
+                os.remove(self.get_address())
+            except FileNotFoundError:
+                pass
+        await self._stop_browser()
+
+    async def _stop_browser(self):
+        process, self._process = self._process, None
+        if process is None or process.returncode is not None:
+            return
+        try:
+            # Closing stdin lets the worker shut its browser down cleanly
+            process.stdin.close()
+            await asyncio.wait_for(process.wait(), 10)
+        except Exception:
+            kill_process_group(process)
+
+
+ICON_RENDERER_SERVICE = IconRendererService()
@@ -6,6 +6,7 @@ from google.genai.types import GenerateContentConfig
 from openai import AsyncOpenAI
 from models.image_prompt import ImagePrompt
 from models.sql.image_asset import ImageAsset
+from services.image_rendition_service import IMAGE_RENDITION_SERVICE
 from utils.download_helpers import download_file
 from utils.get_env import get_pexels_api_key_env
 from utils.get_env import get_pixabay_api_key_env
@@ -75,6 +76,7 @@ class ImageGenerationService:
                 if image_path.startswith("http"):
                     return image_path
                 elif os.path.exists(image_path):
+                    await IMAGE_RENDITION_SERVICE.create_renditions_async(image_path)
                     return ImageAsset(
                         path=image_path,
                         is_uploaded=False,
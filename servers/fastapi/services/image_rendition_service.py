@@ -0,0 +1,154 @@
+import asyncio
+import os
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from utils.asset_directory_utils import convert_absolute_path_to_web_path
+
+# Standard widths (in pixels) written for every ingested image
+RENDITION_WIDTHS = (320, 640, 1280)
+RENDITIONS_DIRECTORY_NAME = "renditions"
+# Pixel density renditions are picked for, 2x the 72 points per inch of a slide
+# so pictures stay sharp on projectors and HiDPI screens
+TARGET_DPI = 144
+POINTS_PER_INCH = 72
+
+
+class ImageRenditionService:
+    """Writes downscaled variants of local images and picks the best one for a box.
+
+    Two files are written per width:
+    - a WebP file, served to the browser through ``srcset``
+    - a JPEG (or PNG, for images with transparency) file, embedded in PPTX exports
+      since PowerPoint does not accept WebP pictures
+    """
+
+    def __init__(
+        self,
+        widths: Tuple[int, ...] = RENDITION_WIDTHS,
+        webp_quality: int = 82,
+        jpeg_quality: int = 88,
+        target_dpi: int = TARGET_DPI,
+    ):
+        self.widths = tuple(sorted(widths))
+        self.target_dpi = target_dpi
+        self.webp_quality = webp_quality
+        self.jpeg_quality = jpeg_quality
+
+    def get_renditions_directory(self, source_path: str) -> str:
+        return os.path.join(os.path.dirname(source_path), RENDITIONS_DIRECTORY_NAME)
+
+    def get_rendition_path(self, source_path: str, width: int, ext: str) -> str:
+        stem = os.path.splitext(os.path.basename(source_path))[0]
+        return os.path.join(
+            self.get_renditions_directory(source_path), f"{stem}_{width}w.{ext}"
+        )
+
+    def create_renditions(self, source_path: str) -> Dict[int, str]:
+        """Writes renditions narrower than the source and returns {width: webp path}."""
+        renditions = {}
+        with Image.open(source_path) as image:
+            image.load()
+            has_alpha = image.mode in ("RGBA", "LA", "PA") or (
+                image.mode == "P" and "transparency" in image.info
+            )
+            image = image.convert("RGBA" if has_alpha else "RGB")
+            img_width, img_height = image.size
+
+            os.makedirs(self.get_renditions_directory(source_path), exist_ok=True)
+            for width in self.widths:
+                if width >= img_width:
+                    break
+                height = max(1, round(img_height * width / img_width))
+                resized = image.resize((width, height), Image.LANCZOS)
+
+                webp_path = self.get_rendition_path(source_path, width, "webp")
+                resized.save(webp_path, "WEBP", quality=self.webp_quality, method=4)
+
+                if has_alpha:
+                    resized.save(
+                        self.get_rendition_path(source_path, width, "png"),
+                        "PNG",
+                        optimize=True,
+                    )
+                else:
+                    resized.save(
+                        self.get_rendition_path(source_path, width, "jpg"),
+                        "JPEG",
+                        quality=self.jpeg_quality,
+                        optimize=True,
+                    )
+                renditions[width] = webp_path
+
+        return renditions
+
+    async def create_renditions_async(self, source_path: str) -> Dict[int, str]:
+        try:
+            return await asyncio.to_thread(self.create_renditions, source_path)
+        except Exception as e:
+            print(f"Failed to create renditions for {source_path}: {e}")
+            return {}
+
+    def get_renditions(self, source_path: str, ext: str = "webp") -> Dict[int, str]:
+        """Returns the renditions already written for the source as {width: path}."""
+        renditions = {}
+        for width in self.widths:
+            path = self.get_rendition_path(source_path, width, ext)
+            if os.path.exists(path):
+                renditions[width] = path
+        return renditions
+
+    def get_srcset(self, source_path: str) -> Optional[str]:
+        """Builds a ``srcset`` value from the WebP renditions and the original."""
+        renditions = self.get_renditions(source_path)
+        if not renditions:
+            return None
+
+        entries: List[str] = [
+            f"{convert_absolute_path_to_web_path(path)} {width}w"
+            for width, path in renditions.items()
+        ]
+        try:
+            with Image.open(source_path) as image:
+                entries.append(
+                    f"{convert_absolute_path_to_web_path(source_path)} {image.width}w"
+                )
+        except Exception:
+            pass
+        return ", ".join(entries)
+
+    def pick_rendition(
+        self, source_path: str, target_width: float, target_height: float
+    ) -> str:
+        """Returns the smallest PPTX-compatible rendition covering the target box.
+
+        The box is in points and is converted to pixels at target_dpi. Falls
+        back to the source file when no rendition is large enough.
+        """
+        if target_width <= 0 or target_height <= 0:
+            return source_path
+        target_width = target_width * self.target_dpi / POINTS_PER_INCH
+        target_height = target_height * self.target_dpi / POINTS_PER_INCH
+
+        try:
+            with Image.open(source_path) as image:
+                img_width, img_height = image.size
+        except Exception:
+            return source_path
+
+        for width in self.widths:
+            if width >= img_width:
+                break
+            height = img_height * width / img_width
+            if width < target_width or height < target_height:
+                continue
+            for ext in ("jpg", "png"):
+                path = self.get_rendition_path(source_path, width, ext)
+                if os.path.exists(path):
+                    return path
+
+        return source_path
+
+
+IMAGE_RENDITION_SERVICE = ImageRenditionService()
@@ -3,6 +3,7 @@ import os
 import uuid
 
 from models.sql.image_asset import ImageAsset
+from services.image_rendition_service import IMAGE_RENDITION_SERVICE
 from utils.asset_directory_utils import get_uploads_directory
 
 
@@ -28,6 +29,8 @@ class ImageUploadService:
         with open(file_path, "wb") as buffer:
             buffer.write(content)
 
+        await IMAGE_RENDITION_SERVICE.create_renditions_async(file_path)
+
         image_asset = ImageAsset(
             path=file_path,
             is_uploaded=True,
@@ -50,4 +53,10 @@ class ImageUploadService:
         if not os.path.exists(file_path):
             return False
         os.remove(file_path)
+        for rendition_path in [
+            *IMAGE_RENDITION_SERVICE.get_renditions(file_path, "webp").values(),
+            *IMAGE_RENDITION_SERVICE.get_renditions(file_path, "jpg").values(),
+            *IMAGE_RENDITION_SERVICE.get_renditions(file_path, "png").values(),
+        ]:
+            os.remove(rendition_path)
         return True
\ No newline at end of file
@@ -0,0 +1,327 @@
+import asyncio
+import os
+import shutil
+import signal
+import socket
+import sys
+from typing import List, Optional
+
+from utils.get_env import get_app_data_directory_env
+from utils.process_utils import kill_process_group
+
+# Converts one document through a running LibreOffice instance. Runs under an
+# interpreter that can import uno, which usually is the system python3 rather
+# than the application interpreter.
+UNO_CONVERT_SCRIPT = """
+import sys
+import uno
+from com.sun.star.beans import PropertyValue
+
+
+def prop(name, value):
+    property_value = PropertyValue()
+    property_value.Name = name
+    property_value.Value = value
+    return property_value
+
+
+port, source_path, output_path, filter_name = sys.argv[1:5]
+local_context = uno.getComponentContext()
+resolver = local_context.ServiceManager.createInstanceWithContext(
+    "com.sun.star.bridge.UnoUrlResolver", local_context
+)
+context = resolver.resolve(
+    "uno:socket,host=127.0.0.1,port=%s;urp;StarOffice.ComponentContext" % port
+)
+desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+document = desktop.loadComponentFromURL(
+    uno.systemPathToFileUrl(source_path), "_blank", 0, (prop("Hidden", True),)
+)
+try:
+    document.storeToURL(
+        uno.systemPathToFileUrl(output_path), (prop("FilterName", filter_name),)
+    )
+finally:
+    document.close(True)
+"""
+
+UNO_PYTHON_CANDIDATES = [
+    sys.executable,
+    "/usr/bin/python3",
+    "/usr/lib/libreoffice/program/python",
+    "/Applications/LibreOffice.app/Contents/Resources/python",
+]
+
+
+def get_free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class LibreOfficeInstance:
+    """One headless LibreOffice with its own user profile and UNO listener."""
+
+    def __init__(self, index: int, base_directory: str):
+        self.index = index
+        self.profile_directory = os.path.join(base_directory, f"profile_{index}")
+        self.port: Optional[int] = None
+        self.process: Optional[asyncio.subprocess.Process] = None
+
+    @property
+    def profile_url(self) -> str:
+        return f"file://{self.profile_directory}"
+
+    @property
+    def is_running(self) -> bool:
+        return self.process is not None and self.process.returncode is None
+
+    async def start(self, soffice: str, startup_timeout: float):
+        self.port = get_free_port()
+        self.process = await asyncio.create_subprocess_exec(
+            soffice,
+            "--headless",
+            "--invisible",
+            "--nologo",
+            "--norestore",
+            "--nodefault",
+            f"-env:UserInstallation={self.profile_url}",
+            f"--accept=socket,host=127.0.0.1,port={self.port};urp;",
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            # soffice runs soffice.bin as a child, stop them together
+            start_new_session=True,
+        )
+
+        # The listener opens once the profile is ready
+        deadline = asyncio.get_running_loop().time() + startup_timeout
+        while True:
+            if not self.is_running:
+                raise RuntimeError("LibreOffice exited during startup")
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", self.port)
+                writer.close()
+                return
+            except OSError:
+                if asyncio.get_running_loop().time() > deadline:
+                    await self.stop()
+                    raise RuntimeError("LibreOffice did not start listening in time")
+                await asyncio.sleep(0.25)
+
+    async def stop(self):
+        process, self.process = self.process, None
+        if process is None or process.returncode is not None:
+            return
+        kill_process_group(process, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(process.wait(), 10)
+        except asyncio.TimeoutError:
+            kill_process_group(process)
+
+
+class LibreOfficeService:
+    """Async document conversion backed by a pool of persistent LibreOffice instances.
+
+    Each instance keeps its own user profile and stays running with a UNO
+    listener, so conversions skip LibreOffice startup. At most pool_size
+    conversions run at once, further requests wait for a free instance.
+
+    When no interpreter with the uno module is available, a one-shot
+    soffice --convert-to is run instead. It still reuses the instance's
+    warmed-up profile and never blocks the event loop.
+
+    Profiles live in a directory of their own per server process, so several
+    processes on one host never share a profile.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 2,
+        timeout: float = 500,
+        startup_timeout: float = 60,
+        base_directory: Optional[str] = None,
+    ):
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self._base_directory = base_directory
+        # The per-process default directory is removed on close
+        self._owns_base_directory = base_directory is None
+
+        self._instances: Optional[List[LibreOfficeInstance]] = None
+        self._idle_instances: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._uno_python: Optional[str] = None
+        self._uno_python_checked = False
+
+    @property
+    def base_directory(self) -> str:
+        if self._base_directory is None:
+            # Resolved on first use, in the process that runs the conversions
+            self._base_directory = os.path.join(
+                get_app_data_directory_env() or "/tmp/presenton",
+                "libreoffice",
+                f"profiles_{os.getpid()}",
+            )
+        return self._base_directory
+
+    @property
+    def instances(self) -> List[LibreOfficeInstance]:
+        if self._instances is None:
+            self._instances = [
+                LibreOfficeInstance(i, self.base_directory)
+                for i in range(self.pool_size)
+            ]
+        return self._instances
+
+    def _bind_to_running_loop(self):
+        # The idle queue and subprocess handles belong to one event loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._idle_instances = asyncio.Queue()
+            for instance in self.instances:
+                # Its process handle is unusable from this loop, kill the
+                # instance instead of leaving soffice running
+                if instance.is_running:
+                    kill_process_group(instance.process)
+                instance.process = None
+                self._idle_instances.put_nowait(instance)
+
+    def get_soffice(self) -> str:
+        soffice = shutil.which("soffice") or shutil.which("libreoffice")
+        if not soffice:
+            raise RuntimeError("LibreOffice is not installed")
+        return soffice
+
+    async def get_uno_python(self) -> Optional[str]:
+        if not self._uno_python_checked:
+            self._uno_python_checked = True
+            for candidate in dict.fromkeys(UNO_PYTHON_CANDIDATES):
+                if not os.path.exists(candidate):
+                    continue
+                process = await asyncio.create_subprocess_exec(
+                    candidate,
+                    "-c",
+                    "import uno",
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.DEVNULL,
+                )
+                if await process.wait() == 0:
+                    self._uno_python = candidate
+                    break
+            if not self._uno_python:
+                print("No Python with UNO found, using one-shot LibreOffice conversions")
+        return self._uno_python
+
+    async def convert(
+        self,
+        source_path: str,
+        output_directory: str,
+        output_format: str = "pdf",
+        filter_name: str = "impress_pdf_Export",
+    ) -> str:
+        """Converts source_path into output_directory and returns the output path."""
+        self._bind_to_running_loop()
+        os.makedirs(output_directory, exist_ok=True)
+        output_path = os.path.join(
+            output_directory,
+            f"{os.path.splitext(os.path.basename(source_path))[0]}.{output_format}",
+        )
+
+        instance = await self._idle_instances.get()
+        try:
+            uno_python = await self.get_uno_python()
+            if uno_python:
+                await self._convert_with_uno(instance, uno_python, source_path, output_path, filter_name)
+            else:
+                await self._convert_with_cli(instance, source_path, output_directory, output_format)
+        finally:
+            self._idle_instances.put_nowait(instance)
+
+        if not os.path.exists(output_path):
+            raise RuntimeError("LibreOffice did not produce an output file")
+        return output_path
+
+    async def convert_to_pdf(self, source_path: str, output_directory: str) -> str:
+        return await self.convert(source_path, output_directory)
+
+    async def _convert_with_uno(
+        self,
+        instance: LibreOfficeInstance,
+        uno_python: str,
+        source_path: str,
+        output_path: str,
+        filter_name: str,
+    ):
+        if not instance.is_running:
+            await instance.start(self.get_soffice(), self.startup_timeout)
+
+        await self._run(
+            [
+                uno_python,
+                "-c",
+                UNO_CONVERT_SCRIPT,
+                str(instance.port),
+                os.path.abspath(source_path),
+                os.path.abspath(output_path),
+                filter_name,
+            ],
+            # The instance may still be working on an abandoned conversion
+            on_abort=instance.stop,
+        )
+
+    async def _convert_with_cli(
+        self,
+        instance: LibreOfficeInstance,
+        source_path: str,
+        output_directory: str,
+        output_format: str,
+    ):
+        await self._run(
+            [
+                self.get_soffice(),
+                "--headless",
+                f"-env:UserInstallation={instance.profile_url}",
+                "--convert-to",
+                output_format,
+                "--outdir",
+                output_directory,
+                source_path,
+            ],
+        )
+
+    async def _run(self, args: List[str], on_abort=None):
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            start_new_session=True,
+        )
+        try:
+            _, stderr = await asyncio.wait_for(process.communicate(), self.timeout)
+        except BaseException as e:
+            # Timed out, or the caller went away (e.g. a disconnected SSE
+            # client): never leave a conversion running behind the pool
+            kill_process_group(process)
+            if on_abort:
+                await on_abort()
+            if isinstance(e, asyncio.TimeoutError):
+                raise RuntimeError(
+                    f"LibreOffice conversion timed out after {self.timeout} seconds"
+                )
+            raise
+
+        if process.returncode != 0:
+            raise RuntimeError(
+                f"LibreOffice conversion failed: {stderr.decode(errors='ignore').strip()}"
+            )
+
+    async def close(self):
+        for instance in self._instances or []:
+            await instance.stop()
+        if self._instances is not None and self._owns_base_directory:
+            shutil.rmtree(self.base_directory, ignore_errors=True)
+
+
+LIBREOFFICE_SERVICE = LibreOfficeService()
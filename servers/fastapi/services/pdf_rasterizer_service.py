@@ -0,0 +1,165 @@
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+from typing import Callable, List, Optional, Tuple
+
+import pypdfium2 as pdfium
+
+# ImageMagick was run with -density 150, keep screenshots the same size
+DEFAULT_DPI = 150
+# Documents each worker keeps open, requests for different PDFs interleave
+MAX_OPEN_DOCUMENTS = 4
+
+# Per worker process: (path, size, mtime_ns) -> open document
+_open_documents: "OrderedDict[Tuple[str, int, int], pdfium.PdfDocument]" = OrderedDict()
+
+
+def get_pdf_document(pdf_path: str) -> pdfium.PdfDocument:
+    """Opens pdf_path once per worker, its page tasks reuse the parsed document."""
+    stat = os.stat(pdf_path)
+    key = (os.path.abspath(pdf_path), stat.st_size, stat.st_mtime_ns)
+    pdf = _open_documents.get(key)
+    if pdf is not None:
+        _open_documents.move_to_end(key)
+        return pdf
+
+    pdf = pdfium.PdfDocument(pdf_path)
+    _open_documents[key] = pdf
+    while len(_open_documents) > MAX_OPEN_DOCUMENTS:
+        _, evicted = _open_documents.popitem(last=False)
+        evicted.close()
+    return pdf
+
+
+def get_pdf_page_count(pdf_path: str) -> int:
+    return len(get_pdf_document(pdf_path))
+
+
+def render_pdf_page(
+    pdf_path: str, page_index: int, output_path: str, dpi: int = DEFAULT_DPI
+) -> str:
+    """Renders one page to output_path, the format follows its extension."""
+    page = get_pdf_document(pdf_path)[page_index]
+    try:
+        image = page.render(scale=dpi / 72).to_pil()
+    finally:
+        page.close()
+    if output_path.lower().endswith(".webp"):
+        image.save(output_path, "WEBP", quality=90, method=4)
+    else:
+        image.save(output_path, "PNG")
+    return output_path
+
+
+class PdfRasterizerService:
+    """Renders PDF pages to images in parallel with pdfium.
+
+    Each page is rendered by its own task in a process pool (pdfium is not
+    thread safe), so a deck renders in roughly 1/cores of the serial time.
+    Pages are written as soon as they finish and reported through on_page.
+    Workers keep the last few documents open, so a deck is parsed once per
+    worker rather than once per page.
+
+    Workers are spawned rather than forked: the server is threaded, and a
+    forked child would inherit locks held by other threads at fork time.
+
+    If pdfium crashes a worker (e.g. on a malformed PDF), the broken pool is
+    replaced and the document is retried once before failing.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def rasterize(
+        self,
+        pdf_path: str,
+        output_directory: str,
+        dpi: int = DEFAULT_DPI,
+        image_format: str = "png",
+        on_page: Optional[Callable[[int, int, str], None]] = None,
+    ) -> List[str]:
+        """Writes slide_1.<format>, slide_2.<format>, ... and returns them in page order.
+
+        on_page(page_number, page_count, path) is called as each page completes.
+        """
+        os.makedirs(output_directory, exist_ok=True)
+        reported_pages = set()
+
+        def report_page(page_number: int, page_count: int, path: str):
+            # Pages rendered again on retry are reported once
+            if on_page and page_number not in reported_pages:
+                reported_pages.add(page_number)
+                on_page(page_number, page_count, path)
+
+        for attempt in range(2):
+            try:
+                return await self._rasterize(
+                    pdf_path, output_directory, dpi, image_format, report_page
+                )
+            except BrokenProcessPool:
+                self._reset_executor()
+                if attempt == 1:
+                    raise RuntimeError(
+                        f"PDF rasterizer crashed while rendering {os.path.basename(pdf_path)}"
+                    )
+                print("PDF rasterizer worker crashed, retrying with a new pool")
+
+    async def _rasterize(
+        self,
+        pdf_path: str,
+        output_directory: str,
+        dpi: int,
+        image_format: str,
+        on_page: Callable[[int, int, str], None],
+    ) -> List[str]:
+        loop = asyncio.get_running_loop()
+        executor = self.get_executor()
+
+        # pdfium only ever runs in the pool, never in threads of this process
+        page_count = await loop.run_in_executor(executor, get_pdf_page_count, pdf_path)
+        output_paths = [
+            os.path.join(output_directory, f"slide_{i + 1}.{image_format}")
+            for i in range(page_count)
+        ]
+
+        futures = [
+            loop.run_in_executor(
+                executor, render_pdf_page, pdf_path, i, output_paths[i], dpi
+            )
+            for i in range(page_count)
+        ]
+
+        try:
+            for future in asyncio.as_completed(futures):
+                path = await future
+                on_page(output_paths.index(path) + 1, page_count, path)
+        except BaseException:
+            # Failed, or cancelled by a disconnected client: drop queued pages
+            for future in futures:
+                future.cancel()
+            raise
+
+        return output_paths
+
+    def _reset_executor(self):
+        executor, self._executor = self._executor, None
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        self._reset_executor()
+
+
+PDF_RASTERIZER_SERVICE = PdfRasterizerService()
@@ -0,0 +1,193 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import os
+import threading
+from typing import Dict, Optional, Union
+
+from models.pptx_export_job import PptxExportJobModel, PptxExportJobStatus
+from models.pptx_models import PptxPresentationModel
+from services.icon_renderer_service import ICON_RENDERER_SERVICE
+from services.pptx_export_worker import build_pptx, initialize_export_worker
+from services.temp_file_service import TEMP_FILE_SERVICE
+from utils.asset_directory_utils import get_exports_directory
+import uuid
+
+
+def get_pptx_digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def save_content_addressed_pptx(content: bytes, digest: Optional[str] = None) -> str:
+    """Writes the package to exports/<sha256>.pptx, once per distinct content."""
+    digest = digest or get_pptx_digest(content)
+    pptx_path = os.path.join(get_exports_directory(), f"{digest}.pptx")
+    if not os.path.exists(pptx_path):
+        temp_path = f"{pptx_path}.{uuid.uuid4()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(content)
+        os.replace(temp_path, pptx_path)
+    return pptx_path
+
+
+class PptxExportService:
+    """Builds PPTX files in a dedicated pool of worker processes.
+
+    python-pptx and lxml work is CPU-bound, so running it on the API event loop
+    stalls every other request and SSE stream of the worker. Exports are
+    submitted as jobs instead; each job reports its stage and progress back
+    through a queue, and finished jobs keep their result for max_finished_jobs
+    lookups.
+
+    Workers are spawned rather than forked: the server is threaded, and a
+    forked child would inherit locks held by other threads at fork time. They
+    share the icon renderer (and its browser) of this process.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_finished_jobs: int = 256):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_finished_jobs = max_finished_jobs
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._progress_queue = None
+        self._progress_thread: Optional[threading.Thread] = None
+        self._jobs: "OrderedDict[str, PptxExportJobModel]" = OrderedDict()
+        # Job status is updated from the progress thread and the event loop
+        self._jobs_lock = threading.Lock()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            mp_context = multiprocessing.get_context("spawn")
+            if self._progress_queue is None:
+                self._progress_queue = mp_context.Queue()
+                self._progress_thread = threading.Thread(
+                    target=self._consume_progress, daemon=True
+                )
+                self._progress_thread.start()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=mp_context,
+                initializer=initialize_export_worker,
+                initargs=(self._progress_queue, ICON_RENDERER_SERVICE.get_address()),
+            )
+        return self._executor
+
+    def _consume_progress(self):
+        while True:
+            message = self._progress_queue.get()
+            if message is None:
+                return
+            job_id, stage, progress = message
+            with self._jobs_lock:
+                job = self._jobs.get(job_id)
+                if job and job.status in (
+                    PptxExportJobStatus.QUEUED,
+                    PptxExportJobStatus.RUNNING,
+                ):
+                    # The first report means a worker picked the job up
+                    job.status = PptxExportJobStatus.RUNNING
+                    job.stage = stage
+                    job.progress = progress
+
+    def get_job(self, job_id: str) -> Optional[PptxExportJobModel]:
+        return self._jobs.get(job_id)
+
+    def submit(
+        self, pptx_model: PptxPresentationModel, pptx_path: Optional[str] = None
+    ) -> PptxExportJobModel:
+        """Queues an export. Without pptx_path the job builds the package in memory."""
+        job = PptxExportJobModel(id=str(uuid.uuid4()))
+        with self._jobs_lock:
+            self._jobs[job.id] = job
+        self._tasks[job.id] = asyncio.create_task(self._run(job, pptx_model, pptx_path))
+        return job
+
+    async def wait(self, job_id: str) -> PptxExportJobModel:
+        task = self._tasks.get(job_id)
+        if task:
+            await asyncio.shield(task)
+        return self._jobs[job_id]
+
+    async def export(
+        self, pptx_model: PptxPresentationModel, pptx_path: Optional[str] = None
+    ) -> Union[str, bytes]:
+        """Submits an export and waits for it, raising if the build failed.
+
+        Returns pptx_path, or the package bytes when no path is given.
+        """
+        job = self.submit(pptx_model, pptx_path)
+        result = await asyncio.shield(self._tasks[job.id])
+        if job.status != PptxExportJobStatus.COMPLETED:
+            raise RuntimeError(job.error)
+        return result
+
+    async def _run(
+        self,
+        job: PptxExportJobModel,
+        pptx_model: PptxPresentationModel,
+        pptx_path: Optional[str],
+    ) -> Union[str, bytes, None]:
+        loop = asyncio.get_running_loop()
+        temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
+        result = None
+        executor = None
+        try:
+            # Workers render browser-only icons through this process
+            await ICON_RENDERER_SERVICE.serve()
+            executor = self.get_executor()
+            result = await loop.run_in_executor(
+                executor, build_pptx, job.id, pptx_model, temp_dir, pptx_path
+            )
+            with self._jobs_lock:
+                job.path = pptx_path
+                job.status = PptxExportJobStatus.COMPLETED
+                job.stage = "completed"
+                job.progress = 1.0
+        except Exception as e:
+            print(f"PPTX export {job.id} failed: {e}")
+            if isinstance(e, BrokenProcessPool):
+                # A worker died, the pool cannot take new jobs anymore
+                self._reset_executor(executor)
+            with self._jobs_lock:
+                job.status = PptxExportJobStatus.FAILED
+                job.error = str(e) or e.__class__.__name__
+        finally:
+            self._tasks.pop(job.id, None)
+            await asyncio.to_thread(TEMP_FILE_SERVICE.cleanup_temp_dir, temp_dir)
+            self._prune_finished_jobs()
+        return result
+
+    def _prune_finished_jobs(self):
+        with self._jobs_lock:
+            finished = [
+                job_id
+                for job_id, job in self._jobs.items()
+                if job.status
+                in (PptxExportJobStatus.COMPLETED, PptxExportJobStatus.FAILED)
+            ]
+            for job_id in finished[: max(0, len(finished) - self.max_finished_jobs)]:
+                self._jobs.pop(job_id, None)
+
+    def _reset_executor(self, executor: Optional[ProcessPoolExecutor] = None):
+        """Shuts down executor (default: the current pool) and forgets it."""
+        executor = executor or self._executor
+        if executor is None:
+            return
+        # Other jobs of the same broken pool may already have replaced it
+        if executor is self._executor:
+            self._executor = None
+        # Also stops its management thread and any surviving workers
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def close(self):
+        self._reset_executor()
+        if self._progress_queue is not None:
+            self._progress_queue.put(None)
+            self._progress_queue = None
+
+
+PPTX_EXPORT_SERVICE = PptxExportService()
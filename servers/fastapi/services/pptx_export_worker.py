@@ -0,0 +1,81 @@
+import asyncio
+from io import BytesIO
+from typing import Optional, Union
+import zipfile
+
+from models.pptx_models import PptxPresentationModel
+from services.icon_renderer_service import ICON_RENDERER_SERVICE
+from services.pptx_presentation_creator import (
+    PptxPresentationCreator,
+    disable_image_process_pool,
+)
+
+# Runs inside export worker processes only. Kept free of imports with side
+# effects at import time (like TEMP_FILE_SERVICE wiping the temp directory),
+# since the workers are spawned (see PptxExportService) and import this module
+# from scratch.
+
+# Earliest timestamp a zip entry can hold
+REPRODUCIBLE_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_progress_queue = None
+
+
+def initialize_export_worker(progress_queue, icon_renderer_address: Optional[str] = None):
+    global _worker_loop, _progress_queue
+    _progress_queue = progress_queue
+    # Icons needing a browser go to the renderer of the server process, so
+    # workers never start a browser of their own
+    ICON_RENDERER_SERVICE.address = icon_renderer_address
+    # One event loop per worker for its whole life, so pooled download
+    # sessions and the icon renderer are reused across exports
+    _worker_loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_worker_loop)
+    # Workers already are the parallelism, transform pictures in threads
+    disable_image_process_pool()
+
+
+def get_reproducible_package(content: bytes) -> bytes:
+    """Rewrites the package with a fixed timestamp on every zip entry.
+
+    python-pptx stamps entries with the time of saving, so the same deck saved
+    twice would otherwise produce different bytes (and digests).
+    """
+    output = BytesIO()
+    with zipfile.ZipFile(BytesIO(content)) as source, zipfile.ZipFile(
+        output, "w"
+    ) as package:
+        for info in source.infolist():
+            entry = zipfile.ZipInfo(info.filename, REPRODUCIBLE_ZIP_DATE_TIME)
+            entry.compress_type = info.compress_type
+            entry.external_attr = info.external_attr
+            package.writestr(entry, source.read(info))
+    return output.getvalue()
+
+
+def build_pptx(
+    job_id: str,
+    pptx_model: PptxPresentationModel,
+    temp_dir: str,
+    pptx_path: Optional[str] = None,
+) -> Union[str, bytes]:
+    """Saves the deck to pptx_path and returns it, or returns the package bytes.
+
+    Returned bytes are reproducible, the same model always gives the same package.
+    """
+
+    def on_progress(stage: str, progress: float):
+        _progress_queue.put((job_id, stage, progress))
+
+    pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
+    _worker_loop.run_until_complete(pptx_creator.create_ppt(on_progress))
+
+    on_progress("saving", 0.9)
+    if pptx_path:
+        pptx_creator.save(pptx_path)
+        return pptx_path
+
+    buffer = BytesIO()
+    pptx_creator.save(buffer)
+    return get_reproducible_package(buffer.getvalue())
@@ -1,5 +1,9 @@
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
 import os
-from typing import List, Optional
+from typing import Callable, Dict, List, Optional
 from lxml import etree
 from services.html_to_text_runs_service import (
     parse_html_text_to_text_runs as parse_inline_html_to_runs,
@@ -11,8 +15,7 @@ from pptx.slide import Slide
 from pptx.text.text import _Paragraph, TextFrame, Font, _Run
 from pptx.opc.constants import RELATIONSHIP_TYPE as RT
 from lxml.etree import fromstring, tostring
-from PIL import Image, ImageDraw
-import requests
+from PIL import Image
 import uuid
 from pptx.oxml.xmlchemy import OxmlElement
 
@@ -36,20 +39,50 @@ from models.pptx_models import (
     PptxTextBoxModel,
     PptxTextRunModel,
 )
-from utils.download_helpers import download_files
+from services.icon_renderer_service import (
+    ICON_RENDERER_SERVICE,
+    render_icon_with_pillow,
+)
+from services.image_rendition_service import IMAGE_RENDITION_SERVICE
+from services.processed_asset_cache_service import PROCESSED_ASSET_CACHE_SERVICE
+from utils.download_helpers import download_file
 from utils.get_env import get_app_data_directory_env
 from utils.image_utils import (
-    clip_image,
-    create_circle_image,
-    fit_image,
-    invert_image,
-    round_image_corners,
-    set_image_opacity,
+    transform_picture,
+    transform_picture_file,
 )
-import uuid
 
 BLANK_SLIDE_LAYOUT = 6
 
+_IMAGE_PROCESS_POOL: Optional[ProcessPoolExecutor] = None
+_IMAGE_PROCESS_POOL_ENABLED = True
+
+
+def get_image_process_pool() -> Optional[ProcessPoolExecutor]:
+    """Process pool for CPU-bound picture transformations of in-process callers.
+
+    Only used when the creator runs in the calling process (scripts, tests).
+    Exports through PptxExportService run in worker processes that disable it,
+    and transform pictures in threads. Returns None when disabled.
+
+    Workers are spawned rather than forked, the caller may be threaded.
+    """
+    global _IMAGE_PROCESS_POOL
+    if not _IMAGE_PROCESS_POOL_ENABLED:
+        return None
+    if _IMAGE_PROCESS_POOL is None:
+        _IMAGE_PROCESS_POOL = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _IMAGE_PROCESS_POOL
+
+
+def disable_image_process_pool():
+    """Used by export worker processes, which must not start a pool of their own."""
+    global _IMAGE_PROCESS_POOL_ENABLED
+    _IMAGE_PROCESS_POOL_ENABLED = False
+
 
 class PptxPresentationCreator:
 
@@ -63,6 +96,11 @@ class PptxPresentationCreator:
         self._ppt.slide_width = Pt(1280)
         self._ppt.slide_height = Pt(720)
 
+        # id(picture model) -> transformed image path, filled by process_pictures
+        self._processed_pictures: Dict[int, str] = {}
+        # remote picture url -> downloaded file, filled by fetch_network_assets
+        self._network_pictures: Dict[str, str] = {}
+
     def get_sub_element(self, parent, tagname, **kwargs):
         """Helper method to create XML elements"""
         element = OxmlElement(tagname)
@@ -70,82 +108,6 @@ class PptxPresentationCreator:
         parent.append(element)
         return element
 
-    def _apply_smooth_border_radius(self, image: Image.Image, radii: List[int]) -> Image.Image:
-        """Apply smooth anti-aliased border radius to image."""
-        if not radii or all(r == 0 for r in radii):
-            return image
-            
-        w, h = image.size
-        max_radius = min(w // 2, h // 2)
-        clamped_radii = [min(radius, max_radius) for radius in radii]
-        
-        # Use 4x supersampling for smooth edges
-        scale = 4
-        high_w, high_h = w * scale, h * scale
-        high_radii = [r * scale for r in clamped_radii]
-        
-        # Scale up image
-        high_image = image.resize((high_w, high_h), Image.LANCZOS)
-        
-        # Create high-res mask
-        mask = Image.new("L", (high_w, high_h), 0)
-        draw = ImageDraw.Draw(mask)
-        
-        # Draw main rectangle
-        max_r = max(high_radii)
-        draw.rectangle((max_r, 0, high_w - max_r, high_h), fill=255)
-        draw.rectangle((0, max_r, high_w, high_h - max_r), fill=255)
-        
-        # Draw smooth corners using ellipses
-        for i, radius in enumerate(high_radii):
-            if radius > 0:
-                if i == 0:  # top-left
-                    draw.ellipse((0, 0, radius * 2, radius * 2), fill=255)
-                elif i == 1:  # top-right
-                    draw.ellipse((high_w - radius * 2, 0, high_w, radius * 2), fill=255)
-                elif i == 2:  # bottom-right  
-                    draw.ellipse((high_w - radius * 2, high_h - radius * 2, high_w, high_h), fill=255)
-                elif i == 3:  # bottom-left
-                    draw.ellipse((0, high_h - radius * 2, radius * 2, high_h), fill=255)
-        
-        # Apply mask
-        high_image.putalpha(mask)
-        
-        # Scale back down with high quality
-        return high_image.resize((w, h), Image.LANCZOS)
-    
-    def _create_smooth_circle_image(self, image: Image.Image) -> Image.Image:
-        """Create smooth anti-aliased circle image."""
-        w, h = image.size
-        
-        # Use 4x supersampling
-        scale = 4
-        high_w, high_h = w * scale, h * scale
-        
-        # Scale up image
-        high_image = image.resize((high_w, high_h), Image.LANCZOS)
-        
-        # Create circular mask
-        mask = Image.new("L", (high_w, high_h), 0)
-        draw = ImageDraw.Draw(mask)
-        
-        # Calculate circle dimensions
-        circle_size = min(high_w, high_h)
-        radius = circle_size // 2
-        center_x, center_y = high_w // 2, high_h // 2
-        
-        # Draw anti-aliased circle
-        draw.ellipse((
-            center_x - radius, center_y - radius,
-            center_x + radius, center_y + radius
-        ), fill=255)
-        
-        # Apply mask
-        high_image.putalpha(mask)
-        
-        # Scale back down with high quality
-        return high_image.resize((w, h), Image.LANCZOS)
-
     def _is_transparent_icon(self, image_path: str, local_file_path: str) -> bool:
         """Check if image is likely a transparent icon (PNG/SVG in icons directory)"""
         if not image_path:
@@ -165,45 +127,33 @@ class PptxPresentationCreator:
         print(f"is_transparent_icon check: image_path={image_path}, local_file_path={local_file_path}, is_from_icons={is_from_icons}, is_icon_format={is_icon_format}, result={result}")
         return result
 
+    def _get_icon_cache_key(
+        self, local_file_path: str, picture_model: PptxPictureBoxModel
+    ) -> str:
+        return PROCESSED_ASSET_CACHE_SERVICE.get_key(
+            local_file_path,
+            "icon_with_background",
+            width=picture_model.position.width,
+            height=picture_model.position.height,
+        )
+
     def _create_icon_with_background(self, local_file_path: str, picture_model: PptxPictureBoxModel) -> str:
         """Create icon with solid background to avoid transparency issues"""
         try:
             print(f"Creating icon with background: {local_file_path}")
-            
-            # Load the original icon
-            icon = Image.open(local_file_path)
-            print(f"Original icon mode: {icon.mode}, size: {icon.size}")
-            
-            # Convert to RGBA for processing
-            if icon.mode != 'RGBA':
-                icon = icon.convert('RGBA')
-            
-            # Get target size
-            width = int(picture_model.position.width) if picture_model.position.width > 0 else icon.width
-            height = int(picture_model.position.height) if picture_model.position.height > 0 else icon.height
-            
-            # Resize icon if needed
-            if icon.size != (width, height):
-                icon = icon.resize((width, height), Image.LANCZOS)
-            
-            # Create background - use white background by default
-            # You can customize this color based on your needs
-            background_color = (255, 255, 255, 255)  # White background
-            
-            # Create new image with solid background
-            result_image = Image.new('RGBA', (width, height), background_color)
-            
-            # Paste the icon on top of the background
-            # The icon's alpha channel will be used for blending
-            result_image.paste(icon, (0, 0), icon)
-            
-            # Convert to RGB to remove alpha channel completely
-            final_image = Image.new('RGB', (width, height), (255, 255, 255))
-            final_image.paste(result_image, (0, 0), result_image)
-            
-            # Save processed image
-            processed_path = os.path.join(self._temp_dir, f"icon_bg_{uuid.uuid4()}.png")
-            final_image.save(processed_path, "PNG", quality=95, optimize=True)
+
+            cache_key = self._get_icon_cache_key(local_file_path, picture_model)
+            cached_path = PROCESSED_ASSET_CACHE_SERVICE.get(cache_key, self._temp_dir)
+            if cached_path:
+                return cached_path
+
+            processed_path = render_icon_with_pillow(
+                local_file_path,
+                os.path.join(self._temp_dir, f"icon_bg_{uuid.uuid4()}.png"),
+                int(picture_model.position.width),
+                int(picture_model.position.height),
+            )
+            processed_path = PROCESSED_ASSET_CACHE_SERVICE.put(cache_key, processed_path)
             
             print(f"Created icon with background: {processed_path}")
             return processed_path
@@ -213,142 +163,6 @@ class PptxPresentationCreator:
             # Return original file as fallback
             return local_file_path
 
-    def _create_html_element_screenshot(self, image_path: str, picture_model: PptxPictureBoxModel) -> str:
-        """Create screenshot of HTML element instead of processing transparent icon"""
-        try:
-            print(f"Creating screenshot for HTML element: {image_path}")
-            
-            # Extract the element information to create HTML for screenshot
-            # For icons, we'll create a simple HTML div with the icon
-            width = int(picture_model.position.width)
-            height = int(picture_model.position.height)
-            
-            # Create HTML content for the icon element
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="UTF-8">
-                <style>
-                    body {{
-                        margin: 0;
-                        padding: 0;
-                        width: {width}px;
-                        height: {height}px;
-                        background: transparent;
-                    }}
-                    .icon-container {{
-                        width: 100%;
-                        height: 100%;
-                        display: flex;
-                        align-items: center;
-                        justify-content: center;
-                        background: transparent;
-                    }}
-                    .icon-img {{
-                        width: 100%;
-                        height: 100%;
-                        object-fit: cover;
-                        background: transparent;
-                    }}
-                </style>
-            </head>
-            <body>
-                <div class="icon-container">
-                    <img src="file://{local_file_path}" alt="icon" class="icon-img" />
-                </div>
-            </body>
-            </html>
-            """
-            
-            # Save HTML to temporary file
-            html_file_path = os.path.join(self._temp_dir, f"icon_{uuid.uuid4()}.html")
-            with open(html_file_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-            
-            # Use puppeteer to take screenshot
-            screenshot_path = os.path.join(self._temp_dir, f"icon_screenshot_{uuid.uuid4()}.png")
-            
-            # Call puppeteer via subprocess
-            import subprocess
-            
-            # First check if node and puppeteer are available
-            try:
-                # Check if node is available
-                node_check = subprocess.run(["node", "--version"], capture_output=True, text=True, timeout=5)
-                if node_check.returncode != 0:
-                    print("Node.js not found, falling back to original file")
-                    return local_file_path
-                    
-                # Check if puppeteer is available in nextjs directory
-                nextjs_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "nextjs")
-                if not os.path.exists(nextjs_dir):
-                    print("Next.js directory not found, falling back to original file")
-                    return local_file_path
-                
-                cmd = [
-                    "node", 
-                    "-e",
-                    f"""
-                    process.chdir('{nextjs_dir}');
-                    const puppeteer = require('puppeteer');
-                    (async () => {{
-                        try {{
-                            const browser = await puppeteer.launch({{
-                                headless: true,
-                                args: ['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage']
-                            }});
-                            const page = await browser.newPage();
-                            await page.setViewport({{width: {width}, height: {height}, deviceScaleFactor: 1}});
-                            await page.goto('file://{html_file_path}', {{waitUntil: 'networkidle0', timeout: 10000}});
-                            
-                            // Ensure transparent background
-                            await page.evaluate(() => {{
-                                document.body.style.background = 'transparent';
-                            }});
-                            
-                            await page.screenshot({{
-                                path: '{screenshot_path}',
-                                omitBackground: true,
-                                type: 'png'
-                            }});
-                            await browser.close();
-                            console.log('Screenshot completed successfully');
-                        }} catch (error) {{
-                            console.error('Screenshot error:', error.message);
-                            process.exit(1);
-                        }}
-                    }})();
-                    """
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, text=True, timeout=30, cwd=nextjs_dir)
-                
-                if result.returncode == 0 and os.path.exists(screenshot_path):
-                    print(f"Successfully created screenshot: {screenshot_path}")
-                    # Clean up temporary HTML file
-                    if os.path.exists(html_file_path):
-                        os.remove(html_file_path)
-                    return screenshot_path
-                else:
-                    print(f"Screenshot failed. Return code: {result.returncode}")
-                    print(f"STDOUT: {result.stdout}")
-                    print(f"STDERR: {result.stderr}")
-                    # Clean up
-                    if os.path.exists(html_file_path):
-                        os.remove(html_file_path)
-                    # Fallback to original file
-                    return local_file_path
-                    
-            except subprocess.TimeoutExpired:
-                print("Screenshot process timed out, falling back to original file")
-                return local_file_path
-            
-        except Exception as e:
-            print(f"Failed to create screenshot for {image_path}: {e}")
-            # Return original file as fallback
-            return local_file_path
-    
     def _prepare_transparent_icon(self, local_file_path: str) -> str:
         """Prepare transparent icon for PPTX to ensure proper transparency and eliminate black backgrounds"""
         try:
@@ -452,14 +266,207 @@ class PptxPresentationCreator:
             # Return original file as fallback
             return local_file_path
 
+    def _get_network_picture_urls(self) -> List[str]:
+        urls = []
+        for slide_model in self._slide_models:
+            for shape_model in slide_model.shapes:
+                if type(shape_model) is not PptxPictureBoxModel:
+                    continue
+                image_path = shape_model.picture.path
+                if image_path.startswith("http") and not self._convert_url_to_local_path(image_path):
+                    urls.append(image_path)
+        return list(dict.fromkeys(urls))
+
     async def fetch_network_assets(self):
-        # Skip network asset fetching - python-pptx will handle online URLs directly
-        pass
+        """Downloads every remote picture of the deck concurrently before slides are built."""
+        urls = await asyncio.to_thread(self._get_network_picture_urls)
+        if not urls:
+            return
 
-    async def create_ppt(self):
-        await self.fetch_network_assets()
+        # One directory per URL, different URLs often share a file name
+        save_directories = [
+            os.path.join(
+                self._temp_dir,
+                "network_assets",
+                hashlib.sha1(url.encode("utf-8")).hexdigest(),
+            )
+            for url in urls
+        ]
+        results = await asyncio.gather(
+            *[
+                download_file(url, save_directory)
+                for url, save_directory in zip(urls, save_directories)
+            ],
+            return_exceptions=True,
+        )
+
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception) or not result:
+                print(f"Failed to download image from URL {url}: {result}")
+                continue
+            self._network_pictures[url] = result
+
+    def _picture_needs_processing(self, picture_model: PptxPictureBoxModel) -> bool:
+        return bool(
+            picture_model.border_radius or
+            picture_model.shape == PptxBoxShapeEnum.CIRCLE or
+            picture_model.opacity or
+            picture_model.invert
+        )
+
+    def _get_picture_local_path(self, picture_model: PptxPictureBoxModel) -> Optional[str]:
+        """Local file for the picture, using the smallest rendition covering its box."""
+        image_path = picture_model.picture.path
+        if image_path in self._network_pictures:
+            return self._network_pictures[image_path]
+
+        local_file_path = self._convert_url_to_local_path(image_path)
+        if not local_file_path or not os.path.exists(local_file_path):
+            return local_file_path
+
+        if self._is_transparent_icon(image_path, local_file_path):
+            return local_file_path
+
+        return IMAGE_RENDITION_SERVICE.pick_rendition(
+            local_file_path,
+            picture_model.position.width,
+            picture_model.position.height,
+        )
+
+    def _get_transform_cache_key(
+        self, picture_model: PptxPictureBoxModel, local_file_path: str
+    ) -> str:
+        return PROCESSED_ASSET_CACHE_SERVICE.get_key(
+            local_file_path,
+            "transform_picture",
+            border_radius=picture_model.border_radius,
+            circle=picture_model.shape == PptxBoxShapeEnum.CIRCLE,
+            invert=picture_model.invert,
+            opacity=picture_model.opacity,
+        )
 
+    def _collect_picture_jobs(self) -> List[tuple]:
+        """(picture model, local file, cache key) for pictures not already cached."""
+        jobs = []
         for slide_model in self._slide_models:
+            for shape_model in slide_model.shapes:
+                if type(shape_model) is not PptxPictureBoxModel:
+                    continue
+                if not self._picture_needs_processing(shape_model):
+                    continue
+                local_file_path = self._get_picture_local_path(shape_model)
+                if not local_file_path or not os.path.exists(local_file_path):
+                    continue
+
+                cache_key = self._get_transform_cache_key(shape_model, local_file_path)
+                cached_path = PROCESSED_ASSET_CACHE_SERVICE.get(cache_key, self._temp_dir)
+                if cached_path:
+                    self._processed_pictures[id(shape_model)] = cached_path
+                    continue
+                jobs.append((shape_model, local_file_path, cache_key))
+        return jobs
+
+    async def process_pictures(self):
+        """Runs every local picture transformation of the deck in parallel.
+
+        Uses the image process pool when enabled, threads otherwise.
+
+        Transformations already in the processed asset cache are reused as is.
+        """
+        jobs = await asyncio.to_thread(self._collect_picture_jobs)
+        if not jobs:
+            return
+
+        loop = asyncio.get_running_loop()
+        executor = get_image_process_pool() if len(jobs) > 1 else None
+        futures = [
+            loop.run_in_executor(
+                executor,
+                transform_picture_file,
+                local_file_path,
+                os.path.join(self._temp_dir, f"{uuid.uuid4()}.png"),
+                picture_model.border_radius,
+                picture_model.shape == PptxBoxShapeEnum.CIRCLE,
+                picture_model.invert,
+                picture_model.opacity,
+            )
+            for picture_model, local_file_path, _ in jobs
+        ]
+        results = await asyncio.gather(*futures, return_exceptions=True)
+
+        for (picture_model, local_file_path, cache_key), result in zip(jobs, results):
+            if isinstance(result, Exception):
+                print(f"Failed to process image {local_file_path}: {result}")
+                continue
+            self._processed_pictures[id(picture_model)] = await asyncio.to_thread(
+                PROCESSED_ASSET_CACHE_SERVICE.put, cache_key, result
+            )
+
+    def _collect_icon_jobs(self) -> List[tuple]:
+        """(picture model, local file, cache key) for transparent icons not already cached."""
+        jobs = []
+        for slide_model in self._slide_models:
+            for shape_model in slide_model.shapes:
+                if type(shape_model) is not PptxPictureBoxModel:
+                    continue
+                if self._picture_needs_processing(shape_model):
+                    continue
+                local_file_path = self._get_picture_local_path(shape_model)
+                if not local_file_path or not os.path.exists(local_file_path):
+                    continue
+                if not self._is_transparent_icon(shape_model.picture.path, local_file_path):
+                    continue
+
+                cache_key = self._get_icon_cache_key(local_file_path, shape_model)
+                cached_path = PROCESSED_ASSET_CACHE_SERVICE.get(cache_key, self._temp_dir)
+                if cached_path:
+                    self._processed_pictures[id(shape_model)] = cached_path
+                    continue
+                jobs.append((shape_model, local_file_path, cache_key))
+        return jobs
+
+    async def render_icons(self):
+        """Renders every transparent icon of the deck onto a solid background in one batch."""
+        jobs = await asyncio.to_thread(self._collect_icon_jobs)
+        if not jobs:
+            return
+
+        results = await ICON_RENDERER_SERVICE.render_icons(
+            [
+                (
+                    local_file_path,
+                    os.path.join(self._temp_dir, f"icon_bg_{uuid.uuid4()}.png"),
+                    int(picture_model.position.width),
+                    int(picture_model.position.height),
+                )
+                for picture_model, local_file_path, _ in jobs
+            ]
+        )
+
+        for (picture_model, _, cache_key), result in zip(jobs, results):
+            if not result:
+                continue
+            self._processed_pictures[id(picture_model)] = await asyncio.to_thread(
+                PROCESSED_ASSET_CACHE_SERVICE.put, cache_key, result
+            )
+
+    async def create_ppt(
+        self, on_progress: Optional[Callable[[str, float], None]] = None
+    ):
+        """Builds the deck, reporting (stage, fraction done) through on_progress."""
+        report_progress = on_progress or (lambda stage, progress: None)
+
+        report_progress("fetching_assets", 0.0)
+        await self.fetch_network_assets()
+        report_progress("processing_pictures", 0.2)
+        await self.process_pictures()
+        report_progress("rendering_icons", 0.4)
+        await self.render_icons()
+
+        for index, slide_model in enumerate(self._slide_models):
+            report_progress(
+                "building_slides", 0.5 + 0.4 * index / len(self._slide_models)
+            )
             # Adding global shapes to slide
             if self._ppt_model.shapes:
                 slide_model.shapes.append(self._ppt_model.shapes)
@@ -524,44 +531,36 @@ class PptxPresentationCreator:
         image_path = picture_model.picture.path
         
         # Convert URL to local file path
-        local_file_path = self._convert_url_to_local_path(image_path)
+        local_file_path = self._get_picture_local_path(picture_model)
         
         # Check if we need special processing
-        needs_processing = (
-            picture_model.border_radius or 
-            picture_model.shape == PptxBoxShapeEnum.CIRCLE or
-            picture_model.opacity or
-            picture_model.invert
-        )
+        needs_processing = self._picture_needs_processing(picture_model)
         
         try:
             # Check if image is transparent (PNG/SVG icon) 
             is_transparent_icon = self._is_transparent_icon(image_path, local_file_path)
             
-            if needs_processing and local_file_path and os.path.exists(local_file_path):
-                # Load local image for processing
-                image = Image.open(local_file_path)
-                image = image.convert("RGBA")
-                
-                # Apply high-quality processing
-                if picture_model.border_radius:
-                    image = self._apply_smooth_border_radius(image, picture_model.border_radius)
-                
-                if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
-                    image = self._create_smooth_circle_image(image)
-                
-                if picture_model.invert:
-                    from utils.image_utils import invert_image
-                    image = invert_image(image)
-                    
-                if picture_model.opacity:
-                    from utils.image_utils import set_image_opacity
-                    image = set_image_opacity(image, picture_model.opacity)
-                
-                # Save processed image
-                processed_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
-                image.save(processed_path, "PNG", quality=95)
-                final_path = processed_path
+            if id(picture_model) in self._processed_pictures:
+                # Already transformed by process_pictures
+                final_path = self._processed_pictures[id(picture_model)]
+
+            elif needs_processing and local_file_path and os.path.exists(local_file_path):
+                cache_key = self._get_transform_cache_key(picture_model, local_file_path)
+                final_path = PROCESSED_ASSET_CACHE_SERVICE.get(cache_key, self._temp_dir)
+                if not final_path:
+                    # Load local image for processing
+                    image = transform_picture(
+                        Image.open(local_file_path),
+                        picture_model.border_radius,
+                        picture_model.shape == PptxBoxShapeEnum.CIRCLE,
+                        picture_model.invert,
+                        picture_model.opacity,
+                    )
+
+                    # Save processed image
+                    processed_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
+                    image.save(processed_path, "PNG", quality=95)
+                    final_path = PROCESSED_ASSET_CACHE_SERVICE.put(cache_key, processed_path)
                 
             elif is_transparent_icon and local_file_path and os.path.exists(local_file_path):
                 # Create background with icon overlay to avoid transparency issues
@@ -574,9 +573,8 @@ class PptxPresentationCreator:
                 final_path = local_file_path
                 
             else:
-                # Fallback: download from URL if local file not found
-                print(f"Local file not found: {local_file_path}, downloading from URL")
-                final_path = self._download_image_from_url(image_path, needs_processing, picture_model)
+                # Remote pictures were fetched by fetch_network_assets
+                final_path = None
             
             if final_path and os.path.exists(final_path):
                 margined_position = self.get_margined_position(
@@ -660,42 +658,6 @@ class PptxPresentationCreator:
             print(f"Error converting URL to local path: {e}")
             return None
     
-    def _download_image_from_url(self, image_path: str, needs_processing: bool, picture_model: PptxPictureBoxModel) -> str:
-        """Download image from URL as fallback"""
-        try:
-            response = requests.get(image_path, timeout=30)
-            response.raise_for_status()
-            
-            if needs_processing:
-                from io import BytesIO
-                image = Image.open(BytesIO(response.content))
-                image = image.convert("RGBA")
-                
-                # Apply processing (same logic as above)
-                if picture_model.border_radius:
-                    image = self._apply_smooth_border_radius(image, picture_model.border_radius)
-                if picture_model.shape == PptxBoxShapeEnum.CIRCLE:
-                    image = self._create_smooth_circle_image(image)
-                if picture_model.invert:
-                    from utils.image_utils import invert_image
-                    image = invert_image(image)
-                if picture_model.opacity:
-                    from utils.image_utils import set_image_opacity
-                    image = set_image_opacity(image, picture_model.opacity)
-                
-                local_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.png")
-                image.save(local_path, "PNG", quality=95)
-            else:
-                local_path = os.path.join(self._temp_dir, f"{uuid.uuid4()}.jpg")
-                with open(local_path, "wb") as f:
-                    f.write(response.content)
-            
-            return local_path
-            
-        except Exception as e:
-            print(f"Failed to download image from URL {image_path}: {e}")
-            return None
-
     def add_autoshape(self, slide: Slide, autoshape_box_model: PptxAutoShapeBoxModel):
         position = autoshape_box_model.position
         if autoshape_box_model.margin:
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+from typing import Optional, Tuple
+
+from utils.disk_lru_cache import DiskLruCache
+
+DEFAULT_MAX_CACHE_BYTES = 512 * 1024 * 1024
+MAX_REMEMBERED_FILE_HASHES = 4096
+
+
+class ProcessedAssetCacheService:
+    """On-disk cache of images processed for PPTX exports.
+
+    Entries are keyed by the SHA-256 of the source file plus the transformation
+    name and its parameters (including target size), so the same transformation
+    of the same source is reused across exports and decks. The least recently
+    used entries are evicted once the cache grows past max_bytes.
+
+    Export worker processes share the cache, so entries are handed out as hard
+    links into the caller's directory: a picture stays readable even when
+    another process evicts its cache entry before it is embedded.
+    """
+
+    def __init__(
+        self,
+        cache_directory: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_CACHE_BYTES,
+    ):
+        self._disk_cache = DiskLruCache(
+            "processed_assets", cache_directory, max_bytes=max_bytes
+        )
+        self._lock = threading.Lock()
+        # (path, size, mtime_ns) -> sha256, avoids rehashing unchanged sources
+        self._file_hashes: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+
+    @property
+    def cache_directory(self) -> str:
+        return self._disk_cache.cache_directory
+
+    @cache_directory.setter
+    def cache_directory(self, cache_directory: str):
+        self._disk_cache.cache_directory = cache_directory
+
+    def get_file_hash(self, file_path: str) -> str:
+        stat = os.stat(file_path)
+        stat_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            file_hash = self._file_hashes.get(stat_key)
+            if file_hash is not None:
+                self._file_hashes.move_to_end(stat_key)
+                return file_hash
+
+        hasher = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                hasher.update(chunk)
+        file_hash = hasher.hexdigest()
+
+        with self._lock:
+            self._file_hashes[stat_key] = file_hash
+            while len(self._file_hashes) > MAX_REMEMBERED_FILE_HASHES:
+                self._file_hashes.popitem(last=False)
+        return file_hash
+
+    def get_key(self, source_path: str, transformation: str, **params) -> str:
+        payload = json.dumps(
+            {
+                "source": self.get_file_hash(source_path),
+                "transformation": transformation,
+                "params": params,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_path(self, key: str, ext: str = "png") -> str:
+        return self._disk_cache.get_path(f"{key}.{ext}")
+
+    def get(self, key: str, destination_directory: str, ext: str = "png") -> Optional[str]:
+        """Links the cached file into destination_directory, None on a miss."""
+        destination_path = os.path.join(destination_directory, f"cached_{key}.{ext}")
+        # Already linked for another picture of this export
+        if os.path.exists(destination_path):
+            return destination_path
+        if self._disk_cache.link_file(f"{key}.{ext}", destination_path):
+            return destination_path
+        return None
+
+    def put(self, key: str, file_path: str, ext: str = "png") -> str:
+        """Stores a copy of file_path in the cache, file_path stays the caller's."""
+        self._disk_cache.add_file(f"{key}.{ext}", file_path)
+        return file_path
+
+    def evict(self):
+        self._disk_cache.evict()
+
+
+PROCESSED_ASSET_CACHE_SERVICE = ProcessedAssetCacheService()
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+from typing import Iterable, List, Optional
+
+from utils.disk_lru_cache import DiskLruCache
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+class ProcessedUploadCacheService:
+    """Index of processed template uploads (PPTX and PDF), keyed by content hash.
+
+    The key covers the uploaded file and any uploaded font files, so the same
+    deck uploaded again maps to the response computed the first time. Entries
+    list the files they point to (the stored slide screenshots) and are dropped
+    when any of them has gone missing.
+
+    At most max_entries are kept, the least recently used are evicted first.
+    Evicting only forgets the index entry, the screenshots stay where they are
+    since saved templates may reference them.
+    """
+
+    def __init__(
+        self,
+        cache_directory: Optional[str] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self._disk_cache = DiskLruCache(
+            "processed_uploads", cache_directory, max_entries=max_entries
+        )
+
+    @property
+    def cache_directory(self) -> str:
+        return self._disk_cache.cache_directory
+
+    @cache_directory.setter
+    def cache_directory(self, cache_directory: str):
+        self._disk_cache.cache_directory = cache_directory
+
+    @property
+    def max_entries(self) -> int:
+        return self._disk_cache.max_entries
+
+    @max_entries.setter
+    def max_entries(self, max_entries: int):
+        self._disk_cache.max_entries = max_entries
+
+    def get_key(self, kind: str, file_hash: str, font_hashes: Iterable[str] = ()) -> str:
+        payload = json.dumps(
+            {"kind": kind, "file": file_hash, "fonts": sorted(font_hashes)},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return self._disk_cache.get_path(f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self._disk_cache.read_json(f"{key}.json")
+        if entry is None:
+            return None
+
+        if not all(os.path.exists(each) for each in entry["files"]):
+            self.delete(key)
+            return None
+        return entry["result"]
+
+    def put(self, key: str, result: dict, files: List[str]):
+        """Stores result, valid for as long as every path in files exists."""
+        self._disk_cache.write_json(f"{key}.json", {"result": result, "files": files})
+
+    def delete(self, key: str):
+        self._disk_cache.delete(f"{key}.json")
+
+    def evict(self):
+        self._disk_cache.evict()
+
+
+PROCESSED_UPLOAD_CACHE_SERVICE = ProcessedUploadCacheService()
@@ -0,0 +1,70 @@
+import os
+import time
+
+from utils.disk_lru_cache import DiskLruCache
+
+
+def test_writes_only_scan_the_directory_when_over_budget(tmp_path, monkeypatch):
+    cache = DiskLruCache("test", str(tmp_path), max_bytes=100)
+    scans = []
+    scandir = os.scandir
+    monkeypatch.setattr(
+        "utils.disk_lru_cache.os.scandir",
+        lambda path: scans.append(path) or scandir(path),
+    )
+
+    for index in range(4):
+        cache.write_json(f"{index}.json", "x" * 10)
+    # First write syncs the running total, the rest fit in the budget
+    assert len(scans) == 1
+
+    for index in range(4, 12):
+        cache.write_json(f"{index}.json", "x" * 10)
+    assert len(scans) > 1
+    sizes = [entry.stat().st_size for entry in scandir(tmp_path) if entry.name != ".lock"]
+    assert sum(sizes) <= 100
+
+
+def test_least_recently_used_entries_are_evicted_by_count(tmp_path):
+    cache = DiskLruCache("test", str(tmp_path), max_entries=2)
+
+    for index, name in enumerate(("a.json", "b.json")):
+        cache.write_json(name, {"name": name})
+        os.utime(cache.get_path(name), (index, index))
+    assert cache.read_json("a.json") == {"name": "a.json"}
+    cache.write_json("c.json", {"name": "c.json"})
+
+    assert cache.read_json("a.json") is not None
+    assert cache.read_json("b.json") is None
+    assert cache.read_json("c.json") is not None
+
+
+def test_corrupt_json_is_removed_and_stale_temp_files_are_cleaned(tmp_path):
+    cache = DiskLruCache("test", str(tmp_path), max_bytes=1000)
+    with open(cache.get_path("broken.json"), "w") as f:
+        f.write("{broken")
+    assert cache.read_json("broken.json") is None
+    assert not os.path.exists(cache.get_path("broken.json"))
+
+    stale = cache.get_path("entry.json.1.2.tmp")
+    with open(stale, "w") as f:
+        f.write("partial")
+    old = time.time() - 2 * 60 * 60
+    os.utime(stale, (old, old))
+    cache.evict()
+    assert not os.path.exists(stale)
+
+
+def test_link_file_survives_eviction(tmp_path):
+    cache = DiskLruCache("test", str(tmp_path / "cache"), max_bytes=1000)
+    source = tmp_path / "source.bin"
+    source.write_bytes(b"data")
+    cache.add_file("entry.bin", str(source))
+    assert source.exists()
+
+    destination = str(tmp_path / "linked.bin")
+    assert cache.link_file("entry.bin", destination)
+    cache.delete("entry.bin")
+
+    assert open(destination, "rb").read() == b"data"
+    assert not cache.link_file("entry.bin", str(tmp_path / "missing.bin"))
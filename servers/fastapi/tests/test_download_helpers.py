@@ -0,0 +1,116 @@
+import asyncio
+import os
+
+from aiohttp import web
+
+from utils.download_helpers import DownloadManager
+
+
+async def _with_server(handler, callback):
+    app = web.Application()
+    app.router.add_get("/{name}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        return await callback(f"http://127.0.0.1:{port}")
+    finally:
+        await runner.cleanup()
+
+
+def test_download_file_sniffs_extension_and_dedupes(tmp_path):
+    request_count = 0
+
+    async def handler(request):
+        nonlocal request_count
+        request_count += 1
+        await asyncio.sleep(0.05)
+        return web.Response(body=b"\x89PNG" + b"0" * 100, content_type="image/png")
+
+    async def callback(base_url):
+        manager = DownloadManager()
+        try:
+            paths = await asyncio.gather(
+                *[manager.download_file(f"{base_url}/image", str(tmp_path)) for _ in range(5)]
+            )
+            again = await manager.download_file(f"{base_url}/image", str(tmp_path))
+        finally:
+            await manager.close()
+        return paths, again
+
+    paths, again = asyncio.run(_with_server(handler, callback))
+
+    assert request_count == 1
+    assert len(set(paths)) == 1
+    assert again == paths[0]
+    assert paths[0].endswith(".png")
+    assert os.path.getsize(paths[0]) == 104
+
+
+def test_download_file_enforces_max_bytes(tmp_path):
+    async def handler(request):
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for _ in range(10):
+            await response.write(b"0" * 1024)
+        await response.write_eof()
+        return response
+
+    async def callback(base_url):
+        manager = DownloadManager(max_bytes=4096)
+        try:
+            return await manager.download_file(f"{base_url}/big.bin", str(tmp_path))
+        finally:
+            await manager.close()
+
+    assert asyncio.run(_with_server(handler, callback)) is None
+    assert os.listdir(tmp_path) == []
+
+
+def test_session_from_previous_loop_is_closed_and_downloads_are_bounded(tmp_path):
+    async def handler(request):
+        return web.Response(body=b"data", content_type="text/plain")
+
+    manager = DownloadManager(max_remembered=2)
+
+    async def callback(base_url):
+        for name in ("a.txt", "b.txt", "c.txt"):
+            await manager.download_file(f"{base_url}/{name}", str(tmp_path))
+        return manager.get_session()
+
+    first_session = asyncio.run(_with_server(handler, callback))
+    assert len(manager._downloaded) == 2
+    assert not first_session.closed
+
+    async def use_new_loop():
+        session = manager.get_session()
+        await manager.close()
+        return session
+
+    second_session = asyncio.run(use_new_loop())
+    assert first_session.closed
+    assert second_session is not first_session
+
+
+def test_finished_download_keeps_a_newer_in_flight_entry():
+    manager = DownloadManager()
+    key = ("http://example.com/image.png", "/tmp")
+
+    async def run():
+        previous = asyncio.create_task(asyncio.sleep(0))
+        previous.add_done_callback(lambda done: manager._forget_in_flight(key, done))
+        # Started after a rebind, while the previous download was still running
+        current = asyncio.create_task(asyncio.sleep(10))
+        manager._in_flight[key] = current
+
+        await previous
+        await asyncio.sleep(0)
+        assert manager._in_flight[key] is current
+
+        current.cancel()
+        manager._forget_in_flight(key, current)
+        assert key not in manager._in_flight
+
+    asyncio.run(run())
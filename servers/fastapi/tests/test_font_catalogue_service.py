@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+from services.font_catalogue_service import (
+    FontCatalogueService,
+    parse_google_fonts_metadata,
+)
+
+
+def create_service(tmp_path, families=("Open Sans", "Montserrat")) -> FontCatalogueService:
+    bundled_path = tmp_path / "google_fonts.json"
+    bundled_path.write_text(json.dumps({"families": list(families)}))
+    return FontCatalogueService(
+        bundled_catalogue_path=str(bundled_path),
+        data_directory=str(tmp_path / "cache"),
+    )
+
+
+def test_lookup_is_local_and_case_insensitive(tmp_path):
+    service = create_service(tmp_path)
+
+    assert service.get_family("open sans") == "Open Sans"
+    assert service.is_available(" MONTSERRAT ")
+    # Outside an event loop unknown fonts are not verified
+    assert not service.is_available("Corporate Sans")
+    assert not service._verifying
+
+
+def test_unknown_font_is_verified_once_and_cached_persistently(tmp_path, monkeypatch):
+    service = create_service(tmp_path)
+    verified = []
+
+    async def fake_verify(font_name):
+        verified.append(font_name)
+        service._lookups[font_name.lower()] = font_name == "Brand New Font"
+        service._save_lookups()
+        service._verifying.discard(font_name.lower())
+
+    monkeypatch.setattr(service, "_verify", fake_verify)
+
+    async def analyze():
+        results = [service.get_family("Brand New Font") for _ in range(3)]
+        results.append(service.get_family("Corporate Sans"))
+        await asyncio.gather(*service._tasks)
+        return results
+
+    assert asyncio.run(analyze()) == [None, None, None, None]
+    assert verified == ["Brand New Font", "Corporate Sans"]
+
+    reloaded = create_service(tmp_path)
+    assert reloaded.get_family("brand new font") == "brand new font"
+    assert reloaded.get_family("Corporate Sans") is None
+    assert not reloaded._verifying
+
+
+def test_refreshed_catalogue_replaces_bundled_one(tmp_path):
+    service = create_service(tmp_path)
+    (tmp_path / "cache").mkdir()
+    service._write_json(service.catalogue_path, {"families": ["Inter"]})
+    service.load()
+
+    assert service.get_family("Inter") == "Inter"
+    assert service.get_family("Open Sans") is None
+    assert not service.needs_refresh()
+
+
+def test_parse_google_fonts_metadata():
+    content = ")]}'\n" + json.dumps(
+        {"familyMetadataList": [{"family": "Roboto"}, {"family": "Noto Sans JP"}]}
+    )
+    assert parse_google_fonts_metadata(content) == ["Roboto", "Noto Sans JP"]
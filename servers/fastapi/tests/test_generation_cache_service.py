@@ -0,0 +1,74 @@
+import asyncio
+import os
+from types import SimpleNamespace
+
+from api.v1.ppt.endpoints import slide_to_html
+from services.generation_cache_service import GenerationCacheService
+
+
+def test_key_depends_on_prompt_version_and_inputs():
+    service = GenerationCacheService()
+    key = service.get_key("slide_to_html", "v1", xml="<p:sld/>", fonts=["Inter"])
+
+    assert key == service.get_key("slide_to_html", "v1", fonts=["Inter"], xml="<p:sld/>")
+    assert key != service.get_key("slide_to_html", "v2", xml="<p:sld/>", fonts=["Inter"])
+    assert key != service.get_key("slide_to_html", "v1", xml="<p:sld/>", fonts=["Lato"])
+    assert key != service.get_key("html_to_react", "v1", xml="<p:sld/>", fonts=["Inter"])
+
+
+def test_put_get_and_corrupt_entries(tmp_path):
+    service = GenerationCacheService(cache_directory=str(tmp_path))
+    key = service.get_key("slide_to_html", "v1", xml="<p:sld/>")
+
+    assert service.get(key) is None
+    service.put(key, "<div>Slide</div>", prompt_version="v1")
+    assert service.get(key) == "<div>Slide</div>"
+
+    with open(service.get_path(key), "w") as f:
+        f.write("{broken")
+    assert service.get(key) is None
+    assert not os.path.exists(service.get_path(key))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    service = GenerationCacheService(cache_directory=str(tmp_path))
+    keys = [service.get_key("slide_to_html", "v1", index=index) for index in range(3)]
+
+    for index, key in enumerate(keys):
+        service.put(key, "x" * 100)
+        os.utime(service.get_path(key), (index, index))
+    # Reading the oldest entry makes it the most recently used one
+    assert service.get(keys[0]) == "x" * 100
+    service.max_bytes = 250
+    service.evict()
+
+    assert service.get(keys[0]) is not None
+    assert service.get(keys[1]) is None
+    assert service.get(keys[2]) is not None
+
+
+def test_identical_slide_is_generated_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        slide_to_html,
+        "GENERATION_CACHE_SERVICE",
+        GenerationCacheService(cache_directory=str(tmp_path)),
+    )
+    requests = []
+
+    async def create(**kwargs):
+        requests.append(kwargs)
+        return SimpleNamespace(output_text="<div>Slide</div>")
+
+    client = SimpleNamespace(responses=SimpleNamespace(create=create))
+
+    async def generate(fonts):
+        return await slide_to_html.generate_html_from_slide(
+            "aW1hZ2U=", "image/png", "<p:sld/>", "key", fonts=fonts, client=client
+        )
+
+    assert asyncio.run(generate(["Inter"])) == "<div>Slide</div>"
+    assert asyncio.run(generate(["Inter"])) == "<div>Slide</div>"
+    assert len(requests) == 1
+
+    asyncio.run(generate(["Lato"]))
+    assert len(requests) == 2
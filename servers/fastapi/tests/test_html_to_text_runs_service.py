@@ -0,0 +1,41 @@
+from models.pptx_models import PptxFontModel
+from services.html_to_text_runs_service import parse_html_text_to_text_runs
+
+
+def _runs(text, font=None):
+    return [
+        (run.text, run.font.model_dump() if run.font else None)
+        for run in parse_html_text_to_text_runs(text, font)
+    ]
+
+
+def test_plain_text_splits_lines_with_base_font():
+    font = PptxFontModel(name="Arial", size=20)
+
+    assert _runs("first\r\nsecond\n", font) == [
+        ("first", font.model_dump()),
+        ("\n", None),
+        ("second", font.model_dump()),
+        ("\n", None),
+    ]
+
+
+def test_nested_tags_derive_fonts():
+    runs = _runs("<b>bold <i>both</i></b> <code>x</code>&amp;<s>gone</s>")
+    fonts = {text: font for text, font in runs}
+
+    assert fonts["bold "]["font_weight"] == 700
+    assert fonts["both"]["font_weight"] == 700 and fonts["both"]["italic"]
+    assert fonts[" "] == PptxFontModel().model_dump()
+    assert fonts["x"]["name"] == "Courier New"
+    assert fonts["&"] == PptxFontModel().model_dump()
+    assert fonts["gone"]["strike"]
+
+
+def test_results_are_memoized_per_text_and_font():
+    first = parse_html_text_to_text_runs("<b>same</b>", PptxFontModel(size=12))
+    second = parse_html_text_to_text_runs("<b>same</b>", PptxFontModel(size=12))
+    other = parse_html_text_to_text_runs("<b>same</b>", PptxFontModel(size=14))
+
+    assert first[0] is second[0]
+    assert other[0].font.size == 14
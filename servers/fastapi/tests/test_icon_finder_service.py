@@ -0,0 +1,187 @@
+import asyncio
+import functools
+import json
+
+import numpy as np
+
+from services import icon_finder_service
+from services.icon_finder_service import PLACEHOLDER_ICON_URL, IconFinderService
+from services.icon_index_service import IconIndex, build_icon_index
+
+_load_icon_index = IconIndex.load.__func__
+
+
+def _load_without_assets(cls, embeddings_path=None, ids_path=None):
+    # Behaves as if assets/ had no prebuilt index
+    if embeddings_path is None:
+        return None
+    return _load_icon_index(cls, embeddings_path, ids_path)
+
+
+def create_ready_service(**kwargs):
+    service = IconFinderService(**kwargs)
+    service.is_ready = True
+    calls = []
+
+    def query_icon_ids(queries, n_results):
+        calls.append((list(queries), n_results))
+        return [[f"{query}-{index}" for index in range(n_results)] for query in queries]
+
+    service._query_icon_ids = query_icon_ids
+    return service, calls
+
+
+def test_queries_in_one_window_share_a_single_search():
+    service, calls = create_ready_service(batch_window=0.01)
+
+    async def search():
+        return await asyncio.gather(
+            service.search_icons("chart"),
+            service.search_icons("chart", k=2),
+            service.search_icons("user"),
+        )
+
+    results = asyncio.run(search())
+
+    assert calls == [(["chart", "user"], 2)]
+    assert results == [
+        ["/static/icons/bold/chart-0.png"],
+        ["/static/icons/bold/chart-0.png", "/static/icons/bold/chart-1.png"],
+        ["/static/icons/bold/user-0.png"],
+    ]
+    assert not service._batch_tasks
+
+
+def test_full_batch_is_flushed_without_waiting_for_the_window():
+    service, calls = create_ready_service(batch_window=60, max_batch_size=2)
+
+    async def search():
+        return await asyncio.wait_for(
+            service.search_icons_batch(["chart", "user"]), timeout=5
+        )
+
+    assert asyncio.run(search()) == [
+        ["/static/icons/bold/chart-0.png"],
+        ["/static/icons/bold/user-0.png"],
+    ]
+    assert len(calls) == 1
+
+
+def test_pending_state_is_reset_when_the_event_loop_changes():
+    service, calls = create_ready_service(batch_window=60)
+
+    async def leave_query_pending():
+        task = asyncio.create_task(service.search_icons("chart"))
+        await asyncio.sleep(0)
+        assert service._flush_handle is not None
+        task.cancel()
+
+    asyncio.run(leave_query_pending())
+
+    service.batch_window = 0.01
+
+    async def search():
+        return await asyncio.wait_for(service.search_icons("user"), timeout=5)
+
+    assert asyncio.run(search()) == ["/static/icons/bold/user-0.png"]
+    assert calls == [(["user"], 1)]
+
+
+def test_construction_is_lazy_and_searches_before_ready_return_placeholder(monkeypatch):
+    service = IconFinderService()
+    initialized = []
+
+    def initialize():
+        initialized.append(True)
+        service.is_ready = True
+
+    monkeypatch.setattr(service, "initialize", initialize)
+    service._query_icon_ids = lambda queries, n_results: [["chart"] for _ in queries]
+    assert not initialized
+
+    async def search():
+        first = await service.search_icons("chart")
+        second = await service.search_icons("chart")
+        await service._warm_up_task
+        return first, second, await service.search_icons("chart")
+
+    first, second, ready = asyncio.run(search())
+
+    assert first == second == [PLACEHOLDER_ICON_URL]
+    assert ready == ["/static/icons/bold/chart.png"]
+    assert initialized == [True]
+
+
+def test_failed_warm_up_is_retried(monkeypatch):
+    service = IconFinderService()
+    attempts = []
+
+    def initialize():
+        attempts.append(True)
+        if len(attempts) == 1:
+            raise RuntimeError("model download failed")
+        service.is_ready = True
+
+    monkeypatch.setattr(service, "initialize", initialize)
+
+    async def warm_up_twice():
+        await service.warm_up()
+        assert not service.is_ready
+        await service.warm_up()
+
+    asyncio.run(warm_up_twice())
+
+    assert len(attempts) == 2
+    assert service.is_ready
+
+
+def test_initialize_builds_missing_icon_index_once(tmp_path, monkeypatch):
+    embeddings_path = str(tmp_path / "icon_embeddings.npy")
+    ids_path = str(tmp_path / "icon_ids.json")
+    monkeypatch.setattr(
+        icon_finder_service,
+        "get_cached_icon_index_paths",
+        lambda: (embeddings_path, ids_path),
+    )
+    monkeypatch.setattr(IconIndex, "load", classmethod(_load_without_assets))
+    icons_json_path = tmp_path / "icons.json"
+    icons_json_path.write_text(
+        json.dumps(
+            {
+                "icons": [
+                    {"name": "chart-bold", "tags": "graph"},
+                    {"name": "user-bold", "tags": "person"},
+                ]
+            }
+        )
+    )
+    monkeypatch.setattr(
+        icon_finder_service,
+        "build_icon_index",
+        functools.partial(build_icon_index, icons_json_path=str(icons_json_path)),
+    )
+    embedded = []
+
+    def embedding_function(documents):
+        embedded.append(list(documents))
+        return np.array(
+            [[1.0, 0.0] if document.startswith("chart") else [0.0, 1.0] for document in documents]
+        )
+
+    def create_service():
+        service = IconFinderService()
+        monkeypatch.setattr(
+            service,
+            "_initialize_embedding_function",
+            lambda: setattr(service, "embedding_function", embedding_function),
+        )
+        service.initialize()
+        return service
+
+    service = create_service()
+    assert service.icon_index.ids == ["chart-bold", "user-bold"]
+    assert service._query_icon_ids(["user"], 1) == [["user-bold"]]
+
+    # The built index is reused by later starts
+    create_service()
+    assert embedded == [["chart-bold graph", "user-bold person"], ["user"]]
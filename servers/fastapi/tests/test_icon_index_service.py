@@ -0,0 +1,54 @@
+import json
+
+import numpy as np
+
+from services.icon_index_service import IconIndex, build_icon_index
+
+
+def _fake_embedding_function(documents):
+    # One-hot style embeddings keyed on the first letter of each document
+    embeddings = np.zeros((len(documents), 26), dtype=np.float32)
+    for i, document in enumerate(documents):
+        embeddings[i, ord(document[0]) - ord("a")] = 1.0
+        embeddings[i, (ord(document[0]) - ord("a") + 1) % 26] = 0.1
+    return embeddings
+
+
+def test_build_and_search_icon_index(tmp_path):
+    icons_json_path = tmp_path / "icons.json"
+    icons_json_path.write_text(
+        json.dumps(
+            {
+                "icons": [
+                    {"name": "apple-bold", "tags": "fruit"},
+                    {"name": "apple-light", "tags": "fruit"},
+                    {"name": "bank-bold", "tags": "money"},
+                    {"name": "car-bold", "tags": "vehicle"},
+                ]
+            }
+        )
+    )
+    embeddings_path = str(tmp_path / "icon_embeddings.npy")
+    ids_path = str(tmp_path / "icon_ids.json")
+
+    build_icon_index(
+        _fake_embedding_function, str(icons_json_path), embeddings_path, ids_path
+    )
+    index = IconIndex.load(embeddings_path, ids_path)
+
+    # float16 on disk, scored in float32
+    assert np.load(embeddings_path).dtype == np.float16
+    assert index.embeddings.dtype == np.float32
+    assert index.ids == ["apple-bold", "bank-bold", "car-bold"]
+
+    results = index.search(_fake_embedding_function(["bank", "car"]), k=2)
+    assert results[0][0] == "bank-bold"
+    assert results[1][0] == "car-bold"
+    assert all(len(each) == 2 for each in results)
+
+    # k larger than the catalogue returns everything, best match first
+    assert index.search(_fake_embedding_function(["apple"]), k=10)[0][0] == "apple-bold"
+
+
+def test_load_returns_none_without_artifact(tmp_path):
+    assert IconIndex.load(str(tmp_path / "missing.npy"), str(tmp_path / "ids.json")) is None
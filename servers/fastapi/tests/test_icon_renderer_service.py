@@ -0,0 +1,101 @@
+import asyncio
+import os
+import sys
+import time
+
+from PIL import Image
+
+import services.icon_renderer_service as icon_renderer_service
+from services.icon_renderer_service import IconRendererService
+
+
+def test_render_icons_composites_raster_icons_with_pillow(tmp_path, monkeypatch):
+    monkeypatch.setattr(icon_renderer_service, "NEXTJS_DIRECTORY", str(tmp_path / "missing"))
+    icon_path = str(tmp_path / "icon.png")
+    icon = Image.new("RGBA", (10, 10), (0, 0, 0, 0))
+    icon.putpixel((5, 5), (255, 0, 0, 255))
+    icon.save(icon_path)
+    svg_path = tmp_path / "icon.svg"
+    svg_path.write_text('<svg xmlns="http://www.w3.org/2000/svg"/>')
+
+    service = IconRendererService()
+    results = asyncio.run(
+        service.render_icons(
+            [
+                (icon_path, str(tmp_path / "out.png"), 20, 20),
+                (str(svg_path), str(tmp_path / "out_svg.png"), 20, 20),
+            ]
+        )
+    )
+
+    assert results[0] == str(tmp_path / "out.png")
+    # SVG needs the browser, which is unavailable here
+    assert results[1] is None
+
+    with Image.open(results[0]) as rendered:
+        assert rendered.mode == "RGB"
+        assert rendered.size == (20, 20)
+        assert rendered.getpixel((0, 0)) == (255, 255, 255)
+
+
+def test_worker_from_a_previous_event_loop_is_killed():
+    service = IconRendererService()
+
+    async def start_worker():
+        service._bind_to_running_loop()
+        service._process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", "import time; time.sleep(60)", start_new_session=True
+        )
+        return service._process.pid
+
+    pid = asyncio.run(start_worker())
+
+    async def use_new_loop():
+        service._bind_to_running_loop()
+
+    asyncio.run(use_new_loop())
+
+    assert service._process is None
+    for _ in range(50):
+        try:
+            # Reap the killed child if nothing else has
+            os.waitpid(pid, os.WNOHANG)
+            os.kill(pid, 0)
+        except (ProcessLookupError, ChildProcessError):
+            break
+        time.sleep(0.1)
+    else:
+        raise AssertionError("worker process is still running")
+
+
+def test_workers_send_browser_jobs_to_the_hosting_process(tmp_path):
+    host = IconRendererService()
+    rendered = []
+
+    async def render_with_browser(jobs):
+        rendered.extend(jobs)
+        return [output_path for _, output_path, _, _ in jobs]
+
+    host._render_with_browser = render_with_browser
+    svg_path = str(tmp_path / "icon.svg")
+    with open(svg_path, "w") as f:
+        f.write('<svg xmlns="http://www.w3.org/2000/svg"/>')
+
+    async def run():
+        address = await host.serve()
+        worker = IconRendererService(address=address)
+        try:
+            results = await worker.render_icons(
+                [(svg_path, str(tmp_path / "out.png"), 20, 20)]
+            )
+        finally:
+            await host.close()
+        return address, worker, results
+
+    address, worker, results = asyncio.run(run())
+
+    assert results == [str(tmp_path / "out.png")]
+    assert rendered == [(svg_path, str(tmp_path / "out.png"), 20, 20)]
+    # The worker never starts a browser of its own
+    assert worker._process is None
+    assert not os.path.exists(address)
@@ -0,0 +1,75 @@
+import os
+
+from PIL import Image
+
+from services.image_rendition_service import ImageRenditionService
+
+
+def _create_image(path: str, size=(2000, 1000), mode="RGB"):
+    Image.new(mode, size, (200, 100, 50, 255)[: len(mode)]).save(path)
+    return path
+
+
+def test_create_renditions_skips_widths_wider_than_source(tmp_path):
+    source = _create_image(str(tmp_path / "photo.jpg"), size=(1000, 500))
+    service = ImageRenditionService(widths=(320, 640, 1280))
+
+    renditions = service.create_renditions(source)
+
+    assert sorted(renditions.keys()) == [320, 640]
+    for width, path in renditions.items():
+        with Image.open(path) as image:
+            assert image.format == "WEBP"
+            assert image.size == (width, width // 2)
+    assert os.path.exists(service.get_rendition_path(source, 320, "jpg"))
+
+
+def test_transparent_images_get_png_renditions(tmp_path):
+    source = _create_image(str(tmp_path / "logo.png"), size=(800, 800), mode="RGBA")
+    service = ImageRenditionService(widths=(320,))
+
+    service.create_renditions(source)
+
+    assert os.path.exists(service.get_rendition_path(source, 320, "png"))
+    assert not os.path.exists(service.get_rendition_path(source, 320, "jpg"))
+
+
+def test_pick_rendition_returns_smallest_covering_rendition(tmp_path):
+    source = _create_image(str(tmp_path / "photo.jpg"), size=(2000, 1000))
+    service = ImageRenditionService(widths=(320, 640, 1280))
+    service.create_renditions(source)
+
+    # Boxes are in points, picked at 144 DPI: a 150pt box needs 300px
+    assert service.pick_rendition(source, 150, 75) == service.get_rendition_path(
+        source, 320, "jpg"
+    )
+    assert service.pick_rendition(source, 300, 150) == service.get_rendition_path(
+        source, 640, "jpg"
+    )
+    # 640w rendition is only 320px tall, so a taller box needs the 1280w one
+    assert service.pick_rendition(source, 200, 200) == service.get_rendition_path(
+        source, 1280, "jpg"
+    )
+    assert service.pick_rendition(source, 750, 400) == source
+
+
+def test_pick_rendition_at_custom_dpi(tmp_path):
+    source = _create_image(str(tmp_path / "photo.jpg"), size=(2000, 1000))
+    service = ImageRenditionService(widths=(320, 640, 1280), target_dpi=72)
+    service.create_renditions(source)
+
+    assert service.pick_rendition(source, 300, 150) == service.get_rendition_path(
+        source, 320, "jpg"
+    )
+
+
+def test_srcset_lists_renditions_and_original(tmp_path):
+    source = _create_image(str(tmp_path / "photo.jpg"), size=(700, 350))
+    service = ImageRenditionService(widths=(320, 640, 1280))
+    service.create_renditions(source)
+
+    srcset = service.get_srcset(source)
+
+    assert srcset.endswith(f"{source} 700w")
+    assert "photo_320w.webp 320w" in srcset
+    assert "photo_640w.webp 640w" in srcset
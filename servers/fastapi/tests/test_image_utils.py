@@ -0,0 +1,90 @@
+from benchmarks.image_utils_benchmark import (
+    create_test_image,
+    legacy_invert_image,
+    legacy_set_image_opacity,
+)
+from utils.image_utils import invert_image, set_image_opacity
+
+
+def test_invert_image_matches_per_pixel_implementation():
+    image = create_test_image(64)
+
+    assert invert_image(image).tobytes() == legacy_invert_image(image).tobytes()
+
+
+def test_set_image_opacity_matches_per_pixel_implementation():
+    image = create_test_image(64)
+
+    for opacity in (0.0, 0.33, 0.5, 1.0, 1.5):
+        assert (
+            set_image_opacity(image, opacity).tobytes()
+            == legacy_set_image_opacity(image, opacity).tobytes()
+        )
+
+
+def test_set_image_opacity_converts_rgb_images():
+    image = create_test_image(16).convert("RGB")
+
+    result = set_image_opacity(image, 0.5)
+
+    assert result.mode == "RGBA"
+    assert result.getchannel("A").getextrema() == (127, 127)
+
+
+def test_rounded_corner_masks_are_cached_and_anti_aliased():
+    from PIL import Image, ImageDraw
+    import numpy as np
+    from utils.image_utils import get_rounded_corners_mask, round_image_corners
+
+    mask = get_rounded_corners_mask(200, 100, (20, 20, 20, 20))
+    assert get_rounded_corners_mask(200, 100, (20, 20, 20, 20)) is mask
+
+    # Compare with a 4x supersampled reference mask
+    reference = Image.new("L", (800, 400), 0)
+    ImageDraw.Draw(reference).rounded_rectangle((0, 0, 799, 399), radius=80, fill=255)
+    reference = reference.resize((200, 100), Image.LANCZOS)
+    difference = np.abs(np.asarray(mask, dtype=int) - np.asarray(reference, dtype=int))
+    assert difference.mean() < 1
+
+    image = Image.new("RGB", (200, 100), (255, 0, 0))
+    rounded = round_image_corners(image, [20, 0, 20, 0])
+    assert rounded.size == image.size
+    assert rounded.getpixel((0, 0))[3] == 0
+    assert rounded.getpixel((199, 0))[3] == 255
+    assert rounded.getpixel((100, 50)) == (255, 0, 0, 255)
+    corner_alpha = np.asarray(rounded.getchannel("A"))[:20, :20]
+    assert ((corner_alpha > 0) & (corner_alpha < 255)).any()
+
+
+def test_circle_masks_are_cached_and_centred():
+    from PIL import Image
+    from utils.image_utils import create_circle_image, get_circle_mask
+
+    assert get_circle_mask(300, 200) is get_circle_mask(300, 200)
+
+    circle = create_circle_image(Image.new("RGB", (300, 200), (0, 255, 0)))
+    assert circle.getpixel((150, 100))[3] == 255
+    assert circle.getpixel((50, 100))[3] == 255
+    assert circle.getpixel((49, 100))[3] == 0
+    assert circle.getpixel((0, 0))[3] == 0
+
+
+def test_mask_caches_are_bounded_by_bytes(monkeypatch):
+    from utils import image_utils
+    from utils.image_utils import get_circle_mask
+
+    monkeypatch.setattr(image_utils, "MAX_CACHED_MASK_BYTES", 100 * 100)
+    monkeypatch.setattr(image_utils, "MASK_CACHE_MAX_BYTES", 3 * 100 * 100)
+    get_circle_mask.cache_clear()
+
+    # Masks above the per-mask limit are never cached
+    large = get_circle_mask(200, 200)
+    assert get_circle_mask(200, 200) is not large
+    assert get_circle_mask.cache_bytes() == 0
+
+    masks = [get_circle_mask(100, 100 - i) for i in range(4)]
+    assert get_circle_mask.cache_bytes() <= 3 * 100 * 100
+    # The least recently used mask was evicted
+    assert get_circle_mask(100, 100) is not masks[0]
+    assert get_circle_mask(100, 97) is masks[3]
+    get_circle_mask.cache_clear()
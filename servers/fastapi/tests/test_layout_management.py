@@ -0,0 +1,145 @@
+import asyncio
+import uuid
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, inspect, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+
+from api.v1.ppt.endpoints.slide_to_html import (
+    LayoutData,
+    SaveLayoutsRequest,
+    get_presentations_summary,
+    save_layouts,
+)
+from models.sql.presentation_layout_code import PresentationLayoutCodeModel
+from models.sql.template import TemplateModel
+from services.database import create_presentation_layout_code_unique_index
+
+
+def create_layout(presentation, layout_id, code="<div/>"):
+    return LayoutData(
+        presentation=presentation,
+        layout_id=layout_id,
+        layout_name=layout_id.title(),
+        layout_code=code,
+        fonts=["Inter"],
+    )
+
+
+async def create_session_maker(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(
+            lambda sync_conn: SQLModel.metadata.create_all(
+                sync_conn,
+                tables=[
+                    PresentationLayoutCodeModel.__table__,
+                    TemplateModel.__table__,
+                ],
+            )
+        )
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+def test_save_layouts_upserts_and_summary_joins_templates(tmp_path):
+    first, second = uuid.uuid4(), uuid.uuid4()
+
+    async def run():
+        engine, session_maker = await create_session_maker(tmp_path)
+        async with session_maker() as session:
+            session.add(TemplateModel(id=first, name="Brand", description="Deck"))
+            await session.commit()
+
+            response = await save_layouts(
+                SaveLayoutsRequest(
+                    layouts=[
+                        create_layout(first, "title"),
+                        create_layout(first, "content"),
+                        create_layout(second, "title"),
+                    ]
+                ),
+                session,
+            )
+            assert response.saved_count == 3
+
+            await save_layouts(
+                SaveLayoutsRequest(
+                    layouts=[
+                        create_layout(first, "title", "<main/>"),
+                        create_layout(first, "title", "<section/>"),
+                        create_layout(first, "closing"),
+                    ]
+                ),
+                session,
+            )
+
+            layouts = (
+                await session.execute(
+                    select(PresentationLayoutCodeModel).where(
+                        PresentationLayoutCodeModel.presentation == first
+                    )
+                )
+            ).scalars().all()
+            summary = await get_presentations_summary(session)
+        await engine.dispose()
+        return layouts, summary
+
+    layouts, summary = asyncio.run(run())
+
+    codes = {layout.layout_id: layout.layout_code for layout in layouts}
+    assert codes == {"title": "<section/>", "content": "<div/>", "closing": "<div/>"}
+    assert all(layout.created_at and layout.updated_at for layout in layouts)
+
+    assert summary.total_presentations == 2
+    assert summary.total_layouts == 4
+    presentations = {each.presentation_id: each for each in summary.presentations}
+    assert presentations[first].layout_count == 3
+    assert presentations[first].template["name"] == "Brand"
+    assert presentations[second].layout_count == 1
+    assert presentations[second].template is None
+
+
+def test_unique_index_is_added_to_existing_databases(tmp_path):
+    presentation = uuid.uuid4().hex
+    metadata = MetaData()
+    # Table as created before the unique index existed
+    Table(
+        "presentation_layout_codes",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("presentation", String),
+        Column("layout_id", String),
+        Column("layout_code", String),
+    )
+
+    async def run():
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'old.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(metadata.create_all)
+            for code in ("old", "new"):
+                await conn.execute(
+                    text(
+                        "INSERT INTO presentation_layout_codes "
+                        "(presentation, layout_id, layout_code) VALUES (:p, 'title', :c)"
+                    ),
+                    {"p": presentation, "c": code},
+                )
+            await conn.run_sync(create_presentation_layout_code_unique_index)
+            # Running it again is a no-op
+            await conn.run_sync(create_presentation_layout_code_unique_index)
+
+            codes = (
+                await conn.execute(text("SELECT layout_code FROM presentation_layout_codes"))
+            ).scalars().all()
+            indexes = await conn.run_sync(
+                lambda sync_conn: inspect(sync_conn).get_indexes("presentation_layout_codes")
+            )
+        await engine.dispose()
+        return codes, indexes
+
+    codes, indexes = asyncio.run(run())
+
+    assert codes == ["new"]
+    assert [
+        (index["name"], index["unique"]) for index in indexes
+    ] == [("ix_presentation_layout_codes_presentation_layout_id", 1)]
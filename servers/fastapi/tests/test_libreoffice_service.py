@@ -0,0 +1,142 @@
+import asyncio
+import os
+import stat
+import sys
+import time
+
+import services.libreoffice_service as libreoffice_service
+from services.libreoffice_service import LibreOfficeService
+
+# Stands in for soffice --convert-to: records its profile, then writes the output
+FAKE_SOFFICE = """#!/bin/sh
+for arg in "$@"; do
+  case "$arg" in
+    -env:UserInstallation=*) echo "$arg" >> "{log}" ;;
+  esac
+done
+sleep 0.2
+for last in "$@"; do :; done
+name=$(basename "$last")
+echo pdf > "$6/${{name%.*}}.pdf"
+"""
+
+
+def test_convert_without_uno_caps_concurrency_and_reuses_profiles(tmp_path, monkeypatch):
+    bin_directory = tmp_path / "bin"
+    bin_directory.mkdir()
+    log_path = tmp_path / "profiles.log"
+    soffice = bin_directory / "soffice"
+    soffice.write_text(FAKE_SOFFICE.format(log=log_path))
+    soffice.chmod(soffice.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_directory}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(libreoffice_service, "UNO_PYTHON_CANDIDATES", [])
+
+    sources = []
+    for i in range(4):
+        source = tmp_path / f"deck_{i}.pptx"
+        source.write_bytes(b"pptx")
+        sources.append(str(source))
+
+    service = LibreOfficeService(pool_size=2, base_directory=str(tmp_path / "profiles"))
+
+    async def run():
+        started = asyncio.get_running_loop().time()
+        results = await asyncio.gather(
+            *[service.convert_to_pdf(source, str(tmp_path / "out")) for source in sources]
+        )
+        return results, asyncio.get_running_loop().time() - started
+
+    results, elapsed = asyncio.run(run())
+
+    assert results == [str(tmp_path / "out" / f"deck_{i}.pdf") for i in range(4)]
+    assert all(os.path.exists(result) for result in results)
+    # Two instances, two conversions each
+    assert elapsed >= 0.4
+    assert len(set(log_path.read_text().split())) == 2
+
+
+# Records its pid, then converts far slower than the test waits
+SLOW_FAKE_SOFFICE = """#!/bin/sh
+echo $$ >> "{pids}"
+sleep 30
+"""
+
+
+def test_cancelled_conversion_kills_the_process_and_frees_the_instance(
+    tmp_path, monkeypatch
+):
+    bin_directory = tmp_path / "bin"
+    bin_directory.mkdir()
+    pids_path = tmp_path / "pids.log"
+    soffice = bin_directory / "soffice"
+    soffice.write_text(SLOW_FAKE_SOFFICE.format(pids=pids_path))
+    soffice.chmod(soffice.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", f"{bin_directory}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setattr(libreoffice_service, "UNO_PYTHON_CANDIDATES", [])
+    source = tmp_path / "deck.pptx"
+    source.write_bytes(b"pptx")
+
+    service = LibreOfficeService(pool_size=1, base_directory=str(tmp_path / "profiles"))
+
+    async def run():
+        task = asyncio.create_task(
+            service.convert_to_pdf(str(source), str(tmp_path / "out"))
+        )
+        while not pids_path.exists():
+            await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        await asyncio.sleep(0.2)
+        return service._idle_instances.qsize()
+
+    assert asyncio.run(run()) == 1
+    pid = int(pids_path.read_text().split()[0])
+    try:
+        os.kill(pid, 0)
+        still_running = os.waitpid(pid, os.WNOHANG) == (0, 0)
+    except (ProcessLookupError, ChildProcessError):
+        still_running = False
+    assert not still_running
+
+
+def test_default_profiles_are_per_process(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path))
+    service = LibreOfficeService(pool_size=2)
+
+    assert service.base_directory == str(
+        tmp_path / "libreoffice" / f"profiles_{os.getpid()}"
+    )
+    assert service.instances[1].profile_directory.startswith(service.base_directory)
+
+
+def test_instances_from_a_previous_event_loop_are_killed(tmp_path):
+    service = LibreOfficeService(pool_size=1, base_directory=str(tmp_path))
+
+    async def start_instance():
+        service._bind_to_running_loop()
+        service.instances[0].process = await asyncio.create_subprocess_exec(
+            sys.executable, "-c", "import time; time.sleep(60)", start_new_session=True
+        )
+        return service.instances[0].process.pid
+
+    pid = asyncio.run(start_instance())
+
+    async def use_new_loop():
+        service._bind_to_running_loop()
+
+    asyncio.run(use_new_loop())
+
+    assert service.instances[0].process is None
+    for _ in range(50):
+        try:
+            # Reap the killed child if nothing else has
+            os.waitpid(pid, os.WNOHANG)
+            os.kill(pid, 0)
+        except (ProcessLookupError, ChildProcessError):
+            break
+        time.sleep(0.1)
+    else:
+        raise AssertionError("soffice process is still running")
@@ -0,0 +1,114 @@
+import asyncio
+from collections import OrderedDict
+import os
+import signal
+
+from PIL import Image
+
+from services import pdf_rasterizer_service
+from services.pdf_rasterizer_service import PdfRasterizerService
+
+
+def create_pdf(path: str, colors):
+    # 144x72 points per page
+    pages = [Image.new("RGB", (144, 72), color) for color in colors]
+    pages[0].save(path, "PDF", resolution=72, save_all=True, append_images=pages[1:])
+
+
+def test_rasterize_renders_every_page_in_order(tmp_path):
+    pdf_path = str(tmp_path / "deck.pdf")
+    colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+    create_pdf(pdf_path, colors)
+
+    service = PdfRasterizerService(max_workers=2)
+    reported = []
+    try:
+        paths = asyncio.run(
+            service.rasterize(
+                pdf_path,
+                str(tmp_path / "screenshots"),
+                dpi=144,
+                on_page=lambda page, total, path: reported.append((page, total, path)),
+            )
+        )
+    finally:
+        service.close()
+
+    assert [os.path.basename(path) for path in paths] == [
+        "slide_1.png",
+        "slide_2.png",
+        "slide_3.png",
+    ]
+    assert sorted(reported) == [(i + 1, 3, path) for i, path in enumerate(paths)]
+    for path, color in zip(paths, colors):
+        with Image.open(path) as image:
+            assert image.size == (288, 144)
+            # Pillow stores the pages as JPEG, compare the dominant channel
+            pixel = image.convert("RGB").getpixel((144, 72))
+            assert pixel.index(max(pixel)) == color.index(255)
+
+
+def test_rasterize_writes_webp(tmp_path):
+    pdf_path = str(tmp_path / "deck.pdf")
+    create_pdf(pdf_path, [(255, 255, 255)])
+
+    service = PdfRasterizerService(max_workers=1)
+    try:
+        paths = asyncio.run(
+            service.rasterize(pdf_path, str(tmp_path), image_format="webp")
+        )
+    finally:
+        service.close()
+
+    with Image.open(paths[0]) as image:
+        assert image.format == "WEBP"
+        assert image.size == (300, 150)
+
+
+def test_rasterize_recovers_from_a_crashed_worker(tmp_path):
+    pdf_path = str(tmp_path / "deck.pdf")
+    create_pdf(pdf_path, [(255, 0, 0), (0, 255, 0)])
+
+    service = PdfRasterizerService(max_workers=1)
+    broken_executor = service.get_executor()
+    # Start the worker, then kill it as a pdfium crash would
+    worker_pid = broken_executor.submit(os.getpid).result()
+    os.kill(worker_pid, signal.SIGKILL)
+
+    reported = []
+    try:
+        paths = asyncio.run(
+            service.rasterize(
+                pdf_path,
+                str(tmp_path / "screenshots"),
+                on_page=lambda page, total, path: reported.append(page),
+            )
+        )
+    finally:
+        service.close()
+
+    assert service._executor is None
+    assert all(os.path.exists(path) for path in paths)
+    assert sorted(reported) == [1, 2]
+
+
+def test_rasterizer_workers_are_spawned():
+    service = PdfRasterizerService(max_workers=1)
+    try:
+        assert service.get_executor()._mp_context.get_start_method() == "spawn"
+    finally:
+        service.close()
+
+
+def test_pages_reuse_the_open_document(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_rasterizer_service, "_open_documents", OrderedDict())
+    pdf_path = str(tmp_path / "deck.pdf")
+    create_pdf(pdf_path, [(255, 0, 0), (0, 255, 0)])
+
+    assert pdf_rasterizer_service.get_pdf_page_count(pdf_path) == 2
+    for i in range(2):
+        pdf_rasterizer_service.render_pdf_page(pdf_path, i, str(tmp_path / f"{i}.png"))
+
+    assert len(pdf_rasterizer_service._open_documents) == 1
+    for pdf in pdf_rasterizer_service._open_documents.values():
+        pdf.close()
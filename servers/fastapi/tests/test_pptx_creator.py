@@ -6,6 +6,7 @@ from models.pptx_models import (
     PptxPresentationModel,
     PptxSlideModel,
 )
+from services import pptx_presentation_creator
 from services.pptx_presentation_creator import PptxPresentationCreator
 from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
 
@@ -38,3 +39,106 @@ def test_pptx_creator():
     pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
     asyncio.run(pptx_creator.create_ppt())
     pptx_creator.save("debug/test.pptx")
+
+
+def test_pptx_creator_processes_pictures_before_building_slides(tmp_path):
+    from PIL import Image
+    from models.pptx_models import (
+        PptxBoxShapeEnum,
+        PptxPictureBoxModel,
+        PptxPictureModel,
+    )
+
+    image_path = str(tmp_path / "photo.png")
+    Image.new("RGB", (200, 100), (10, 120, 200)).save(image_path)
+
+    pictures = [
+        PptxPictureBoxModel(
+            position=PptxPositionModel(left=0, top=0, width=200, height=100),
+            picture=PptxPictureModel(is_network=False, path=image_path),
+            border_radius=[10, 10, 10, 10],
+        ),
+        PptxPictureBoxModel(
+            position=PptxPositionModel(left=0, top=0, width=100, height=100),
+            picture=PptxPictureModel(is_network=False, path=image_path),
+            shape=PptxBoxShapeEnum.CIRCLE,
+            invert=True,
+            opacity=0.5,
+        ),
+    ]
+    model = PptxPresentationModel(slides=[PptxSlideModel(shapes=pictures)])
+
+    pptx_creator = PptxPresentationCreator(model, str(tmp_path))
+    asyncio.run(pptx_creator.create_ppt())
+
+    processed_paths = [pptx_creator._processed_pictures[id(each)] for each in pictures]
+    for processed_path in processed_paths:
+        with Image.open(processed_path) as processed:
+            assert processed.mode == "RGBA"
+            assert processed.getpixel((0, 0))[3] < 255
+
+    pptx_creator.save(str(tmp_path / "test.pptx"))
+    assert (tmp_path / "test.pptx").exists()
+
+
+def test_pptx_creator_prefetches_network_pictures_concurrently(tmp_path):
+    import io
+
+    from aiohttp import web
+    from PIL import Image
+    from models.pptx_models import PptxPictureBoxModel, PptxPictureModel
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (20, 20), (200, 10, 10)).save(buffer, "PNG")
+    active_requests = 0
+    max_active_requests = 0
+
+    async def handler(request):
+        nonlocal active_requests, max_active_requests
+        active_requests += 1
+        max_active_requests = max(max_active_requests, active_requests)
+        await asyncio.sleep(0.05)
+        active_requests -= 1
+        return web.Response(body=buffer.getvalue(), content_type="image/png")
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/{host}/photo.png", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        # Same file name on every "host", plus one duplicated URL
+        urls = [f"http://127.0.0.1:{port}/{host}/photo.png" for host in range(4)]
+        pictures = [
+            PptxPictureBoxModel(
+                position=PptxPositionModel(left=0, top=0, width=20, height=20),
+                picture=PptxPictureModel(is_network=True, path=url),
+            )
+            for url in urls + urls[:1]
+        ]
+        model = PptxPresentationModel(slides=[PptxSlideModel(shapes=pictures)])
+        pptx_creator = PptxPresentationCreator(model, str(tmp_path))
+        try:
+            await pptx_creator.create_ppt()
+        finally:
+            await runner.cleanup()
+        return pptx_creator, urls
+
+    pptx_creator, urls = asyncio.run(run())
+
+    assert max_active_requests > 1
+    assert set(pptx_creator._network_pictures) == set(urls)
+    assert len(set(pptx_creator._network_pictures.values())) == len(urls)
+    assert len(pptx_creator._ppt.slides[0].shapes) == 5
+
+
+def test_image_process_pool_workers_are_spawned(monkeypatch):
+    monkeypatch.setattr(pptx_presentation_creator, "_IMAGE_PROCESS_POOL", None)
+    pool = pptx_presentation_creator.get_image_process_pool()
+    try:
+        assert pool._mp_context.get_start_method() == "spawn"
+    finally:
+        pool.shutdown()
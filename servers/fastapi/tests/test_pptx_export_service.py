@@ -0,0 +1,129 @@
+import asyncio
+import io
+import os
+import signal
+
+import pytest
+from pptx import Presentation
+from pptx.enum.shapes import MSO_AUTO_SHAPE_TYPE
+
+from models.pptx_export_job import PptxExportJobStatus
+from models.pptx_models import (
+    PptxAutoShapeBoxModel,
+    PptxPositionModel,
+    PptxPresentationModel,
+    PptxSlideModel,
+)
+from services.pptx_export_service import PptxExportService
+
+
+def _pptx_model(n_slides: int) -> PptxPresentationModel:
+    return PptxPresentationModel(
+        slides=[
+            PptxSlideModel(
+                shapes=[
+                    PptxAutoShapeBoxModel(
+                        type=MSO_AUTO_SHAPE_TYPE.RECTANGLE,
+                        position=PptxPositionModel(left=20, top=20, width=100, height=100),
+                    )
+                ]
+            )
+            for _ in range(n_slides)
+        ]
+    )
+
+
+def test_export_jobs_build_pptx_in_worker_processes(tmp_path):
+    service = PptxExportService(max_workers=2)
+
+    async def run():
+        jobs = [
+            service.submit(_pptx_model(3), str(tmp_path / f"deck_{i}.pptx"))
+            for i in range(3)
+        ]
+        assert all(job.status == PptxExportJobStatus.QUEUED for job in jobs)
+        return [await service.wait(job.id) for job in jobs]
+
+    try:
+        jobs = asyncio.run(run())
+    finally:
+        service.close()
+
+    for i, job in enumerate(jobs):
+        assert job.status == PptxExportJobStatus.COMPLETED
+        assert job.progress == 1.0
+        assert job.path == str(tmp_path / f"deck_{i}.pptx")
+        assert len(Presentation(job.path).slides) == 3
+        assert service.get_job(job.id) is job
+
+
+def test_export_workers_are_spawned():
+    service = PptxExportService(max_workers=1)
+    try:
+        assert service.get_executor()._mp_context.get_start_method() == "spawn"
+    finally:
+        service.close()
+
+
+def test_export_raises_for_failed_jobs(tmp_path):
+    service = PptxExportService(max_workers=1)
+
+    async def run():
+        return await service.export(_pptx_model(1), str(tmp_path / "missing" / "deck.pptx"))
+
+    try:
+        with pytest.raises(RuntimeError):
+            asyncio.run(run())
+    finally:
+        service.close()
+
+
+def test_exporting_the_same_model_twice_gives_the_same_digest(tmp_path, monkeypatch):
+    import services.pptx_export_service as pptx_export_service
+
+    monkeypatch.setattr(pptx_export_service, "get_exports_directory", lambda: str(tmp_path))
+    service = PptxExportService(max_workers=1)
+
+    async def run():
+        first = await service.export(_pptx_model(2))
+        # Zip timestamps have a two second resolution
+        await asyncio.sleep(2.1)
+        second = await service.export(_pptx_model(2))
+        return first, second
+
+    try:
+        first, second = asyncio.run(run())
+    finally:
+        service.close()
+
+    assert isinstance(first, bytes)
+    assert len(Presentation(io.BytesIO(first)).slides) == 2
+    digest = pptx_export_service.get_pptx_digest(first)
+    assert pptx_export_service.get_pptx_digest(second) == digest
+
+    first_path = pptx_export_service.save_content_addressed_pptx(first)
+    second_path = pptx_export_service.save_content_addressed_pptx(second)
+    assert first_path == second_path == str(tmp_path / f"{digest}.pptx")
+    assert os.listdir(tmp_path) == [os.path.basename(first_path)]
+
+
+def test_broken_pool_is_shut_down_and_replaced(tmp_path):
+    service = PptxExportService(max_workers=1)
+    broken_executor = service.get_executor()
+    # Start the worker, then kill it as a crash would
+    worker_pid = broken_executor.submit(os.getpid).result()
+    os.kill(worker_pid, signal.SIGKILL)
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await service.export(_pptx_model(1), str(tmp_path / "broken.pptx"))
+        return await service.export(_pptx_model(1), str(tmp_path / "deck.pptx"))
+
+    try:
+        pptx_path = asyncio.run(run())
+    finally:
+        service.close()
+
+    assert broken_executor._shutdown_thread
+    assert service._executor is None
+    assert len(Presentation(pptx_path).slides) == 1
@@ -0,0 +1,34 @@
+import zipfile
+
+from utils.pptx_font_aliases import replace_typefaces_in_xml, write_pptx_with_font_aliases
+
+
+def test_replace_typefaces_in_xml():
+    xml = (
+        '<a:latin typeface="Calibri Light"/><a:ea typeface=\'Calibri Light\'/>'
+        '<a:cs typeface="Arial"/><a:sym typeface="A &amp; B"/>'
+    )
+
+    assert replace_typefaces_in_xml(
+        xml, {"Calibri Light": "Calibri", "A & B": "Inter"}
+    ) == (
+        '<a:latin typeface="Calibri"/><a:ea typeface=\'Calibri\'/>'
+        '<a:cs typeface="Arial"/><a:sym typeface="Inter"/>'
+    )
+
+
+def test_write_pptx_with_font_aliases_rewrites_every_xml_part(tmp_path):
+    source_path = tmp_path / "deck.pptx"
+    with zipfile.ZipFile(source_path, "w") as source:
+        source.writestr("ppt/slides/slide1.xml", '<a:latin typeface="Lato Bold"/>')
+        source.writestr("ppt/theme/theme1.xml", '<a:latin typeface="Lato Bold"/>')
+        source.writestr("ppt/media/image1.png", b"typeface=\"Lato Bold\"")
+
+    output_path = write_pptx_with_font_aliases(
+        str(source_path), str(tmp_path / "aliased.pptx"), {"Lato Bold": "Lato"}
+    )
+
+    with zipfile.ZipFile(output_path) as output:
+        assert output.read("ppt/slides/slide1.xml") == b'<a:latin typeface="Lato"/>'
+        assert output.read("ppt/theme/theme1.xml") == b'<a:latin typeface="Lato"/>'
+        assert output.read("ppt/media/image1.png") == b'typeface="Lato Bold"'
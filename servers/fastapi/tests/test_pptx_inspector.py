@@ -0,0 +1,58 @@
+from io import BytesIO
+import zipfile
+
+import pytest
+
+from utils.pptx_inspector import get_fonts_from_slide_xml, inspect_pptx
+
+SLIDE_XML = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<p:sld xmlns:p="http://schemas.openxmlformats.org/presentationml/2006/main"
+       xmlns:a="http://schemas.openxmlformats.org/drawingml/2006/main">
+    <p:cSld><p:spTree><p:sp><p:txBody><a:p><a:r>
+        <a:rPr><a:latin typeface="{latin}"/><a:ea typeface="+mn-ea"/><a:cs typeface="Noto Sans"/></a:rPr>
+        <a:t>Slide</a:t>
+    </a:r></a:p></p:txBody></p:sp></p:spTree></p:cSld>
+</p:sld>"""
+
+
+def create_pptx_bytes() -> bytes:
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        zip_file.writestr("ppt/slides/slide10.xml", SLIDE_XML.format(latin="Lato Bold"))
+        zip_file.writestr("ppt/slides/slide2.xml", SLIDE_XML.format(latin="Montserrat"))
+        zip_file.writestr("ppt/slides/slide1.xml", SLIDE_XML.format(latin="+mj-lt"))
+        zip_file.writestr("ppt/slides/_rels/slide1.xml.rels", "<Relationships/>")
+        zip_file.writestr("ppt/media/image1.png", b"\x89PNG")
+    return buffer.getvalue()
+
+
+def test_inspect_pptx_reads_slides_in_order_with_fonts(tmp_path):
+    pptx_bytes = create_pptx_bytes()
+    pptx_path = tmp_path / "deck.pptx"
+    pptx_path.write_bytes(pptx_bytes)
+
+    for source in (pptx_bytes, str(pptx_path)):
+        inspection = inspect_pptx(source)
+
+        assert inspection.slide_count == 3
+        assert [slide.fonts for slide in inspection.slides] == [
+            ["Noto Sans"],
+            ["Montserrat", "Noto Sans"],
+            ["Lato Bold", "Noto Sans"],
+        ]
+        assert inspection.fonts == ["Lato Bold", "Montserrat", "Noto Sans"]
+        assert 'typeface="Montserrat"' in inspection.slide_xmls[1]
+        assert not list(tmp_path.glob("**/ppt"))
+
+
+def test_inspect_pptx_without_slides_fails():
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zip_file:
+        zip_file.writestr("ppt/presentation.xml", "<p:presentation/>")
+
+    with pytest.raises(Exception, match="Failed to extract slide XMLs"):
+        inspect_pptx(buffer.getvalue())
+
+
+def test_get_fonts_from_invalid_xml_falls_back_to_regex():
+    assert get_fonts_from_slide_xml('<a:latin typeface="Roboto"/><broken') == ["Roboto"]
@@ -4,7 +4,7 @@ from fastapi.testclient import TestClient
 from fastapi import FastAPI
 from models.presentation_layout import PresentationLayoutModel
 from models.presentation_structure_model import PresentationStructureModel
-from api.v1.ppt.endpoints.presentation import PRESENTATION_ROUTER
+from api.v1.ppt.endpoints.presentation import PRESENTATION_ROUTER, etag_matches
 
 class MockAiohttpResponse:
     def __init__(self, status=200, json_data=None):
@@ -187,3 +187,13 @@ class TestPresentationGenerationAPI:
             }
         )
         assert response.status_code == 422
+
+
+def test_etag_matches_weak_and_listed_validators():
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"other", W/"abc"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
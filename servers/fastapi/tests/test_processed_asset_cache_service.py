@@ -0,0 +1,72 @@
+import os
+import time
+
+from services.processed_asset_cache_service import ProcessedAssetCacheService
+
+
+def _write(path, content: bytes):
+    with open(path, "wb") as f:
+        f.write(content)
+    return str(path)
+
+
+def test_key_depends_on_content_and_params(tmp_path):
+    cache = ProcessedAssetCacheService(str(tmp_path / "cache"))
+    source_a = _write(tmp_path / "a.png", b"a")
+    source_b = _write(tmp_path / "b.png", b"a")
+    source_c = _write(tmp_path / "c.png", b"c")
+
+    key = cache.get_key(source_a, "transform_picture", opacity=0.5)
+
+    assert key == cache.get_key(source_b, "transform_picture", opacity=0.5)
+    assert key != cache.get_key(source_c, "transform_picture", opacity=0.5)
+    assert key != cache.get_key(source_a, "transform_picture", opacity=0.6)
+    assert key != cache.get_key(source_a, "icon_with_background", opacity=0.5)
+
+
+def test_put_and_get_link_into_the_callers_directory(tmp_path):
+    cache = ProcessedAssetCacheService(str(tmp_path / "cache"))
+    export_directory = tmp_path / "export"
+    export_directory.mkdir()
+    processed = _write(export_directory / "processed.png", b"processed")
+
+    assert cache.get("missing", str(export_directory)) is None
+
+    assert cache.put("key", processed) == processed
+
+    cached_path = cache.get("key", str(export_directory))
+    assert os.path.dirname(cached_path) == str(export_directory)
+    # Evicting the entry, e.g. from another worker process, keeps the link valid
+    os.remove(cache.get_path("key"))
+    with open(cached_path, "rb") as f:
+        assert f.read() == b"processed"
+    assert cache.get("key", str(tmp_path)) is None
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    cache = ProcessedAssetCacheService(str(tmp_path / "cache"), max_bytes=25)
+
+    for key in ("first", "second"):
+        cache.put(key, _write(tmp_path / f"{key}.png", b"0" * 10))
+    old = time.time() - 100
+    os.utime(cache.get_path("first"), (old, old))
+    os.utime(cache.get_path("second"), (old + 1, old + 1))
+
+    # Reading "first" makes "second" the least recently used entry
+    assert cache.get("first", str(tmp_path))
+    cache.put("third", _write(tmp_path / "third.png", b"0" * 10))
+
+    assert os.path.exists(cache.get_path("first"))
+    assert not os.path.exists(cache.get_path("second"))
+    assert os.path.exists(cache.get_path("third"))
+
+
+def test_remembered_file_hashes_are_bounded(tmp_path, monkeypatch):
+    from services import processed_asset_cache_service
+
+    monkeypatch.setattr(processed_asset_cache_service, "MAX_REMEMBERED_FILE_HASHES", 2)
+    cache = ProcessedAssetCacheService(str(tmp_path / "cache"))
+    for name in ("a", "b", "c"):
+        cache.get_file_hash(_write(tmp_path / f"{name}.png", name.encode()))
+
+    assert len(cache._file_hashes) == 2
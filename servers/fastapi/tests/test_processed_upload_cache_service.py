@@ -0,0 +1,44 @@
+import os
+
+from services.processed_upload_cache_service import ProcessedUploadCacheService
+
+
+def test_key_depends_on_file_and_fonts_but_not_font_order(tmp_path):
+    cache = ProcessedUploadCacheService(cache_directory=str(tmp_path))
+
+    key = cache.get_key("pptx", "deck", ["font_a", "font_b"])
+    assert key == cache.get_key("pptx", "deck", ["font_b", "font_a"])
+    assert key != cache.get_key("pptx", "deck", ["font_a"])
+    assert key != cache.get_key("pptx", "other_deck", ["font_a", "font_b"])
+    assert cache.get_key("pdf", "deck") != cache.get_key("pptx", "deck")
+
+
+def test_entry_is_dropped_when_a_stored_file_is_missing(tmp_path):
+    cache = ProcessedUploadCacheService(cache_directory=str(tmp_path / "index"))
+    screenshot = tmp_path / "slide_1.png"
+    screenshot.write_bytes(b"png")
+
+    key = cache.get_key("pdf", "deck")
+    cache.put(key, {"total_slides": 1}, [str(screenshot)])
+    assert cache.get(key) == {"total_slides": 1}
+
+    screenshot.unlink()
+    assert cache.get(key) is None
+    assert not os.path.exists(cache.get_path(key))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ProcessedUploadCacheService(cache_directory=str(tmp_path), max_entries=2)
+
+    keys = [cache.get_key("pdf", f"deck_{i}") for i in range(3)]
+    cache.put(keys[0], {"deck": 0}, [])
+    cache.put(keys[1], {"deck": 1}, [])
+    os.utime(cache.get_path(keys[0]), (1, 1))
+    os.utime(cache.get_path(keys[1]), (2, 2))
+    cache.get(keys[0])
+
+    cache.put(keys[2], {"deck": 2}, [])
+
+    assert cache.get(keys[0]) == {"deck": 0}
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) == {"deck": 2}
@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import api.v1.ppt.endpoints.slide_to_html as slide_to_html
+
+
+def parse_events(body: str):
+    return [
+        json.loads(block.split("data: ", 1)[1])
+        for block in body.strip().split("\n\n")
+        if block
+    ]
+
+
+def test_batch_converts_slides_concurrently_under_limit(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    images = []
+    for i in range(5):
+        image_path = tmp_path / f"slide_{i}.png"
+        image_path.write_bytes(b"png")
+        images.append(str(image_path))
+
+    running = {"now": 0, "peak": 0}
+    clients = set()
+
+    async def fake_generate_html_from_slide(**kwargs):
+        clients.add(id(kwargs["client"]))
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+        await asyncio.sleep(0.05)
+        running["now"] -= 1
+        return f"```html<div>{kwargs['xml_content']}</div>```"
+
+    monkeypatch.setattr(
+        slide_to_html, "generate_html_from_slide", fake_generate_html_from_slide
+    )
+
+    app = FastAPI()
+    app.include_router(slide_to_html.SLIDE_TO_HTML_ROUTER)
+    slides = [{"image": image, "xml": f"slide {i}"} for i, image in enumerate(images)]
+    slides.append({"image": str(tmp_path / "missing.png"), "xml": "missing"})
+
+    response = TestClient(app).post(
+        "/slide-to-html/batch", json={"slides": slides, "max_concurrency": 2}
+    )
+    events = parse_events(response.text)
+
+    assert events[0]["type"] == "status"
+    assert sorted(
+        event["index"] for event in events if event["type"] == "slide"
+    ) == [0, 1, 2, 3, 4]
+    assert [event["index"] for event in events if event["type"] == "slide_error"] == [5]
+    assert running["peak"] == 2
+    assert len(clients) == 1
+
+    results = events[-1]["slides"]
+    assert [result["html"] for result in results[:5]] == [
+        f"<div>slide {i}</div>" for i in range(5)
+    ]
+    assert results[5]["html"] is None
+    assert "Image file not found" in results[5]["error"]
@@ -0,0 +1,146 @@
+import asyncio
+import json
+from io import BytesIO
+import os
+import zipfile
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+import pytest
+
+from api.v1.ppt.endpoints import pptx_slides
+from api.v1.ppt.endpoints.pdf_slides import PDF_SLIDES_ROUTER
+from api.v1.ppt.endpoints.pptx_slides import PPTX_SLIDES_ROUTER
+from services.font_catalogue_service import FONT_CATALOGUE_SERVICE
+from services.pdf_rasterizer_service import PDF_RASTERIZER_SERVICE
+from services.processed_upload_cache_service import PROCESSED_UPLOAD_CACHE_SERVICE
+from utils.async_iterator import iterate_callback_calls
+
+
+def test_iterate_callback_calls_yields_calls_then_propagates_errors():
+    async def work(callback):
+        for i in range(3):
+            await asyncio.sleep(0)
+            callback(i, "page")
+        raise RuntimeError("broken page")
+
+    async def consume():
+        calls = []
+        with pytest.raises(RuntimeError, match="broken page"):
+            async for call in iterate_callback_calls(work):
+                calls.append(call)
+        return calls
+
+    assert asyncio.run(consume()) == [(0, "page"), (1, "page"), (2, "page")]
+
+
+def parse_events(body: str):
+    return [
+        json.loads(block.split("data: ", 1)[1])
+        for block in body.strip().split("\n\n")
+        if block
+    ]
+
+
+def test_stream_pdf_slides_sends_each_page_then_result(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    monkeypatch.setattr(
+        PROCESSED_UPLOAD_CACHE_SERVICE, "cache_directory", str(tmp_path / "index")
+    )
+    monkeypatch.setattr(PDF_RASTERIZER_SERVICE, "max_workers", 2)
+
+    pages = [Image.new("RGB", (144, 72), color) for color in ("red", "green", "blue")]
+    pdf = BytesIO()
+    pages[0].save(pdf, "PDF", save_all=True, append_images=pages[1:])
+
+    app = FastAPI()
+    app.include_router(PDF_SLIDES_ROUTER)
+    client = TestClient(app)
+    files = {"pdf_file": ("deck.pdf", pdf.getvalue(), "application/pdf")}
+
+    try:
+        first = parse_events(client.post("/pdf-slides/process/stream", files=files).text)
+        second = parse_events(client.post("/pdf-slides/process/stream", files=files).text)
+    finally:
+        PDF_RASTERIZER_SERVICE.close()
+
+    assert first[0]["type"] == "status"
+    slide_events = [event["slide"] for event in first if event["type"] == "slide"]
+    assert sorted(slide["slide_number"] for slide in slide_events) == [1, 2, 3]
+    result = first[-1]["result"]
+    assert first[-1]["type"] == "complete"
+    assert [slide["slide_number"] for slide in result["slides"]] == [1, 2, 3]
+    assert all(
+        slide["screenshot_url"].startswith("/app_data/images/")
+        for slide in result["slides"]
+    )
+
+    # The same upload again is served from the processed-upload index
+    assert [event["type"] for event in second] == ["slide"] * 3 + ["complete"]
+    assert second[-1]["result"] == result
+
+
+def test_pptx_results_with_placeholder_slides_are_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setenv("APP_DATA_DIRECTORY", str(tmp_path / "app_data"))
+    monkeypatch.setattr(
+        PROCESSED_UPLOAD_CACHE_SERVICE, "cache_directory", str(tmp_path / "index")
+    )
+    monkeypatch.setattr(FONT_CATALOGUE_SERVICE, "get_family", lambda font: None)
+
+    renders = []
+
+    async def generate_screenshots(pptx_path, temp_dir, inspection, on_page=None):
+        renders.append(pptx_path)
+        paths = []
+        for i in range(1, inspection.slide_count + 1):
+            # The first render loses its second slide
+            if len(renders) == 1 and i == 2:
+                paths.append(None)
+                continue
+            path = os.path.join(temp_dir, f"slide_{i}.png")
+            Image.new("RGB", (16, 9), "red").save(path)
+            paths.append(path)
+        return paths
+
+    monkeypatch.setattr(pptx_slides, "_generate_screenshots", generate_screenshots)
+
+    deck = BytesIO()
+    with zipfile.ZipFile(deck, "w") as zip_file:
+        for i in (1, 2):
+            zip_file.writestr(
+                f"ppt/slides/slide{i}.xml",
+                '<sld><latin typeface="Montserrat"/></sld>',
+            )
+
+    app = FastAPI()
+    app.include_router(PPTX_SLIDES_ROUTER)
+    client = TestClient(app)
+    files = {
+        "pptx_file": (
+            "deck.pptx",
+            deck.getvalue(),
+            "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+        )
+    }
+
+    first = client.post("/pptx-slides/process", files=files).json()
+    assert first["slides"][1]["screenshot_url"] == "/static/images/placeholder.jpg"
+
+    # Rendered again since the placeholder result was not stored
+    second = client.post("/pptx-slides/process", files=files).json()
+    assert len(renders) == 2
+    assert all(
+        slide["screenshot_url"].startswith("/app_data/images/")
+        for slide in second["slides"]
+    )
+    assert second["fonts"]["internally_supported_fonts"] == []
+
+    # Served from the cache, with the font analysis redone against the catalogue
+    monkeypatch.setattr(FONT_CATALOGUE_SERVICE, "get_family", lambda font: font)
+    third = client.post("/pptx-slides/process", files=files).json()
+    assert len(renders) == 2
+    assert third["slides"] == second["slides"]
+    assert [font["name"] for font in third["fonts"]["internally_supported_fonts"]] == [
+        "Montserrat"
+    ]
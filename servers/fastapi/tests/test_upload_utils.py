@@ -0,0 +1,45 @@
+import asyncio
+import hashlib
+from io import BytesIO
+
+from fastapi import HTTPException, UploadFile
+import pytest
+
+import utils.upload_utils as upload_utils
+from utils.upload_utils import save_upload_file
+
+
+def test_save_upload_file_streams_in_chunks_and_hashes(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_utils, "UPLOAD_CHUNK_SIZE", 1024)
+    content = bytes(range(256)) * 20
+    upload = UploadFile(BytesIO(content), filename="deck.pptx")
+
+    read_sizes = []
+    original_read = upload.read
+
+    async def read(size=-1):
+        read_sizes.append(size)
+        return await original_read(size)
+
+    upload.read = read
+    destination = tmp_path / "deck.pptx"
+    saved = asyncio.run(save_upload_file(upload, str(destination), max_size=1))
+
+    assert destination.read_bytes() == content
+    assert saved.size == len(content)
+    assert saved.sha256 == hashlib.sha256(content).hexdigest()
+    assert saved.filename == "deck.pptx"
+    assert set(read_sizes) == {1024}
+
+
+def test_save_upload_file_enforces_size_while_streaming(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_utils, "UPLOAD_CHUNK_SIZE", 256 * 1024)
+    upload = UploadFile(BytesIO(b"x" * (1024 * 1024 + 1)), filename="big.pdf")
+    destination = tmp_path / "big.pdf"
+
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(save_upload_file(upload, str(destination), max_size=1))
+
+    assert exc_info.value.status_code == 400
+    assert "exceeded max upload size of 1 MB" in exc_info.value.detail
+    assert not destination.exists()
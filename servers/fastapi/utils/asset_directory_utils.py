@@ -1,4 +1,7 @@
 import os
+import shutil
+from typing import Optional, Tuple
+
 from utils.get_env import get_app_data_directory_env
 
 
@@ -12,6 +15,15 @@ def convert_absolute_path_to_web_path(absolute_path: str) -> str:
     return absolute_path
 
 
+def convert_web_path_to_absolute_path(web_path: str) -> str:
+    """Convert /app_data/... web path back to the absolute file path"""
+    if web_path.startswith("/app_data/"):
+        return os.path.join(
+            get_app_data_directory_env(), web_path[len("/app_data/"):]
+        )
+    return web_path
+
+
 def get_images_directory():
     images_directory = os.path.join(get_app_data_directory_env(), "images")
     os.makedirs(images_directory, exist_ok=True)
@@ -27,3 +39,27 @@ def get_uploads_directory():
     uploads_directory = os.path.join(get_app_data_directory_env(), "uploads")
     os.makedirs(uploads_directory, exist_ok=True)
     return uploads_directory
+
+
+def store_slide_screenshot(
+    screenshot_path: Optional[str], presentation_id: str, slide_number: int
+) -> Tuple[str, Optional[str]]:
+    """Copies a rendered slide into images/<presentation_id>/slide_<n>.png.
+
+    Returns (screenshot_url, stored_path). Missing or empty screenshots map to
+    the placeholder image and no stored path.
+    """
+    if not (
+        screenshot_path
+        and os.path.exists(screenshot_path)
+        and os.path.getsize(screenshot_path) > 0
+    ):
+        return "/static/images/placeholder.jpg", None
+
+    presentation_images_dir = os.path.join(get_images_directory(), presentation_id)
+    os.makedirs(presentation_images_dir, exist_ok=True)
+    screenshot_filename = f"slide_{slide_number}.png"
+    stored_path = os.path.join(presentation_images_dir, screenshot_filename)
+    # copy2 instead of os.rename to handle cross-device moves
+    shutil.copy2(screenshot_path, stored_path)
+    return f"/app_data/images/{presentation_id}/{screenshot_filename}", stored_path
@@ -1,5 +1,5 @@
 import asyncio
-from typing import AsyncGenerator, Callable, Iterator, TypeVar
+from typing import AsyncGenerator, Awaitable, Callable, Iterator, TypeVar
 
 T = TypeVar("T")
 
@@ -14,3 +14,28 @@ def iterator_to_async(
             await asyncio.sleep(0)
 
     return wrapper
+
+
+async def iterate_callback_calls(
+    func: Callable[[Callable[..., None]], Awaitable[object]],
+) -> AsyncGenerator[tuple, None]:
+    """Runs func(callback) and yields the arguments of each callback call as it happens.
+
+    Exceptions raised by func propagate once the calls made before them have
+    been yielded. func is cancelled if the consumer stops iterating early.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+
+    task = asyncio.create_task(func(lambda *args: queue.put_nowait(args)))
+    task.add_done_callback(lambda _: queue.put_nowait(finished))
+    try:
+        while True:
+            item = await queue.get()
+            if item is finished:
+                break
+            yield item
+        await task
+    finally:
+        if not task.done():
+            task.cancel()
@@ -1,4 +1,7 @@
 import os
+from typing import List, Sequence
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, postgresql, sqlite
 from utils.get_env import get_app_data_directory_env, get_database_url_env
 from urllib.parse import urlsplit, urlunsplit, parse_qsl
 import ssl
@@ -46,3 +49,32 @@ def get_database_url_and_connect_args() -> tuple[str, dict]:
         pass
 
     return database_url, connect_args
+
+
+def get_upsert_statement(
+    dialect_name: str,
+    table: Table,
+    rows: List[dict],
+    index_elements: Sequence[str],
+    update_columns: Sequence[str],
+):
+    """
+    Single INSERT for all rows that updates update_columns of rows already
+    present, index_elements must be covered by a unique index.
+    """
+    if dialect_name == "mysql":
+        stmt = mysql.insert(table).values(rows)
+        return stmt.on_duplicate_key_update(
+            {column: stmt.inserted[column] for column in update_columns}
+        )
+
+    if dialect_name == "postgresql":
+        stmt = postgresql.insert(table).values(rows)
+    elif dialect_name == "sqlite":
+        stmt = sqlite.insert(table).values(rows)
+    else:
+        raise ValueError(f"Upsert is not supported for {dialect_name}")
+    return stmt.on_conflict_do_update(
+        index_elements=list(index_elements),
+        set_={column: stmt.excluded[column] for column in update_columns},
+    )
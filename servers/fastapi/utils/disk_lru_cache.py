@@ -0,0 +1,215 @@
+import contextlib
+import json
+import os
+import shutil
+import threading
+import time
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from utils.get_env import get_app_data_directory_env
+
+LOCK_FILENAME = ".lock"
+# Temporary files older than this are left over from crashed writers
+STALE_TEMP_FILE_SECONDS = 60 * 60
+
+
+class DiskLruCache:
+    """Directory of cache files, evicted least recently used first.
+
+    Reads bump the file mtime, eviction removes the oldest files until the
+    directory is within max_bytes and max_entries (either may be None).
+
+    The size of the directory is kept as a running total, so writes only scan
+    the directory when the cache is over budget or the total has not been
+    resynced for resync_interval seconds (other processes may be writing to
+    the same directory). Eviction holds an exclusive lock on the directory so
+    processes never evict concurrently.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        cache_directory: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        resync_interval: float = 60,
+    ):
+        self.name = name
+        self._cache_directory = cache_directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.resync_interval = resync_interval
+
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self._total_entries = 0
+        self._synced_at: Optional[float] = None
+
+    @property
+    def cache_directory(self) -> str:
+        if self._cache_directory is None:
+            self._cache_directory = os.path.join(
+                get_app_data_directory_env() or "/tmp/presenton", "cache", self.name
+            )
+        os.makedirs(self._cache_directory, exist_ok=True)
+        return self._cache_directory
+
+    @cache_directory.setter
+    def cache_directory(self, cache_directory: str):
+        with self._lock:
+            self._cache_directory = cache_directory
+            self._synced_at = None
+
+    def get_path(self, filename: str) -> str:
+        return os.path.join(self.cache_directory, filename)
+
+    def _get_temp_path(self, path: str) -> str:
+        return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+    def touch(self, filename: str) -> bool:
+        """Marks the entry as recently used, False if it does not exist."""
+        try:
+            os.utime(self.get_path(filename))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def read_json(self, filename: str) -> Optional[Any]:
+        path = self.get_path(filename)
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            self.delete(filename)
+            return None
+        self.touch(filename)
+        return data
+
+    def write_json(self, filename: str, data: Any):
+        path = self.get_path(filename)
+        temp_path = self._get_temp_path(path)
+        with open(temp_path, "w") as f:
+            json.dump(data, f)
+        self._replace(temp_path, path)
+
+    def add_file(self, filename: str, source_path: str):
+        """Stores a copy of source_path, hard-linked when on the same filesystem."""
+        path = self.get_path(filename)
+        temp_path = self._get_temp_path(path)
+        _link_or_copy(source_path, temp_path)
+        self._replace(temp_path, path)
+
+    def link_file(self, filename: str, destination_path: str) -> bool:
+        """Hard-links (or copies) the entry to destination_path.
+
+        The link stays valid when the entry is evicted afterwards, even by
+        another process. Returns False if the entry does not exist.
+        """
+        try:
+            _link_or_copy(self.get_path(filename), destination_path)
+        except FileNotFoundError:
+            return False
+        self.touch(filename)
+        return True
+
+    def delete(self, filename: str):
+        path = self.get_path(filename)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._total_bytes -= size
+            self._total_entries -= 1
+
+    def _replace(self, temp_path: str, path: str):
+        size = os.path.getsize(temp_path)
+        try:
+            previous_size = os.path.getsize(path)
+        except FileNotFoundError:
+            previous_size = None
+        os.replace(temp_path, path)
+
+        with self._lock:
+            self._total_bytes += size - (previous_size or 0)
+            if previous_size is None:
+                self._total_entries += 1
+            needs_eviction = (
+                self._synced_at is None
+                or time.monotonic() - self._synced_at > self.resync_interval
+                or self._is_over_budget()
+            )
+        if needs_eviction:
+            self.evict()
+
+    def _is_over_budget(self) -> bool:
+        return (self.max_bytes is not None and self._total_bytes > self.max_bytes) or (
+            self.max_entries is not None and self._total_entries > self.max_entries
+        )
+
+    @contextlib.contextmanager
+    def _directory_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.get_path(LOCK_FILENAME), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def evict(self):
+        """Resyncs the running total from disk and evicts down to the budget."""
+        with self._lock, self._directory_lock():
+            now = time.time()
+            entries = []
+            for entry in os.scandir(self.cache_directory):
+                if not entry.is_file() or entry.name == LOCK_FILENAME:
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                if entry.name.endswith(".tmp"):
+                    if now - stat.st_mtime > STALE_TEMP_FILE_SECONDS:
+                        _remove_if_exists(entry.path)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            self._total_bytes = sum(size for _, size, _ in entries)
+            self._total_entries = len(entries)
+            self._synced_at = time.monotonic()
+
+            for _, size, path in sorted(entries):
+                if not self._is_over_budget():
+                    break
+                if _remove_if_exists(path):
+                    self._total_bytes -= size
+                    self._total_entries -= 1
+
+
+def _link_or_copy(source_path: str, destination_path: str):
+    try:
+        os.link(source_path, destination_path)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        # Different filesystem, or links not supported
+        shutil.copyfile(source_path, destination_path)
+
+
+def _remove_if_exists(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
@@ -1,7 +1,8 @@
 import asyncio
+from collections import OrderedDict
 import os
 import mimetypes
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse
 
 import aiohttp
@@ -9,68 +10,221 @@ import aiohttp
 import uuid
 
 
-async def download_file(
-    url: str, save_directory: str, headers: Optional[dict] = None
-) -> Optional[str]:
-    try:
-        os.makedirs(save_directory, exist_ok=True)
-
-        parsed_url = urlparse(url)
-        filename = os.path.basename(parsed_url.path)
-
-        if not filename or "." not in filename:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.head(url, headers=headers) as response:
-                    if response.status == 200:
-                        content_disposition = response.headers.get(
-                            "Content-Disposition", ""
+DEFAULT_MAX_DOWNLOAD_BYTES = 50 * 1024 * 1024
+DEFAULT_MAX_PARALLEL_DOWNLOADS = 8
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+MAX_REMEMBERED_DOWNLOADS = 1024
+
+
+class DownloadSizeExceededError(Exception):
+    pass
+
+
+class DownloadManager:
+    """Downloads files through a single pooled aiohttp session.
+
+    - One GET per URL; the filename extension is sniffed from the GET response headers
+    - Chunks are written to disk in a worker thread so the event loop never blocks on IO
+    - Downloads are capped at max_bytes and limited to max_parallel at a time
+    - Concurrent and repeated downloads of the same URL into the same directory
+      share a single request (the last max_remembered downloads are remembered)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_DOWNLOAD_BYTES,
+        max_parallel: int = DEFAULT_MAX_PARALLEL_DOWNLOADS,
+        timeout: float = 60,
+        max_remembered: int = MAX_REMEMBERED_DOWNLOADS,
+    ):
+        self.max_bytes = max_bytes
+        self.max_parallel = max_parallel
+        self.timeout = timeout
+        self.max_remembered = max_remembered
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._closing: Set[asyncio.Task] = set()
+        self._downloaded: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+
+    def _bind_to_running_loop(self):
+        # Sessions, semaphores and tasks belong to one event loop,
+        # recreate them if we are called from a different one
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._close_detached_session(self._session, self._loop)
+            self._loop = loop
+            self._session = None
+            self._semaphore = asyncio.Semaphore(self.max_parallel)
+            self._in_flight = {}
+
+    def _forget_in_flight(self, key: Tuple[str, str], task: asyncio.Task):
+        # A task of a previous loop may finish after a new loop started its
+        # own download of the same key, leave that one in place
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def _close_detached_session(
+        self,
+        session: Optional[aiohttp.ClientSession],
+        loop: Optional[asyncio.AbstractEventLoop],
+    ):
+        """Closes a session left behind on another event loop."""
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        # The old loop is gone, nothing can run there anymore. Closing from the
+        # current loop releases the connector and its pooled connections.
+        task = asyncio.get_running_loop().create_task(session.close())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def get_session(self) -> aiohttp.ClientSession:
+        self._bind_to_running_loop()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                trust_env=True,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.max_parallel * 2),
+            )
+        return self._session
+
+    async def close(self):
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def download_file(
+        self, url: str, save_directory: str, headers: Optional[dict] = None
+    ) -> Optional[str]:
+        self._bind_to_running_loop()
+        key = (url, os.path.abspath(save_directory))
+
+        downloaded_path = self._downloaded.get(key)
+        if downloaded_path and os.path.exists(downloaded_path):
+            self._downloaded.move_to_end(key)
+            return downloaded_path
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._download(url, save_directory, headers))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._forget_in_flight(key, done))
+
+        save_path = await asyncio.shield(task)
+        if save_path:
+            self._downloaded[key] = save_path
+            self._downloaded.move_to_end(key)
+            while len(self._downloaded) > self.max_remembered:
+                self._downloaded.popitem(last=False)
+        return save_path
+
+    async def download_files(
+        self, urls: List[str], save_directory: str, headers: Optional[dict] = None
+    ) -> List[Optional[str]]:
+        coroutines = [self.download_file(url, save_directory, headers) for url in urls]
+        results = await asyncio.gather(*coroutines, return_exceptions=True)
+        final_results = []
+        for i, result in enumerate(results):
+            if isinstance(result, Exception):
+                print(f"Exception during download of {urls[i]}: {result}")
+                final_results.append(None)
+            else:
+                final_results.append(result)
+        return final_results
+
+    async def _download(
+        self, url: str, save_directory: str, headers: Optional[dict] = None
+    ) -> Optional[str]:
+        save_path = None
+        try:
+            os.makedirs(save_directory, exist_ok=True)
+            session = self.get_session()
+
+            async with self._semaphore:
+                async with session.get(url, headers=headers) as response:
+                    if response.status != 200:
+                        print(
+                            f"Failed to download file. HTTP status: {response.status}"
+                        )
+                        return None
+
+                    if (response.content_length or 0) > self.max_bytes:
+                        raise DownloadSizeExceededError(
+                            f"File is {response.content_length} bytes, limit is {self.max_bytes}"
                         )
-                        if "filename=" in content_disposition:
-                            filename = content_disposition.split("filename=")[1].strip(
-                                "\"'"
-                            )
-                        else:
-                            content_type = response.headers.get("Content-Type", "")
-                            if content_type:
-                                extension = mimetypes.guess_extension(
-                                    content_type.split(";")[0]
+
+                    filename = get_filename_from_response(url, response.headers)
+                    save_path = os.path.join(save_directory, filename)
+
+                    file = await asyncio.to_thread(open, save_path, "wb")
+                    try:
+                        total_bytes = 0
+                        async for chunk in response.content.iter_chunked(
+                            DOWNLOAD_CHUNK_SIZE
+                        ):
+                            total_bytes += len(chunk)
+                            if total_bytes > self.max_bytes:
+                                raise DownloadSizeExceededError(
+                                    f"File exceeded download limit of {self.max_bytes} bytes"
                                 )
-                                if extension:
-                                    filename = f"{uuid.uuid4()}{extension}"
+                            await asyncio.to_thread(file.write, chunk)
+                    finally:
+                        await asyncio.to_thread(file.close)
+
+            print(f"File downloaded successfully: {save_path}")
+            return save_path
+
+        except Exception as e:
+            print(f"Error downloading file from {url}: {e}")
+            if save_path and os.path.exists(save_path):
+                os.remove(save_path)
+            return None
 
-        filename = filename or str(uuid.uuid4())
-        save_path = os.path.join(save_directory, filename)
 
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.get(url, headers=headers) as response:
-                if response.status == 200:
-                    with open(save_path, "wb") as file:
-                        async for chunk in response.content.iter_chunked(8192):
-                            file.write(chunk)
-                    print(f"File downloaded successfully: {save_path}")
-                    return save_path
-                else:
-                    print(f"Failed to download file. HTTP status: {response.status}")
-                    return None
+def get_filename_from_response(url: str, headers) -> str:
+    parsed_url = urlparse(url)
+    filename = os.path.basename(parsed_url.path)
+    if filename and "." in filename:
+        return filename
 
-    except Exception as e:
-        print(f"Error downloading file from {url}: {e}")
-        return None
+    content_disposition = headers.get("Content-Disposition", "")
+    if "filename=" in content_disposition:
+        filename = os.path.basename(
+            content_disposition.split("filename=")[1].split(";")[0].strip("\"' ")
+        )
+        if filename:
+            return filename
+
+    content_type = headers.get("Content-Type", "")
+    if content_type:
+        extension = mimetypes.guess_extension(content_type.split(";")[0].strip())
+        if extension:
+            return f"{uuid.uuid4()}{extension}"
+
+    return str(uuid.uuid4())
+
+
+DOWNLOAD_MANAGER = DownloadManager()
+
+
+async def download_file(
+    url: str, save_directory: str, headers: Optional[dict] = None
+) -> Optional[str]:
+    return await DOWNLOAD_MANAGER.download_file(url, save_directory, headers)
 
 
 async def download_files(
     urls: List[str], save_directory: str, headers: Optional[dict] = None
 ) -> List[Optional[str]]:
     print(f"Starting download of {len(urls)} files to {save_directory}")
-    coroutines = [download_file(url, save_directory, headers) for url in urls]
-    results = await asyncio.gather(*coroutines, return_exceptions=True)
-    final_results = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            print(f"Exception during download of {urls[i]}: {result}")
-            final_results.append(None)
-        else:
-            final_results.append(result)
+    final_results = await DOWNLOAD_MANAGER.download_files(urls, save_directory, headers)
 
     successful_downloads = sum(1 for result in final_results if result is not None)
     print(
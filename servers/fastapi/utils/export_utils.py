@@ -8,8 +8,7 @@ from pathvalidate import sanitize_filename
 
 from models.pptx_models import PptxPresentationModel
 from models.presentation_and_path import PresentationAndPath
-from services.pptx_presentation_creator import PptxPresentationCreator
-from services.temp_file_service import TEMP_FILE_SERVICE
+from services.pptx_export_service import PPTX_EXPORT_SERVICE
 from utils.asset_directory_utils import get_exports_directory
 import uuid
 
@@ -33,18 +32,15 @@ async def export_presentation(
                     )
                 pptx_model_data = await response.json()
 
-        # Create PPTX file using the converted model
+        # Create PPTX file using the converted model, in an export worker
         pptx_model = PptxPresentationModel(**pptx_model_data)
-        temp_dir = TEMP_FILE_SERVICE.create_temp_dir()
-        pptx_creator = PptxPresentationCreator(pptx_model, temp_dir)
-        await pptx_creator.create_ppt()
 
         export_directory = get_exports_directory()
         pptx_path = os.path.join(
             export_directory,
             f"{sanitize_filename(title or str(uuid.uuid4()))}.pptx",
         )
-        pptx_creator.save(pptx_path)
+        await PPTX_EXPORT_SERVICE.export(pptx_model, pptx_path)
 
         return PresentationAndPath(
             presentation_id=presentation_id,
@@ -1,10 +1,124 @@
-from typing import List
+from collections import OrderedDict
+import functools
+import threading
+from typing import Callable, List, Optional, Tuple
 
-from PIL import Image, ImageDraw
+import numpy as np
+from PIL import Image
 
 from models.pptx_models import PptxObjectFitEnum, PptxObjectFitModel
 
 
+# Masks are one byte per pixel. Only masks up to MAX_CACHED_MASK_BYTES are
+# cached and each cache holds at most MASK_CACHE_MAX_BYTES, so large photos are
+# masked without pinning full-resolution buffers in every export worker.
+MAX_CACHED_MASK_BYTES = 1024 * 1024
+MASK_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+
+def _mask_cache(func: Callable[..., Image.Image]) -> Callable[..., Image.Image]:
+    """LRU cache for mask functions taking (width, height, ...), bounded by bytes."""
+    cache: "OrderedDict[tuple, Image.Image]" = OrderedDict()
+    lock = threading.Lock()
+    cached_bytes = 0
+
+    @functools.wraps(func)
+    def wrapper(width: int, height: int, *args) -> Image.Image:
+        nonlocal cached_bytes
+        key = (width, height, *args)
+        with lock:
+            mask = cache.get(key)
+            if mask is not None:
+                cache.move_to_end(key)
+                return mask
+
+        mask = func(width, height, *args)
+        mask_bytes = width * height
+        if mask_bytes > MAX_CACHED_MASK_BYTES:
+            return mask
+
+        with lock:
+            if key not in cache:
+                cache[key] = mask
+                cached_bytes += mask_bytes
+            while cached_bytes > MASK_CACHE_MAX_BYTES:
+                _, evicted = cache.popitem(last=False)
+                cached_bytes -= evicted.width * evicted.height
+        return mask
+
+    def cache_clear():
+        nonlocal cached_bytes
+        with lock:
+            cache.clear()
+            cached_bytes = 0
+
+    wrapper.cache_clear = cache_clear
+    wrapper.cache_bytes = lambda: cached_bytes
+    return wrapper
+
+
+def _quarter_circle_coverage(radius: int) -> np.ndarray:
+    """Anti-aliased coverage (0-255) of the top-left quarter circle of a corner.
+
+    Coverage is computed analytically from each pixel centre's distance to the
+    arc, so edges stay smooth at any resolution without supersampling.
+    """
+    centers = np.arange(radius, dtype=np.float32) + 0.5
+    dx = radius - centers[np.newaxis, :]
+    dy = radius - centers[:, np.newaxis]
+    distance = np.sqrt(dx * dx + dy * dy)
+    coverage = np.clip(radius - distance + 0.5, 0.0, 1.0)
+    return np.round(coverage * 255).astype(np.uint8)
+
+
+@_mask_cache
+def get_rounded_corners_mask(
+    width: int, height: int, radii: Tuple[int, int, int, int]
+) -> Image.Image:
+    """Alpha mask for a box with rounded corners (top-left, top-right, bottom-right, bottom-left).
+
+    Small masks are cached per (width, height, radii), callers must not modify them.
+    """
+    max_radius = min(width // 2, height // 2)
+    mask = np.full((height, width), 255, dtype=np.uint8)
+
+    for i, radius in enumerate(radii):
+        radius = min(int(radius), max_radius)
+        if radius <= 0:
+            continue
+        corner = _quarter_circle_coverage(radius)
+        if i == 0:  # top-left
+            mask[:radius, :radius] = corner
+        elif i == 1:  # top-right
+            mask[:radius, width - radius :] = corner[:, ::-1]
+        elif i == 2:  # bottom-right
+            mask[height - radius :, width - radius :] = corner[::-1, ::-1]
+        elif i == 3:  # bottom-left
+            mask[height - radius :, :radius] = corner[::-1, :]
+
+    return Image.fromarray(mask, "L")
+
+
+@_mask_cache
+def get_circle_mask(width: int, height: int) -> Image.Image:
+    """Alpha mask for the largest circle centred in the box.
+
+    Small masks are cached per (width, height), callers must not modify them.
+    """
+    radius = min(width, height) / 2
+    dx = np.arange(width, dtype=np.float32) + 0.5 - width / 2
+    dy = np.arange(height, dtype=np.float32) + 0.5 - height / 2
+
+    # Work in place on a single float buffer to keep peak memory low
+    coverage = dx[np.newaxis, :] ** 2 + dy[:, np.newaxis] ** 2
+    np.sqrt(coverage, out=coverage)
+    np.subtract(radius + 0.5, coverage, out=coverage)
+    np.clip(coverage, 0.0, 1.0, out=coverage)
+    coverage *= 255
+    np.round(coverage, out=coverage)
+    return Image.fromarray(coverage.astype(np.uint8), "L")
+
+
 def clip_image(
     image: Image.Image,
     width: int,
@@ -47,137 +161,39 @@ def clip_image(
 
 
 def round_image_corners(image: Image.Image, radii: List[int]) -> Image.Image:
+    """Rounds the corners with an anti-aliased alpha mask."""
+    if not radii or all(r == 0 for r in radii):
+        return image
     if len(radii) != 4:
         raise ValueError(
             "Image Border Radius - radii must contain exactly 4 values for each corner"
         )
 
-    w, h = image.size
-
-    # Clamp border radius to not exceed half the width or height
-    max_radius = min(w // 2, h // 2)
-    clamped_radii = [min(radius, max_radius) for radius in radii]
-
     # Ensure the image has an alpha channel (RGBA)
-    if image.mode != "RGBA":
-        image = image.convert("RGBA")
-
-    # Use higher resolution for smoother anti-aliasing
-    scale_factor = 4  # 4x supersampling for better quality
-    high_res_w, high_res_h = w * scale_factor, h * scale_factor
-    
-    # Scale up the image for processing
-    high_res_image = image.resize((high_res_w, high_res_h), Image.LANCZOS)
-    
-    # Scale up radii accordingly
-    high_res_radii = [radius * scale_factor for radius in clamped_radii]
-
-    # Create high-resolution mask
-    mask = Image.new("L", (high_res_w, high_res_h), 0)
-    draw = ImageDraw.Draw(mask)
-
-    # Draw the rounded rectangle mask
-    # Start with the main rectangle (excluding corners)
-    max_high_radius = max(high_res_radii)
-    draw.rectangle((max_high_radius, 0, high_res_w - max_high_radius, high_res_h), fill=255)
-    draw.rectangle((0, max_high_radius, high_res_w, high_res_h - max_high_radius), fill=255)
-
-    # Draw each rounded corner with anti-aliasing
-    for i, radius in enumerate(high_res_radii):
-        if radius > 0:
-            # Calculate corner position
-            if i == 0:  # top-left
-                x, y = 0, 0
-            elif i == 1:  # top-right
-                x, y = high_res_w - radius * 2, 0
-            elif i == 2:  # bottom-right
-                x, y = high_res_w - radius * 2, high_res_h - radius * 2
-            else:  # bottom-left
-                x, y = 0, high_res_h - radius * 2
-
-            # Draw quarter circle for this corner
-            draw.pieslice(
-                (x, y, x + radius * 2, y + radius * 2),
-                start=i * 90,
-                end=(i + 1) * 90,
-                fill=255
-            )
-
-    # Apply the mask to the high-resolution image
-    high_res_image.putalpha(mask)
-
-    # Scale back down with high-quality resampling for smooth edges
-    result = high_res_image.resize((w, h), Image.LANCZOS)
-
+    result = image.convert("RGBA")
+    result.putalpha(get_rounded_corners_mask(*result.size, tuple(radii)))
     return result
 
 
 def invert_image(img: Image.Image) -> Image.Image:
-    # Get image data
-    data = img.getdata()
-
-    # Process each pixel
-    new_data = []
-    for item in data:
-        # Get current pixel values
-        r, g, b, a = item
-
-        # Invert RGB values while preserving transparency
-        if a != 0:  # Skip fully transparent pixels
-            new_data.append((255 - r, 255 - g, 255 - b, a))
-        else:
-            new_data.append((0, 0, 0, 0))
+    # Invert RGB values while preserving transparency,
+    # fully transparent pixels become (0, 0, 0, 0)
+    pixels = np.array(img.convert("RGBA"))
+    alpha = pixels[..., 3]
+
+    pixels[..., :3] = 255 - pixels[..., :3]
+    pixels[alpha == 0] = 0
 
-    # Create new image with modified data
-    new_img = Image.new("RGBA", img.size)
-    new_img.putdata(new_data)
-    return new_img
+    return Image.fromarray(pixels, "RGBA")
 
 
 def create_circle_image(
     image: Image.Image,
 ) -> Image.Image:
+    """Crops the image to an anti-aliased circle."""
     # Convert to RGBA if not already
-    img = image.convert("RGBA")
-    # Get the original image size
-    w, h = img.size
-    
-    # Use higher resolution for smoother anti-aliasing
-    scale_factor = 4  # 4x supersampling for better quality
-    high_res_w, high_res_h = w * scale_factor, h * scale_factor
-    
-    # Scale up the image for processing
-    high_res_img = img.resize((high_res_w, high_res_h), Image.LANCZOS)
-    
-    # Use the smaller dimension for the circle
-    circle_size = min(high_res_w, high_res_h)
-    radius = circle_size // 2
-    
-    # Create high-resolution mask
-    mask = Image.new("L", (high_res_w, high_res_h), 0)
-    draw = ImageDraw.Draw(mask)
-
-    # Calculate center position
-    center_x = high_res_w // 2
-    center_y = high_res_h // 2
-
-    # Create a circular mask with anti-aliasing
-    draw.ellipse(
-        (
-            center_x - radius,
-            center_y - radius,
-            center_x + radius,
-            center_y + radius,
-        ),
-        fill=255,
-    )
-
-    # Apply the mask to the high-resolution image
-    high_res_img.putalpha(mask)
-
-    # Scale back down with high-quality resampling for smooth edges
-    result = high_res_img.resize((w, h), Image.LANCZOS)
-    
+    result = image.convert("RGBA")
+    result.putalpha(get_circle_mask(*result.size))
     return result
 
 
@@ -189,15 +205,10 @@ def set_image_opacity(image: Image.Image, opacity: float) -> Image.Image:
     if image.mode != "RGBA":
         image = image.convert("RGBA")
 
-    # Get the original alpha channel
-    original_alpha = image.getchannel("A")
-
-    # Create new alpha channel with adjusted opacity
-    new_alpha = original_alpha.point(lambda x: int(x * opacity))
+    # Scale the alpha channel through a lookup table
+    new_alpha = image.getchannel("A").point([int(x * opacity) for x in range(256)])
 
-    # Create new image with modified alpha channel
-    result = Image.new("RGBA", image.size)
-    result.paste(image.convert("RGB"), (0, 0))
+    result = image.copy()
     result.putalpha(new_alpha)
 
     return result
@@ -265,3 +276,38 @@ def fit_image(
         return image.resize((width, height), Image.LANCZOS)
 
     return image
+
+
+def transform_picture(
+    image: Image.Image,
+    border_radius: Optional[List[int]] = None,
+    circle: bool = False,
+    invert: bool = False,
+    opacity: Optional[float] = None,
+) -> Image.Image:
+    """Applies the picture box transformations used by the PPTX export, in order."""
+    image = image.convert("RGBA")
+    if border_radius:
+        image = round_image_corners(image, border_radius)
+    if circle:
+        image = create_circle_image(image)
+    if invert:
+        image = invert_image(image)
+    if opacity:
+        image = set_image_opacity(image, opacity)
+    return image
+
+
+def transform_picture_file(
+    source_path: str,
+    output_path: str,
+    border_radius: Optional[List[int]] = None,
+    circle: bool = False,
+    invert: bool = False,
+    opacity: Optional[float] = None,
+) -> str:
+    """File-to-file transform_picture, picklable for use in a process pool."""
+    with Image.open(source_path) as image:
+        image = transform_picture(image, border_radius, circle, invert, opacity)
+    image.save(output_path, "PNG", quality=95)
+    return output_path
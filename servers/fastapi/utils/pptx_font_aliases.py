@@ -0,0 +1,46 @@
+from html import escape, unescape
+import re
+import shutil
+from typing import Dict
+import zipfile
+
+TYPEFACE_ATTRIBUTE_PATTERN = re.compile(r"""(typeface=)(["'])(.*?)\2""")
+
+
+def replace_typefaces_in_xml(xml_content: str, aliases: Dict[str, str]) -> str:
+    """Replaces typeface attribute values found in aliases."""
+
+    def replace(match: re.Match) -> str:
+        typeface = unescape(match.group(3))
+        alias = aliases.get(typeface)
+        if alias is None:
+            return match.group(0)
+        return f"{match.group(1)}{match.group(2)}{escape(alias)}{match.group(2)}"
+
+    return TYPEFACE_ATTRIBUTE_PATTERN.sub(replace, xml_content)
+
+
+def write_pptx_with_font_aliases(
+    source_path: str, output_path: str, aliases: Dict[str, str]
+) -> str:
+    """Copies the deck with every typeface in aliases renamed to its alias.
+
+    Slides, layouts, masters and themes are all rewritten, so LibreOffice
+    resolves the aliased families without a custom fontconfig setup. Parts
+    without aliased fonts are copied as is.
+    """
+    if not aliases:
+        shutil.copyfile(source_path, output_path)
+        return output_path
+
+    with zipfile.ZipFile(source_path, "r") as source, zipfile.ZipFile(
+        output_path, "w"
+    ) as output:
+        for info in source.infolist():
+            content = source.read(info)
+            if info.filename.endswith(".xml") and b"typeface=" in content:
+                content = replace_typefaces_in_xml(
+                    content.decode("utf-8"), aliases
+                ).encode("utf-8")
+            output.writestr(info, content)
+    return output_path
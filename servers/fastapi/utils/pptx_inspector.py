@@ -0,0 +1,88 @@
+from io import BytesIO
+import re
+from typing import List, Set, Union
+import xml.etree.ElementTree as ET
+import zipfile
+
+from pydantic import BaseModel
+
+SLIDE_PART_PATTERN = re.compile(r"^ppt/slides/slide(\d+)\.xml$")
+TYPEFACE_PATTERN = re.compile(r'typeface="([^"]+)"')
+
+# Theme placeholders (major/minor latin, east asian, complex script)
+THEME_FONT_REFERENCES = {"+mn-lt", "+mj-lt", "+mn-ea", "+mj-ea", "+mn-cs", "+mj-cs"}
+
+
+class PptxSlideInspection(BaseModel):
+    xml_content: str
+    fonts: List[str]
+
+
+class PptxInspection(BaseModel):
+    slides: List[PptxSlideInspection]
+
+    @property
+    def slide_count(self) -> int:
+        return len(self.slides)
+
+    @property
+    def slide_xmls(self) -> List[str]:
+        return [slide.xml_content for slide in self.slides]
+
+    @property
+    def fonts(self) -> List[str]:
+        fonts = set()
+        for slide in self.slides:
+            fonts.update(slide.fonts)
+        return sorted(fonts)
+
+
+def get_fonts_from_slide_xml(xml_content: str) -> List[str]:
+    """Returns every font typeface referenced by the slide, parsing it once."""
+    fonts: Set[str] = set()
+    try:
+        # latin, ea, cs, sym and font elements, with or without namespace
+        for element in ET.fromstring(xml_content).iter():
+            typeface = element.get("typeface")
+            if typeface:
+                fonts.add(typeface)
+    except ET.ParseError as e:
+        print(f"Error parsing slide XML, falling back to regex: {e}")
+        fonts.update(TYPEFACE_PATTERN.findall(xml_content))
+
+    return sorted(
+        font for font in fonts if font.strip() and font not in THEME_FONT_REFERENCES
+    )
+
+
+def inspect_pptx(pptx: Union[str, bytes]) -> PptxInspection:
+    """Reads slide XMLs and their fonts from a PPTX path or its bytes.
+
+    Only ppt/slides/slideN.xml parts are decompressed, straight from the zip
+    in memory. Media and every other part are never read.
+    """
+    source = BytesIO(pptx) if isinstance(pptx, bytes) else pptx
+    try:
+        with zipfile.ZipFile(source) as zip_file:
+            slide_parts = []
+            for name in zip_file.namelist():
+                match = SLIDE_PART_PATTERN.match(name)
+                if match:
+                    slide_parts.append((int(match.group(1)), name))
+
+            if not slide_parts:
+                raise Exception("No slides directory found in PPTX file")
+
+            slides = []
+            for _, name in sorted(slide_parts):
+                xml_content = zip_file.read(name).decode("utf-8")
+                slides.append(
+                    PptxSlideInspection(
+                        xml_content=xml_content,
+                        fonts=get_fonts_from_slide_xml(xml_content),
+                    )
+                )
+    except Exception as e:
+        raise Exception(f"Failed to extract slide XMLs: {str(e)}")
+
+    return PptxInspection(slides=slides)
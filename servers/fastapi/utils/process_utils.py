@@ -0,0 +1,21 @@
+import asyncio
+import os
+import signal
+
+
+def kill_process_group(process: asyncio.subprocess.Process, sig: int = signal.SIGKILL):
+    """Signals the process and everything it started.
+
+    The process must have been created with start_new_session=True, so it
+    leads its own process group (e.g. soffice and soffice.bin, or Node and the
+    browser it launched).
+    """
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, sig)
+        elif sig == signal.SIGKILL:
+            process.kill()
+        else:
+            process.terminate()
+    except (ProcessLookupError, PermissionError):
+        pass
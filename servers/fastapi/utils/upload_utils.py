@@ -0,0 +1,57 @@
+import asyncio
+import hashlib
+import os
+from typing import BinaryIO, Optional
+
+from fastapi import HTTPException, UploadFile
+
+from models.saved_upload import SavedUpload
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _write_chunk(output: BinaryIO, hasher, chunk: bytes):
+    hasher.update(chunk)
+    output.write(chunk)
+
+
+async def save_upload_file(
+    file: UploadFile, destination_path: str, max_size: Optional[int] = None
+) -> SavedUpload:
+    """Streams an upload to destination_path and returns its size and SHA-256.
+
+    Only one chunk is held in memory at a time. Writing and hashing happen in a
+    worker thread, so the event loop never blocks on disk IO. max_size is in MB
+    and is enforced while streaming, the partial file is removed when exceeded.
+    """
+    max_bytes = max_size * 1024 * 1024 if max_size else None
+    hasher = hashlib.sha256()
+    size = 0
+
+    output = await asyncio.to_thread(open, destination_path, "wb")
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise HTTPException(
+                    400,
+                    detail=f"File '{file.filename}' exceeded max upload size of {max_size} MB",
+                )
+            await asyncio.to_thread(_write_chunk, output, hasher, chunk)
+    except BaseException:
+        await asyncio.to_thread(output.close)
+        if os.path.exists(destination_path):
+            os.remove(destination_path)
+        raise
+    await asyncio.to_thread(output.close)
+
+    return SavedUpload(
+        path=destination_path,
+        size=size,
+        sha256=hasher.hexdigest(),
+        filename=file.filename,
+        content_type=file.content_type,
+    )